@@ -0,0 +1,42 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.checks import Tags, Warning, register
+
+from enums.base_enum import BaseEnum
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Warn about caches that other processes cannot see."""
+    return [
+        Warning(
+            BaseEnum.PROCESS_LOCAL_CACHE_MESSAGE.value.format(alias=alias),
+            hint=BaseEnum.PROCESS_LOCAL_CACHE_HINT.value,
+            id=BaseEnum.PROCESS_LOCAL_CACHE_ID.value,
+        )
+        for alias, config in settings.CACHES.items()
+        if config['BACKEND'] in BaseEnum.PROCESS_LOCAL_CACHES.value
+    ]
+
+
+@register(Tags.caches)
+def check_cache_reachable(app_configs, **kwargs):
+    """Warn about shared caches that do not return what is written to them."""
+    errors = []
+    for alias, config in settings.CACHES.items():
+        if config['BACKEND'] in BaseEnum.PROCESS_LOCAL_CACHES.value:
+            continue
+        cache = caches[alias]
+        value = uuid.uuid4().hex
+        cache.set(BaseEnum.CACHE_PROBE_KEY.value, value, timeout=60)
+        if cache.get(BaseEnum.CACHE_PROBE_KEY.value) != value:
+            errors.append(Warning(
+                BaseEnum.UNREACHABLE_CACHE_MESSAGE.value.format(
+                    alias=alias, location=config.get('LOCATION', ''),
+                ),
+                hint=BaseEnum.UNREACHABLE_CACHE_HINT.value,
+                id=BaseEnum.UNREACHABLE_CACHE_ID.value,
+            ))
+    return errors
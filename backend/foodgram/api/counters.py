@@ -0,0 +1,69 @@
+import hashlib
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from rest_framework.request import Request
+
+from enums.pagination_enum import PaginationEnum
+
+
+def get_namespace(queryset: QuerySet) -> str:
+    """Return the count cache namespace of the queryset model."""
+    return queryset.model._meta.label_lower
+
+
+def get_count_version(namespace: str) -> int:
+    """Return the current count cache version of the namespace."""
+    key = f'{PaginationEnum.COUNT_VERSION_PREFIX.value}:{namespace}'
+    cache.add(key, 1, timeout=None)
+    return cache.get(key, 1)
+
+
+def invalidate_counts(namespace: str):
+    """Invalidate every cached count of the namespace by bumping its version."""
+    key = f'{PaginationEnum.COUNT_VERSION_PREFIX.value}:{namespace}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def get_count_key(request: Request, namespace: str) -> str:
+    """Build the count cache key from the request path and its normalized filters.
+
+    Pagination parameters are ignored, so every page of one filtered list shares
+    one count. Authenticated requests are keyed by user, because filters such as
+    `is_favorited` depend on who is asking.
+    """
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        if name not in PaginationEnum.COUNT_IGNORED_PARAMS.value
+        for value in values
+    )
+    user_id = request.user.id if request.user.is_authenticated else None
+    raw = f'{request.path}|{params}|{user_id}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    version = get_count_version(namespace)
+    return f'{PaginationEnum.COUNT_CACHE_PREFIX.value}:{namespace}:{version}:{digest}'
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """Return the planner row estimate for an unfiltered queryset.
+
+    Only PostgreSQL keeps a usable estimate; None is returned for other
+    databases, filtered querysets and tables below the estimate threshold.
+    """
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE relname = %s',
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if not row or row[0] < PaginationEnum.COUNT_ESTIMATE_THRESHOLD.value:
+        return None
+    return int(row[0])
@@ -0,0 +1,102 @@
+from typing import Iterable, List
+
+from django.db.models import QuerySet
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+from enums.recipe_enum import RecipeEnum
+
+
+def resolve_ids(queryset: QuerySet, ids: Iterable[int], missing_message: str) -> List:
+    """Fetch the objects of all ids with one `IN` query, keeping the input order.
+
+    Raises:
+        serializers.ValidationError: Listing every id that does not exist.
+    """
+    ids = list(ids)
+    objects = queryset.in_bulk(ids)
+    missing = sorted({pk for pk in ids if pk not in objects})
+    if missing:
+        raise serializers.ValidationError(
+            missing_message.format(ids=', '.join(map(str, missing)))
+        )
+    return [objects[pk] for pk in ids]
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Many-to-many field that validates all submitted primary keys at once."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_value_bulk(data)
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that, with `many=True`, resolves every id with one query.
+
+    Attributes:
+    - missing_message (str): Error message listing the ids that do not exist.
+    """
+
+    def __init__(self, missing_message: str = None, **kwargs):
+        self.missing_message = missing_message
+        super().__init__(**kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+    def to_pk(self, data) -> int:
+        """Validate the type of a submitted primary key without querying."""
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+    def to_internal_value_bulk(self, data) -> List:
+        return resolve_ids(
+            self.get_queryset(), [self.to_pk(item) for item in data], self.missing_message
+        )
+
+
+class DeferredPrimaryKeyRelatedField(BulkPrimaryKeyRelatedField):
+    """
+    Primary key field that only checks the id type.
+
+    The parent list serializer resolves the ids of all items with one query.
+    """
+
+    def to_internal_value(self, data) -> int:
+        return self.to_pk(data)
+
+
+class ThumbnailsField(serializers.ReadOnlyField):
+    """
+    Read-only field with the URL of every thumbnail size of the recipe image.
+
+    Clients pick the variant that matches their layout instead of the original.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def to_representation(self, recipe) -> dict:
+        request = self.context.get('request')
+        urls = {}
+        for size in RecipeEnum.THUMBNAIL_SIZES.value:
+            url = reverse(RecipeEnum.THUMBNAIL_URL_NAME.value,
+                          kwargs={'pk': recipe.id, 'size': size})
+            urls[size] = request.build_absolute_uri(url) if request else url
+        return urls
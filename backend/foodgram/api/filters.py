@@ -2,8 +2,11 @@ from typing import Any
 
 from django.db.models import QuerySet
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
 
+from enums.recipe_enum import RecipeEnum
 from recipes.models import Recipe, Tag
+from recipes.search import search_recipes
 
 
 class RecipeFilterSet(filters.FilterSet):
@@ -15,16 +18,41 @@ class RecipeFilterSet(filters.FilterSet):
         field_name="tags__slug",
         to_field_name="slug",
         queryset=Tag.objects.all(),
+        method="filter_tags",
         help_text="Filter recipes by tags.",
     )
     is_favorited = filters.BooleanFilter(method="filter_is_favorited", help_text="Filter favorited recipes.")
     is_in_shopping_cart = filters.BooleanFilter(
         method="filter_is_in_shopping_cart", help_text="Filter recipes in the shopping cart."
     )
+    search = filters.CharFilter(
+        method="filter_search", help_text="Search recipes by name, text and ingredients."
+    )
+    ordering = filters.ChoiceFilter(
+        choices=RecipeEnum.ORDERING_CHOICES.value,
+        method="filter_ordering",
+        help_text="Order recipes by popularity instead of publication date.",
+    )
 
     class Meta:
         model = Recipe
-        fields = ["author", "tags", "is_favorited", "is_in_shopping_cart"]
+        fields = ["author", "tags", "is_favorited", "is_in_shopping_cart", "search", "ordering"]
+
+    def filter_tags(self, queryset: QuerySet, name: Any, value: Any) -> QuerySet:
+        """
+        Custom filter method to filter recipes having any of the given tags.
+
+        Parameters:
+        - queryset (QuerySet): The initial queryset.
+        - name (Any): The name of the filter field.
+        - value (Any): The Tag objects matching the requested slugs.
+
+        Returns:
+        QuerySet: The filtered queryset.
+        """
+        if not value:
+            return queryset
+        return queryset.with_any_tag(value)
 
     def filter_is_favorited(self, queryset: QuerySet, name: Any, value: Any) -> QuerySet:
         """
@@ -40,7 +68,7 @@ class RecipeFilterSet(filters.FilterSet):
         """
         user = self.request.user
         if value and user.is_authenticated:
-            return queryset.filter(favorite__username=user)
+            return queryset.filter(favorite_entries__user_id=user.id)
         return queryset
 
     def filter_is_in_shopping_cart(self, queryset: QuerySet, name: Any, value: Any) -> QuerySet:
@@ -57,5 +85,49 @@ class RecipeFilterSet(filters.FilterSet):
         """
         user = self.request.user
         if value and user.is_authenticated:
-            return queryset.filter(in_cart__username=user)
+            return queryset.filter(cart_entries__user_id=user.id)
         return queryset
+
+    def filter_search(self, queryset: QuerySet, name: Any, value: Any) -> QuerySet:
+        """
+        Custom filter method for full-text search ranked by relevance.
+
+        Parameters:
+        - queryset (QuerySet): The initial queryset.
+        - name (Any): The name of the filter field.
+        - value (Any): The search query.
+
+        Returns:
+        QuerySet: The matching recipes, most relevant first.
+
+        Raises:
+        - ValidationError: If keyset pagination is requested as well, since the
+          cursor pages follow `(pub_date, id)` instead of the relevance.
+        """
+        if value.split() and RecipeEnum.CURSOR_QUERY_PARAM.value in self.request.query_params:
+            raise ValidationError({name: RecipeEnum.SEARCH_CURSOR_MESSAGE.value})
+        return search_recipes(queryset, value)
+
+    def filter_ordering(self, queryset: QuerySet, name: Any, value: Any) -> QuerySet:
+        """
+        Custom filter method to order recipes by a stored popularity score.
+
+        Ties are ordered newest first, so the sorted page is read from the
+        `(score, pub_date, id)` index like the chronological one.
+
+        Parameters:
+        - queryset (QuerySet): The initial queryset.
+        - name (Any): The name of the filter field.
+        - value (Any): The requested ordering.
+
+        Returns:
+        QuerySet: The reordered queryset.
+
+        Raises:
+        - ValidationError: If keyset pagination is requested as well.
+        """
+        if not value:
+            return queryset
+        if RecipeEnum.CURSOR_QUERY_PARAM.value in self.request.query_params:
+            raise ValidationError({name: RecipeEnum.ORDERING_CURSOR_MESSAGE.value})
+        return queryset.order_by(*RecipeEnum.ORDERINGS.value[value])
@@ -0,0 +1,132 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.views import RecipeViewSet
+from recipes.feeds import drop_feeds, materialize_feeds
+from recipes.models import Recipe
+from users.models import Subscription, User
+
+BENCHMARK_PREFIX = 'feed-benchmark'
+
+
+def create_authors(count: int, recipes_per_author: int, label: str) -> list:
+    """Create `count` authors with `recipes_per_author` recipes each, return their ids."""
+    User.objects.bulk_create(
+        User(username=f'{BENCHMARK_PREFIX}-{label}-{index}',
+             email=f'{BENCHMARK_PREFIX}-{label}-{index}@example.com')
+        for index in range(count)
+    )
+    author_ids = list(
+        User.objects.filter(username__startswith=f'{BENCHMARK_PREFIX}-{label}-')
+        .values_list('id', flat=True)
+    )
+    Recipe.objects.bulk_create(
+        (
+            Recipe(author_id=author_id, name=f'{label} {author_id}.{index}',
+                   image='benchmark.jpg', text='benchmark', cooking_time=10)
+            for author_id in author_ids
+            for index in range(recipes_per_author)
+        ),
+        batch_size=1000,
+    )
+    return author_ids
+
+
+class Command(BaseCommand):
+    """
+    Measure the followed-authors feed for readers following many authors.
+    """
+    help = ('Page through /api/recipes/feed/ for synthetic readers following thousands '
+            'of authors, read on the fly and from a materialized timeline. '
+            'Every row created by the benchmark is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--follows',
+            type=int,
+            nargs='+',
+            default=[100, 1000, 5000],
+            help='Numbers of followed authors to measure.',
+        )
+        parser.add_argument(
+            '--recipes-per-author',
+            type=int,
+            default=5,
+            help='Recipes of every synthetic author.',
+        )
+        parser.add_argument(
+            '--unfollowed-authors',
+            type=int,
+            default=5000,
+            help='Authors nobody follows, whose recipes the feed has to skip.',
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=5,
+            help='Pages to read, following the `next` cursor.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Recipes per page.',
+        )
+
+    def read_pages(self, reader: User, pages: int, limit: int):
+        """Read up to `pages` feed pages and return the timings and query counts per page."""
+        view = RecipeViewSet.as_view({'get': 'feed'})
+        factory = APIRequestFactory()
+        url = f'/api/recipes/feed/?limit={limit}'
+        timings = []
+        while url and len(timings) < pages:
+            request = factory.get(url, HTTP_HOST=settings.ALLOWED_HOSTS[0])
+            force_authenticate(request, user=reader)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                elapsed = time.perf_counter() - started
+            timings.append((elapsed, len(queries)))
+            url = response.data['next']
+        return timings
+
+    def report(self, mode: str, follows: int, timings: list):
+        first, first_queries = timings[0]
+        rest = [elapsed for elapsed, _ in timings[1:]] or [first]
+        self.stdout.write(
+            f'{mode:>12} {follows:>6} follows: first page {first * 1000:7.1f} ms '
+            f'({first_queries} queries), next pages avg {sum(rest) / len(rest) * 1000:7.1f} ms'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_authors(options['unfollowed_authors'], options['recipes_per_author'], 'noise')
+            for follows in options['follows']:
+                author_ids = create_authors(follows, options['recipes_per_author'], f'f{follows}')
+                reader = User.objects.create(
+                    username=f'{BENCHMARK_PREFIX}-reader-{follows}',
+                    email=f'{BENCHMARK_PREFIX}-reader-{follows}@example.com',
+                )
+                Subscription.objects.bulk_create(
+                    (Subscription(user=reader, author_id=author_id) for author_id in author_ids),
+                    batch_size=1000,
+                )
+                self.report('on read', follows,
+                            self.read_pages(reader, options['pages'], options['limit']))
+                started = time.perf_counter()
+                entries = materialize_feeds([reader.id])
+                self.stdout.write(
+                    f'{"materialize":>12} {follows:>6} follows: {entries} entries '
+                    f'in {(time.perf_counter() - started) * 1000:7.1f} ms'
+                )
+                reader.refresh_from_db()
+                self.report('materialized', follows,
+                            self.read_pages(reader, options['pages'], options['limit']))
+                drop_feeds([reader.id])
+            transaction.set_rollback(True)
@@ -0,0 +1,59 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from api.shopping_list import AMOUNT, NAME, UNIT, WRITERS, iter_shopping_list
+
+UNITS = ('г', 'мл', 'шт.', 'ст. л.', 'ч. л.', 'по вкусу', 'кг', 'л')
+
+
+def generate_rows(count: int):
+    """Yield `count` aggregated cart lines ordered by unit, as the cart query returns them."""
+    per_unit = -(-count // len(UNITS))
+    produced = 0
+    for unit in sorted(UNITS):
+        for index in range(per_unit):
+            if produced == count:
+                return
+            produced += 1
+            yield {NAME: f'ингредиент {index:06d}', UNIT: unit, AMOUNT: index % 1000 + 1}
+
+
+class Command(BaseCommand):
+    """
+    Measure the throughput and peak memory of the shopping list export.
+    """
+    help = ('Stream synthetic carts through every shopping list format and report '
+            'lines per second, output size and peak memory.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lines',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 100000],
+            help='Cart sizes, in aggregated ingredient lines, to measure.',
+        )
+
+    def measure(self, export_format: str, count: int):
+        started = time.perf_counter()
+        size = 0
+        for chunk in iter_shopping_list(generate_rows(count), export_format, 'Benchmark'):
+            size += len(chunk)
+        return time.perf_counter() - started, size
+
+    def handle(self, *args, **options):
+        for export_format in WRITERS:
+            for count in options['lines']:
+                elapsed, size = self.measure(export_format, count)
+                # Memory is traced in a separate pass, tracing slows the run down.
+                tracemalloc.start()
+                self.measure(export_format, count)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(
+                    f'{export_format:>4} {count:>8} lines: {elapsed * 1000:8.1f} ms, '
+                    f'{count / elapsed:>10.0f} lines/s, {size:>10} bytes, '
+                    f'peak {peak / 1024:8.1f} KiB'
+                )
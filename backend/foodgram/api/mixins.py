@@ -2,7 +2,7 @@ from rest_framework import mixins
 from rest_framework import viewsets
 from rest_framework import serializers
 
-from recipes.models import Recipe
+from recipes.models import Favorite, Recipe, ShoppingCartItem
 
 
 class ListRetrieveViewSet(mixins.ListModelMixin,
@@ -26,6 +26,7 @@ class RecipeMixin(serializers.ModelSerializer):
     def get_is_favorited(self, obj: Recipe) -> bool:
         """
         Retrieve the boolean value of the 'is_favorite' field.
+        Uses the `is_favorited` annotation when the queryset provides it.
 
         Args:
         - obj (Recipe): The Recipe instance.
@@ -33,16 +34,19 @@ class RecipeMixin(serializers.ModelSerializer):
         Returns:
         bool: True if the recipe is favorited by the user, False otherwise.
         """
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
         user = self.context.get("request").user
         if user.is_anonymous:
             return False
-        return Recipe.objects.filter(
-            favorite__username=user.username, id=obj.id
+        return Favorite.objects.filter(
+            user_id=user.id, recipe_id=obj.id
         ).exists()
 
     def get_is_in_shopping_cart(self, obj: Recipe) -> bool:
         """
         Retrieve the boolean value of the 'is_in_shopping_cart' field.
+        Uses the `is_in_shopping_cart` annotation when the queryset provides it.
 
         Args:
         - obj (Recipe): The Recipe instance.
@@ -50,9 +54,11 @@ class RecipeMixin(serializers.ModelSerializer):
         Returns:
         bool: True if the recipe is in the user's shopping cart, False otherwise.
         """
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
         user = self.context.get("request").user
         if user.is_anonymous:
             return False
-        return Recipe.objects.filter(
-            in_cart__username=user.username, id=obj.id
+        return ShoppingCartItem.objects.filter(
+            user_id=user.id, recipe_id=obj.id
         ).exists()
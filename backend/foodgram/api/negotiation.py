@@ -0,0 +1,13 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class IgnoreFormatContentNegotiation(DefaultContentNegotiation):
+    """
+    Content negotiation that always picks the first renderer.
+
+    Used by views that read `?format=` themselves to choose a file format,
+    which DRF would otherwise treat as a renderer override.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
@@ -1,12 +1,212 @@
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.counters import estimate_count, get_count_key, get_namespace
+from enums.pagination_enum import PaginationEnum
+from enums.recipe_enum import RecipeEnum
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Django paginator that takes the total count from the count cache.
+
+    Large unfiltered sets use the planner row estimate instead of COUNT(*),
+    exact counts are cached under `count_key` until the data changes.
+
+    Attributes:
+    - count_key (str): The cache key of the count for the current filters.
+    - count_is_exact (bool): Whether `count` is exact or an estimate.
+    """
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self) -> int:
+        """
+        Return the cached, estimated or freshly computed number of objects.
+        """
+        estimate = estimate_count(self.object_list)
+        if estimate is not None:
+            self.count_is_exact = False
+            return estimate
+        if self.count_key is None:
+            return super().count
+        count = cache.get(self.count_key)
+        if count is None:
+            count = super().count
+            cache.set(self.count_key, count,
+                      PaginationEnum.COUNT_CACHE_TIMEOUT.value)
+        return count
+
 
 class PageLimitPagination(PageNumberPagination):
     """
     Standard paginator with the definition of the `page_size_query_param` attribute
     for displaying the requested number of pages.
+    Total counts are cached per filter set and flagged as exact or approximate.
 
     Attributes:
     - page_size_query_param (str): The query parameter to determine the number of items per page.
                                   Defaults to "limit".
     """
     page_size_query_param = "limit"
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        """
+        Remember the count cache key of the request before paginating.
+        """
+        self.count_key = get_count_key(request, get_namespace(queryset))
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset: QuerySet, page_size: int) -> CachedCountPaginator:
+        """
+        Build the Django paginator bound to the count cache key of the request.
+        """
+        return CachedCountPaginator(queryset, page_size, count_key=self.count_key)
+
+    def get_paginated_response(self, data) -> Response:
+        """
+        Return the page together with the `count_is_exact` flag.
+        """
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            (PaginationEnum.COUNT_IS_EXACT_FIELD.value, self.page.paginator.count_is_exact),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class RecipeKeysetPagination(PageLimitPagination):
+    """
+    Paginator for the recipe feed with an opt-in keyset (cursor) mode.
+
+    Without the `cursor` query parameter it behaves exactly like PageLimitPagination.
+    With `?cursor=` (empty for the first page) recipes are ordered by `(pub_date, id)`
+    descending and every next page starts strictly after the last row of the previous
+    one, so no OFFSET or COUNT(*) is executed and concurrent inserts do not shift pages.
+
+    A view may set `keyset_fields` to page by other `(date, id)` columns holding the
+    same values, such as the annotations of a materialized feed. Cursors are the same
+    `(pub_date, id)` positions in both cases.
+
+    Attributes:
+    - cursor_query_param (str): The query parameter that enables keyset mode and carries the position.
+    - invalid_cursor_message (str): The error message for a malformed cursor.
+    """
+    cursor_query_param = RecipeEnum.CURSOR_QUERY_PARAM.value
+    invalid_cursor_message = RecipeEnum.INVALID_CURSOR_MESSAGE.value
+
+    def is_cursor_mode(self, request: Request) -> bool:
+        """
+        Tell whether the request asks for keyset pagination.
+        """
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        """
+        Paginate the queryset by page number or, if requested, by keyset.
+        """
+        self.cursor_mode = self.is_cursor_mode(request)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.keyset_fields = getattr(view, 'keyset_fields', RecipeEnum.RECIPE_KEYSET_FIELDS.value)
+        date_field, id_field = self.keyset_fields
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        queryset = queryset.order_by(f'-{date_field}', f'-{id_field}')
+        if position is not None:
+            pub_date, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{date_field}__lt': pub_date}) |
+                Q(**{date_field: pub_date, f'{id_field}__lt': pk})
+            )
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data) -> Response:
+        """
+        Return the page with links suited to the active pagination mode.
+        """
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_cursor_link()),
+            ('results', data),
+        ]))
+
+    def get_next_cursor_link(self):
+        """
+        Build the link to the page after the last returned recipe.
+        """
+        if not self.has_next:
+            return None
+        date_field, id_field = self.keyset_fields
+        last = self.page[-1]
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url, self.cursor_query_param,
+            self.encode_cursor(getattr(last, date_field), getattr(last, id_field)),
+        )
+
+    @staticmethod
+    def encode_cursor(pub_date, pk: int) -> str:
+        """
+        Encode a `(pub_date, id)` position as an opaque url-safe string.
+        """
+        raw = f'{pub_date.isoformat()}|{pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor: str):
+        """
+        Decode a cursor into a `(pub_date, id)` position, or None for the first page.
+
+        Raises:
+        - NotFound: If the cursor is malformed.
+        """
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            pub_date, pk = raw.rsplit('|', 1)
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
+
+
+class FeedKeysetPagination(RecipeKeysetPagination):
+    """
+    Paginator for feeds that are always paged by keyset.
+
+    The first page is requested without a cursor, next pages follow the `next` link.
+    """
+
+    def is_cursor_mode(self, request: Request) -> bool:
+        """
+        Always use keyset pagination.
+        """
+        return True
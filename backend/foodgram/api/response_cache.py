@@ -0,0 +1,86 @@
+import copy
+import hashlib
+from typing import Optional
+
+from django.core.cache import cache
+from rest_framework.request import Request
+
+from enums.recipe_enum import RecipeEnum
+from recipes.models import Favorite, ShoppingCartItem
+from users.models import Subscription
+
+
+def get_list_version(key: str = RecipeEnum.LIST_CACHE_VERSION_KEY.value) -> int:
+    """Return the current version of the cached recipe lists."""
+    cache.add(key, 1, timeout=None)
+    return cache.get(key, 1)
+
+
+def invalidate_recipe_lists(key: str = RecipeEnum.LIST_CACHE_VERSION_KEY.value):
+    """Invalidate every cached recipe list by bumping the shared version."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def invalidate_scored_recipe_lists():
+    """Invalidate the cached recipe lists ordered by popularity or trending score."""
+    invalidate_recipe_lists(RecipeEnum.SCORES_CACHE_VERSION_KEY.value)
+
+
+def get_list_cache_key(request: Request) -> Optional[str]:
+    """Build the shared cache key of a recipe list request.
+
+    Returns None for requests filtered by the user's own favorites or cart,
+    because their rows, not only their flags, depend on the user. Lists ordered
+    by a score also carry the scores version, which favorites and carts bump.
+    """
+    if any(name in request.query_params for name in RecipeEnum.USER_SCOPED_FILTERS.value):
+        return None
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    raw = f'{request.get_host()}|{request.path}|{params}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    version = get_list_version()
+    if RecipeEnum.ORDERING_PARAM.value in request.query_params:
+        version = f'{version}.{get_list_version(RecipeEnum.SCORES_CACHE_VERSION_KEY.value)}'
+    return f'{RecipeEnum.LIST_CACHE_PREFIX.value}:{version}:{digest}'
+
+
+def strip_user_flags(data: dict) -> dict:
+    """Return a copy of a recipe page as an anonymous user would see it."""
+    data = copy.deepcopy(data)
+    for recipe in data['results']:
+        recipe['is_favorited'] = False
+        recipe['is_in_shopping_cart'] = False
+        recipe['author']['is_subscribed'] = False
+    return data
+
+
+def overlay_user_flags(data: dict, user) -> dict:
+    """Fill the user-specific flags of a cached recipe page from small id sets."""
+    if user.is_anonymous:
+        return data
+    recipe_ids = [recipe['id'] for recipe in data['results']]
+    author_ids = {recipe['author']['id'] for recipe in data['results']}
+    favorites = set(
+        Favorite.objects.filter(user_id=user.id, recipe_id__in=recipe_ids)
+        .values_list('recipe_id', flat=True)
+    )
+    in_cart = set(
+        ShoppingCartItem.objects.filter(user_id=user.id, recipe_id__in=recipe_ids)
+        .values_list('recipe_id', flat=True)
+    )
+    subscribed = set(
+        Subscription.objects.filter(user_id=user.id, author_id__in=author_ids)
+        .values_list('author_id', flat=True)
+    )
+    for recipe in data['results']:
+        recipe['is_favorited'] = recipe['id'] in favorites
+        recipe['is_in_shopping_cart'] = recipe['id'] in in_cart
+        recipe['author']['is_subscribed'] = recipe['author']['id'] in subscribed
+    return data
@@ -1,13 +1,22 @@
+import os
+
+from django.db import transaction
 from drf_extra_fields.fields import Base64ImageField
 from rest_framework import serializers
 from rest_framework.fields import SerializerMethodField
 from rest_framework.validators import UniqueValidator
 
 from enums.ingredient_recipe_enum import IngredientRecipeEnum
+from enums.recipe_enum import RecipeEnum
 from enums.tag_enum import TagEnum
-from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag
-from users.models import User
-
+from enums.user_enum import UserEnum
+from recipes.images import delete_unreferenced_upload, stage_image
+from recipes.models import Ingredient, IngredientRecipe, Recipe, ShoppingListItem, Tag
+from recipes.sync import sync_recipe_ingredients, sync_recipe_tags
+from users.models import Subscription, User
+
+from api.fields import (BulkPrimaryKeyRelatedField, DeferredPrimaryKeyRelatedField,
+                        ThumbnailsField, resolve_ids)
 from api.mixins import RecipeMixin
 
 class UserSerializer(serializers.ModelSerializer):
@@ -52,7 +61,27 @@ class UserSerializer(serializers.ModelSerializer):
         user = self.context.get('request').user
         if user.is_anonymous or (user == obj):
             return False
-        return user.subscribe.filter(id=obj.id).exists()
+        return obj.id in self.get_subscribed_ids(user)
+
+    def get_subscribed_ids(self, user: User) -> set:
+        """Return the ids of authors the current user is subscribed to.
+
+        The ids are loaded with a single query and stored in the serializer
+        context, which is shared by nested and list serializers of one request.
+
+        Args:
+            user (User): The current user.
+
+        Returns:
+            set: Ids of the followed authors.
+        """
+        key = UserEnum.SUBSCRIBED_IDS_CONTEXT_KEY.value
+        if key not in self.context:
+            self.context[key] = set(
+                Subscription.objects.filter(user_id=user.id)
+                .values_list('author_id', flat=True)
+            )
+        return self.context[key]
 
     def create(self, validated_data):
         """Create a new user with the requested fields.
@@ -75,16 +104,37 @@ class UserSerializer(serializers.ModelSerializer):
 
 class ShortRecipeSerializer(serializers.ModelSerializer):
     """Serializer for the Recipe model with a shortened set of fields."""
+    thumbnails = ThumbnailsField()
+
     class Meta:
         model = Recipe
-        fields = 'id', 'name', 'image', 'cooking_time'
+        fields = 'id', 'name', 'image', 'thumbnails', 'cooking_time'
         read_only_fields = ('__all__',)
 
+class SimilarRecipeSerializer(ShortRecipeSerializer):
+    """Short recipe together with its similarity to the requested recipe."""
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta(ShortRecipeSerializer.Meta):
+        fields = ShortRecipeSerializer.Meta.fields + (RecipeEnum.SIMILARITY_FIELD.value,)
+
+
+class PantryRecipeSerializer(ShortRecipeSerializer):
+    """Short recipe together with the share of its ingredients found in the pantry."""
+    coverage = serializers.FloatField(read_only=True)
+    missing_count = serializers.IntegerField(read_only=True)
+
+    class Meta(ShortRecipeSerializer.Meta):
+        fields = ShortRecipeSerializer.Meta.fields + (
+            RecipeEnum.PANTRY_COVERAGE_FIELD.value, RecipeEnum.PANTRY_MISSING_FIELD.value,
+        )
+
+
 class TagSerializer(serializers.ModelSerializer):
     """Serializer for displaying tags."""
     class Meta:
         model = Tag
-        fields = '__all__'
+        fields = TagEnum.SERIALIZER_FIELDS.value
 
 class IngredientSerializer(serializers.ModelSerializer):
     """Serializer for the Ingredient model."""
@@ -95,10 +145,47 @@ class IngredientSerializer(serializers.ModelSerializer):
         model = Ingredient
         fields = 'id', 'name', 'measurement_unit'
 
+class ShoppingListItemSerializer(serializers.ModelSerializer):
+    """Serializer for a line of the aggregated shopping list."""
+    id = serializers.ReadOnlyField(source='ingredient.id')
+    name = serializers.ReadOnlyField(source='ingredient.name')
+    measurement_unit = serializers.ReadOnlyField(source='ingredient.measurement_unit')
+
+    class Meta:
+        model = ShoppingListItem
+        fields = 'id', 'name', 'measurement_unit', 'amount'
+
+class IngredientRecipeListSerializer(serializers.ListSerializer):
+    """List serializer resolving the ingredients of all items with one query."""
+
+    def to_internal_value(self, data):
+        """Validate the items, then fetch every submitted ingredient at once.
+
+        Raises:
+            serializers.ValidationError: If ingredients repeat or do not exist.
+        """
+        items = super().to_internal_value(data)
+        field = IngredientRecipeEnum.INGREDIENT_FIELD.value
+        ids = [item[field] for item in items]
+        duplicates = sorted({pk for pk in ids if ids.count(pk) > 1})
+        if duplicates:
+            raise serializers.ValidationError(
+                IngredientRecipeEnum.DUPLICATE_INGREDIENTS_MESSAGE.value.format(
+                    ids=', '.join(map(str, duplicates)))
+            )
+        ingredients = resolve_ids(
+            Ingredient.objects.all(), ids,
+            IngredientRecipeEnum.MISSING_INGREDIENTS_MESSAGE.value,
+        )
+        for item, ingredient in zip(items, ingredients):
+            item[field] = ingredient
+        return items
+
+
 class IngredientRecipeSerializer(serializers.ModelSerializer):
     """Serializer for the RecipeSerializer class attribute."""
 
-    id = serializers.PrimaryKeyRelatedField(
+    id = DeferredPrimaryKeyRelatedField(
         source='ingredient', queryset=Ingredient.objects.all()
     )
     name = serializers.StringRelatedField(source='ingredient.name')
@@ -109,6 +196,7 @@ class IngredientRecipeSerializer(serializers.ModelSerializer):
     class Meta:
         model = IngredientRecipe
         fields = ['id', 'amount', 'name', 'measurement_unit']
+        list_serializer_class = IngredientRecipeListSerializer
 
     @staticmethod
     def validate_amount(value):
@@ -135,9 +223,10 @@ class RecipeCreateSerializer(RecipeMixin):
     """Serializer for the Recipe model."""
 
     author = UserSerializer(read_only=True)
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = BulkPrimaryKeyRelatedField(
         many=True,
-        queryset=Tag.objects.all()
+        queryset=Tag.objects.all(),
+        missing_message=TagEnum.MISSING_TAGS_MESSAGE.value,
     )
     ingredients = IngredientRecipeSerializer(many=True, source='ingredients_amount')
     is_favorited = serializers.SerializerMethodField()
@@ -160,15 +249,26 @@ class RecipeCreateSerializer(RecipeMixin):
         )
         extra_kwargs = {'pub_date': {'write_only': True}}
 
-    @staticmethod
-    def add_ingredients(recipe, ingredients_data):
-        """Method to add ingredient rows to the IngredientRecipe table."""
-        for ingredient_data in ingredients_data:
-            IngredientRecipe.objects.create(
-                recipe=recipe,
-                amount=ingredient_data.get('amount'),
-                ingredient=ingredient_data.get('ingredient'),
-            )
+    def to_representation(self, instance):
+        """Render the saved recipe from the annotated queryset with preloaded relations."""
+        instance = Recipe.objects.with_user_flags(
+            self.context.get('request').user
+        ).with_relations().get(id=instance.id)
+        return super().to_representation(instance)
+
+    def save(self, **kwargs):
+        """Stage the uploaded image once the payload is valid, and drop it again if saving fails."""
+        image = self.validated_data.get('image')
+        if image is None:
+            return super().save(**kwargs)
+        name, stored = stage_image(image.read(), os.path.splitext(image.name)[1].lstrip('.'))
+        try:
+            with transaction.atomic():
+                return super().save(image=name, **kwargs)
+        except Exception:
+            if stored:
+                delete_unreferenced_upload(name)
+            raise
 
     def create(self, validated_data):
         """Overridden create method for correctly adding ingredients and tags."""
@@ -176,20 +276,21 @@ class RecipeCreateSerializer(RecipeMixin):
         tags = validated_data.pop('tags')
         recipe = Recipe.objects.create(**validated_data)
         recipe.tags.add(*tags)
-        self.add_ingredients(recipe, ingredients_data)
+        sync_recipe_ingredients(recipe, ingredients_data, created=True)
         return recipe
 
     def update(self, instance, validated_data):
-        """Overridden update method for correctly patching the recipe."""
+        """Overridden update method that only writes the changed ingredients and tags."""
         if TagEnum.TAGS_NAME.value in validated_data:
-            tags = validated_data.pop('tags')
-            instance.tags.clear()
-            instance.tags.add(*tags)
+            sync_recipe_tags(instance, validated_data.pop('tags'))
         if IngredientRecipeEnum.INGREDIENTS_AMOUNT.value in validated_data:
-            ingredients_data = validated_data.pop('ingredients_amount')
-            IngredientRecipe.objects.filter(recipe=instance).delete()
-            self.add_ingredients(instance, ingredients_data)
-        return super().update(instance, validated_data)
+            sync_recipe_ingredients(instance, validated_data.pop('ingredients_amount'))
+        # Only the submitted columns are written: the tag mask, counters and scores of
+        # `instance` are stale once the signals above or concurrent requests updated them.
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
 
 
 class RecipeSerializer(RecipeMixin):
@@ -203,6 +304,7 @@ class RecipeSerializer(RecipeMixin):
     author = UserSerializer(read_only=True)
     is_favorited = serializers.SerializerMethodField(read_only=True)
     is_in_shopping_cart = serializers.SerializerMethodField(read_only=True)
+    thumbnails = ThumbnailsField()
 
     class Meta:
         model = Recipe
@@ -215,6 +317,7 @@ class RecipeSerializer(RecipeMixin):
             'is_in_shopping_cart',
             'name',
             'image',
+            'thumbnails',
             'text',
             'cooking_time'
         )
@@ -222,17 +325,47 @@ class RecipeSerializer(RecipeMixin):
 
 class RecipeFavoriteCartSerializer(serializers.ModelSerializer):
     """Serializer for adding a recipe to the cart/favorites."""
+    thumbnails = ThumbnailsField()
 
     class Meta:
         model = Recipe
-        fields = 'id', 'name', 'image', 'cooking_time'
+        fields = 'id', 'name', 'image', 'thumbnails', 'cooking_time'
+
+
+class RecipeIdsSerializer(serializers.Serializer):
+    """Serializer for the list of recipe ids of a bulk favorites/cart request."""
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=RecipeEnum.BULK_MAX_RECIPES.value,
+    )
+
+
+class PantryQuerySerializer(serializers.Serializer):
+    """Serializer for the query parameters of a pantry search."""
+    ingredients = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=RecipeEnum.PANTRY_MAX_INGREDIENTS.value,
+    )
+    tags = serializers.SlugRelatedField(
+        many=True,
+        slug_field='slug',
+        queryset=Tag.objects.all(),
+        required=False,
+    )
+    max_cooking_time = serializers.IntegerField(min_value=1, required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=RecipeEnum.SIMILAR_MAX_LIMIT.value,
+        default=RecipeEnum.SIMILAR_DEFAULT_LIMIT.value,
+    )
 
 
 class UserSubscribeSerializer(UserSerializer):
     """Serializer for displaying authors subscribed by the current user."""
 
-    recipes = ShortRecipeSerializer(many=True,
-                                    read_only=True)
+    recipes = SerializerMethodField()
     recipes_count = SerializerMethodField()
 
     class Meta:
@@ -260,6 +393,43 @@ class UserSubscribeSerializer(UserSerializer):
         """
         return True
 
+    def get_recipes(self, obj):
+        """Show the latest recipes of the author.
+
+        The recipes of every author on the page are fetched with one query and
+        stored in the serializer context. The optional `recipes_limit` query
+        parameter caps the number of recipes per author.
+
+        Args:
+            obj (User): Requested user.
+
+        Returns:
+            list: Serialized recipes of the requested user.
+        """
+        key = UserEnum.AUTHOR_RECIPES_CONTEXT_KEY.value
+        if key not in self.context:
+            authors = getattr(self.parent, 'instance', None) or [obj]
+            self.context[key] = Recipe.objects.latest_for_authors(
+                [author.id for author in authors], self.get_recipes_limit()
+            )
+        recipes = self.context[key].get(obj.id, [])
+        return ShortRecipeSerializer(recipes, many=True, context=self.context).data
+
+    def get_recipes_limit(self):
+        """Read the `recipes_limit` query parameter.
+
+        Returns:
+            int: The requested limit, or None if it is missing or invalid.
+        """
+        request = self.context.get('request')
+        if request is None:
+            return None
+        try:
+            limit = int(request.query_params[UserEnum.RECIPES_LIMIT_PARAM.value])
+        except (KeyError, ValueError):
+            return None
+        return limit if limit > 0 else None
+
     @staticmethod
     def get_recipes_count(obj):
         """Show the total number of recipes for each author.
@@ -270,4 +440,4 @@ class UserSubscribeSerializer(UserSerializer):
         Returns:
             int: Number of recipes created by the requested user.
         """
-        return obj.recipes.count()
+        return obj.recipes_count
@@ -0,0 +1,82 @@
+import csv
+import json
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator
+
+from enums.shopping_list_enum import ShoppingListEnum
+
+NAME = ShoppingListEnum.NAME_FIELD.value
+UNIT = ShoppingListEnum.UNIT_FIELD.value
+AMOUNT = ShoppingListEnum.AMOUNT_FIELD.value
+
+
+class LineBuffer:
+    """File-like object that hands back what csv.writer writes instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def group_by_unit(rows: Iterable[Dict]) -> Iterator:
+    """Group rows ordered by measurement unit into `(unit, rows)` pairs."""
+    return groupby(rows, key=itemgetter(UNIT))
+
+
+def iter_txt(rows: Iterable[Dict], first_name: str) -> Iterator[str]:
+    """Yield the shopping list as plain text with a section per measurement unit."""
+    yield ShoppingListEnum.TITLE.value.format(first_name=first_name) + '\n'
+    for unit, lines in group_by_unit(rows):
+        yield f'\n[{unit}]\n'
+        for line in lines:
+            yield f'{line[NAME]}: {line[AMOUNT]} {unit}\n'
+    yield f'\n\n{ShoppingListEnum.FOOTER.value}\n'
+
+
+def iter_csv(rows: Iterable[Dict], first_name: str) -> Iterator[str]:
+    """Yield the shopping list as CSV rows ordered by measurement unit."""
+    writer = csv.writer(LineBuffer())
+    yield writer.writerow(ShoppingListEnum.CSV_HEADER.value)
+    for line in rows:
+        yield writer.writerow((line[UNIT], line[NAME], line[AMOUNT]))
+
+
+def iter_json(rows: Iterable[Dict], first_name: str) -> Iterator[str]:
+    """Yield the shopping list as a JSON object with the lines grouped by unit.
+
+    The document is written piece by piece, so it is never held in memory whole.
+    """
+    yield '{"units": ['
+    for index, (unit, lines) in enumerate(group_by_unit(rows)):
+        separator = ', ' if index else ''
+        yield f'{separator}{{"measurement_unit": {json.dumps(unit, ensure_ascii=False)}, "ingredients": ['
+        for position, line in enumerate(lines):
+            item = f'{{"name": {json.dumps(line[NAME], ensure_ascii=False)}, "amount": {line[AMOUNT]}}}'
+            yield f', {item}' if position else item
+        yield ']}'
+    yield ']}\n'
+
+
+WRITERS = {
+    'txt': iter_txt,
+    'csv': iter_csv,
+    'json': iter_json,
+}
+
+
+def iter_shopping_list(rows: Iterable[Dict], export_format: str, first_name: str) -> Iterator[bytes]:
+    """Encode the output of the chosen writer as UTF-8 chunks of about BUFFER_SIZE.
+
+    Lines are batched so the server does not flush one tiny write per ingredient.
+    """
+    buffer = []
+    size = 0
+    for piece in WRITERS[export_format](rows, first_name):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= ShoppingListEnum.BUFFER_SIZE.value:
+            yield ''.join(buffer).encode()
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer).encode()
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.counters import invalidate_counts
+from api.response_cache import invalidate_recipe_lists, invalidate_scored_recipe_lists
+from enums.pagination_enum import PaginationEnum
+from recipes.models import Favorite, Ingredient, Recipe, ShoppingCartItem, Tag
+from users.models import Subscription, User
+
+# Caches are invalidated on commit: a reader that refills a cache between the
+# write and the commit would otherwise store data that is already outdated.
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Favorite)
+@receiver(m2m_changed, sender=ShoppingCartItem)
+def invalidate_recipe_counts(sender, **kwargs):
+    """Drop cached recipe list counts when recipes or their relations change."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        transaction.on_commit(lambda: invalidate_counts(PaginationEnum.RECIPES_NAMESPACE.value))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Subscription)
+def invalidate_user_counts(sender, **kwargs):
+    """Drop cached user list counts when users or subscriptions change."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        transaction.on_commit(lambda: invalidate_counts(PaginationEnum.USERS_NAMESPACE.value))
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def invalidate_recipe_list_cache(sender, **kwargs):
+    """Drop cached recipe pages when anything they render changes."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        transaction.on_commit(invalidate_recipe_lists)
+
+
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Favorite)
+@receiver(m2m_changed, sender=ShoppingCartItem)
+def invalidate_scored_recipe_list_cache(sender, **kwargs):
+    """Drop cached popular and trending pages when favorites or carts, or their users, go."""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        transaction.on_commit(invalidate_scored_recipe_lists)
+
+
+@receiver(post_save, sender=User)
+def invalidate_recipe_list_cache_on_author_change(sender, update_fields=None, **kwargs):
+    """Drop cached recipe pages when a user profile changes, but not on login."""
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        transaction.on_commit(invalidate_recipe_lists)
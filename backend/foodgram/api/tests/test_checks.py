@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase, override_settings
+
+from api.checks import check_cache_reachable, check_shared_cache
+from enums.base_enum import BaseEnum
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+DUMMY = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache', 'LOCATION': 'cache:11211'}}
+
+
+class CacheCheckTests(SimpleTestCase):
+
+    def get_ids(self, check, config) -> list:
+        with override_settings(CACHES=config):
+            return [warning.id for warning in check(None)]
+
+    def test_process_local_cache(self):
+        self.assertEqual(self.get_ids(check_shared_cache, LOCMEM), [BaseEnum.PROCESS_LOCAL_CACHE_ID.value])
+        self.assertEqual(self.get_ids(check_cache_reachable, LOCMEM), [])
+
+    def test_cache_that_stores_nothing(self):
+        self.assertEqual(self.get_ids(check_shared_cache, DUMMY), [])
+        self.assertEqual(self.get_ids(check_cache_reachable, DUMMY), [BaseEnum.UNREACHABLE_CACHE_ID.value])
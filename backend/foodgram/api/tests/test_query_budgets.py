@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from recipes.tests.factories import DatasetMixin
+
+
+class QueryBudgetTests(DatasetMixin, TestCase):
+    """The number of queries of a page does not grow with its size.
+
+    Budgets count the savepoint and its release added by ATOMIC_REQUESTS.
+    """
+
+    page_sizes = (1, 12)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+        cls.recipes[0].favorite.add(cls.reader)
+        cls.recipes[1].in_cart.add(cls.reader)
+        cls.reader.subscribe.add(*cls.users[:3])
+
+    def setUp(self):
+        cache.clear()
+
+    def assert_budget(self, budget, url, user=None):
+        client = self.get_client(user)
+        for page_size in self.page_sizes:
+            cache.clear()
+            with self.subTest(url=url, page_size=page_size), self.assertNumQueries(budget):
+                response = client.get(url.format(limit=page_size))
+                self.assertEqual(response.status_code, 200, response.content)
+
+    def test_recipe_list(self):
+        self.assert_budget(6, '/api/recipes/?limit={limit}')
+
+    def test_recipe_list_with_user_flags(self):
+        self.assert_budget(7, '/api/recipes/?limit={limit}', self.reader)
+
+    def test_recipe_list_by_cursor(self):
+        self.assert_budget(6, '/api/recipes/?cursor=&limit={limit}', self.reader)
+
+    def test_recipe_list_by_popularity(self):
+        self.assert_budget(7, '/api/recipes/?ordering=popular&limit={limit}', self.reader)
+
+    def test_recipe_detail(self):
+        self.assert_budget(5, f'/api/recipes/{self.recipes[0].id}/')
+        self.assert_budget(6, f'/api/recipes/{self.recipes[0].id}/', self.reader)
+
+    def test_subscriptions(self):
+        self.assert_budget(5, '/api/users/subscriptions/?limit={limit}&recipes_limit=2', self.reader)
+
+    def test_cached_recipe_list(self):
+        client = self.get_client(self.reader)
+        client.get('/api/recipes/?limit=12')
+        # A cached page only costs the user flags: favorites, cart and subscriptions.
+        with self.assertNumQueries(5):
+            response = client.get('/api/recipes/?limit=12')
+        flags = {recipe['id']: recipe for recipe in response.json()['results']}
+        self.assertTrue(flags[self.recipes[0].id]['is_favorited'])
+        self.assertTrue(flags[self.recipes[1].id]['is_in_shopping_cart'])
+        self.assertTrue(all(recipe['author']['is_subscribed'] for recipe in flags.values()))
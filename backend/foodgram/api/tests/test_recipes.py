@@ -0,0 +1,220 @@
+import base64
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from enums.recipe_enum import RecipeEnum
+from recipes.counters import find_counter_mismatches
+from recipes.images import delete_unreferenced_upload
+from recipes.models import Favorite, Recipe, ShoppingCartItem
+from recipes.shopping_lists import find_shopping_list_mismatches
+from api import utils
+from recipes.tests.factories import DatasetMixin
+
+
+class CursorPaginationTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_walk_is_stable_across_inserts(self):
+        client = self.get_client()
+        url, seen = '/api/recipes/?cursor=&limit=5', []
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            data = response.json()
+            self.assertNotIn('count', data)
+            seen += [recipe['id'] for recipe in data['results']]
+            if len(seen) == 5:
+                Recipe.objects.create(
+                    author=self.users[0], name='new', image='recipes/image.jpg', text='text', cooking_time=5,
+                )
+            url = data['next']
+        self.assertEqual(seen, [recipe.id for recipe in self.newest_first(self.recipes)])
+
+    def test_filtered_walk(self):
+        client = self.get_client()
+        data = client.get('/api/recipes/?cursor=&limit=3&tags=breakfast&tags=lunch').json()
+        seen = [recipe['id'] for recipe in data['results']]
+        seen += [recipe['id'] for recipe in client.get(data['next']).json()['results']]
+        expected = [recipe for number, recipe in enumerate(self.recipes) if number % 3 != 2]
+        self.assertEqual(seen, [recipe.id for recipe in self.newest_first(expected)][:6])
+
+    def test_search_rejects_cursor(self):
+        client = self.get_client()
+        self.assertEqual(client.get('/api/recipes/?cursor=&search=recipe').status_code, 400)
+        self.assertEqual(client.get('/api/recipes/?search=recipe').status_code, 200)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.get_client().get('/api/recipes/?cursor=invalid').status_code, 404)
+
+
+class RecipeUpdateTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def test_tag_change_keeps_the_tag_mask(self):
+        recipe = self.recipes[0]
+        recipe.tags.set(self.tags[:2])
+        recipe.favorite.add(self.reader)
+        response = self.get_client(recipe.author).patch(
+            f'/api/recipes/{recipe.id}/',
+            {
+                'tags': [tag.id for tag in self.tags[1:]],
+                'ingredients': [{'id': self.ingredients[0].id, 'amount': 1}],
+                'name': 'edited', 'text': 'edited', 'cooking_time': 5,
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        tagged = Recipe.objects.with_any_tag([self.tags[2]])
+        self.assertIn(recipe, tagged)
+        self.assertNotIn(recipe, Recipe.objects.with_any_tag([self.tags[0]]))
+        recipe.refresh_from_db()
+        self.assertEqual((recipe.name, recipe.favorites_count), ('edited', 1))
+        self.assertFalse(any(find_counter_mismatches().values()))
+
+
+class RecipeImageTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = self.get_client(self.users[0])
+
+    def get_payload(self, **fields) -> dict:
+        output = io.BytesIO()
+        Image.new('RGB', (4, 4), 'red').save(output, 'PNG')
+        payload = {
+            'tags': [self.tags[0].id],
+            'ingredients': [{'id': self.ingredients[0].id, 'amount': 1}],
+            'name': 'new', 'text': 'text', 'cooking_time': 5,
+            'image': 'data:image/png;base64,' + base64.b64encode(output.getvalue()).decode(),
+        }
+        payload.update(fields)
+        return payload
+
+    def get_uploads(self) -> list:
+        directory = os.path.join(self.media_root, RecipeEnum.IMAGE_UPLOAD_DIR.value)
+        return os.listdir(directory) if os.path.isdir(directory) else []
+
+    def test_upload_is_staged(self):
+        response = self.client.post('/api/recipes/', self.get_payload(), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        recipe = Recipe.objects.get(id=response.json()['id'])
+        self.assertEqual([f'{RecipeEnum.IMAGE_UPLOAD_DIR.value}/{name}' for name in self.get_uploads()],
+                         [recipe.image.name])
+        self.assertFalse(delete_unreferenced_upload(recipe.image.name))
+
+    def test_invalid_payload_stores_nothing(self):
+        response = self.client.post('/api/recipes/', self.get_payload(tags=[99999]), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.get_uploads(), [])
+
+    def test_failed_save_removes_the_upload(self):
+        with mock.patch('api.serializers.sync_recipe_ingredients', side_effect=RuntimeError):
+            response = self.client.post('/api/recipes/', self.get_payload(), format='json')
+        self.assertFalse(response.json()['success'])
+        self.assertFalse(Recipe.objects.filter(name='new').exists())
+        self.assertEqual(self.get_uploads(), [])
+
+
+class BulkRelationTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def setUp(self):
+        self.client = self.get_client(self.reader)
+
+    def assert_consistent(self):
+        self.assertFalse(any(find_counter_mismatches().values()))
+        self.assertEqual(find_shopping_list_mismatches(), 0)
+
+    def get_statuses(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return {item['id']: item['status'] for item in response.json()[RecipeEnum.BULK_RECIPES_FIELD.value]}
+
+    def test_add_and_remove_in_cart(self):
+        first, second, third = self.recipes[:3]
+        self.client.post(f'/api/recipes/{first.id}/shopping_cart/')
+        statuses = self.get_statuses(self.client.post(
+            '/api/recipes/shopping_cart/', {'recipes': [first.id, second.id, third.id, 99999]}, format='json',
+        ))
+        self.assertEqual(statuses, {
+            first.id: RecipeEnum.BULK_ALREADY_ADDED.value,
+            second.id: RecipeEnum.BULK_ADDED.value,
+            third.id: RecipeEnum.BULK_ADDED.value,
+            99999: RecipeEnum.BULK_NOT_FOUND.value,
+        })
+        self.assertEqual(ShoppingCartItem.objects.filter(user=self.reader).count(), 3)
+        self.assert_consistent()
+        statuses = self.get_statuses(self.client.delete(
+            '/api/recipes/shopping_cart/', {'recipes': [first.id, self.recipes[5].id]}, format='json',
+        ))
+        self.assertEqual(statuses, {
+            first.id: RecipeEnum.BULK_REMOVED.value,
+            self.recipes[5].id: RecipeEnum.BULK_NOT_ADDED.value,
+        })
+        self.assertEqual(ShoppingCartItem.objects.filter(user=self.reader).count(), 2)
+        self.assert_consistent()
+
+    def test_add_favorites(self):
+        ids = [recipe.id for recipe in self.recipes[:4]]
+        self.get_statuses(self.client.post('/api/recipes/favorite/', {'recipes': ids}, format='json'))
+        self.assertEqual(
+            set(Favorite.objects.filter(user=self.reader).values_list('recipe_id', flat=True)), set(ids),
+        )
+        self.assert_consistent()
+
+    def test_rows_added_concurrently_are_not_counted_twice(self):
+        first, second = self.recipes[:2]
+        insert_relations = utils.insert_relations
+
+        def insert_after_concurrent_request(through, user, recipe_ids):
+            user.cart.add(first)
+            return insert_relations(through, user, recipe_ids) - {first.id}
+
+        with mock.patch('api.utils.insert_relations', insert_after_concurrent_request):
+            statuses = self.get_statuses(self.client.post(
+                '/api/recipes/shopping_cart/', {'recipes': [first.id, second.id]}, format='json',
+            ))
+        self.assertEqual(statuses, {
+            first.id: RecipeEnum.BULK_ALREADY_ADDED.value,
+            second.id: RecipeEnum.BULK_ADDED.value,
+        })
+        self.assertEqual(Recipe.objects.get(id=first.id).cart_count, 1)
+        self.assert_consistent()
+
+    def test_validation(self):
+        self.assertEqual(
+            self.client.post('/api/recipes/favorite/', {'recipes': []}, format='json').status_code, 400,
+        )
+        too_many = list(range(1, RecipeEnum.BULK_MAX_RECIPES.value + 2))
+        self.assertEqual(
+            self.client.post('/api/recipes/favorite/', {'recipes': too_many}, format='json').status_code, 400,
+        )
+        self.assertEqual(
+            self.get_client().post('/api/recipes/favorite/', {'recipes': [1]}, format='json').status_code, 401,
+        )
@@ -1,27 +1,37 @@
-from typing import Union
+from typing import List, Set, Union
 
-from django.http import HttpResponse
+from django.db import connection, router
+from django.db.models import Exists, OuterRef, QuerySet
+from django.db.models.signals import m2m_changed
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.generics import get_object_or_404
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from api.serializers import RecipeFavoriteCartSerializer, UserSubscribeSerializer
+from api.shopping_list import iter_shopping_list
 from enums.base_enum import BaseEnum
+from enums.recipe_enum import RecipeEnum
+from enums.shopping_list_enum import ShoppingListEnum
 from enums.user_enum import UserEnum
-from recipes.models import Recipe
-from users.models import User
-
-def get_ingredient_file(request: Request, ingredients) -> HttpResponse:
-    """Method for downloading a file with the shopping list."""
-    filename: str = f'{request.user.username}_shopping_list.txt'
-    shopping_list: str = f'Shopping list for: {request.user.first_name}\n\n'
-    for ing in ingredients:
-        shopping_list += f'{ing["ingredient__name"]}: {ing["amount"]} {ing["ingredient__measurement_unit"]}\n'
-
-    shopping_list += '\n\nCalculated in Foodgram'
-
-    response = HttpResponse(shopping_list, content_type='text.txt; charset=utf-8')
+from recipes.models import Favorite, Recipe, ShoppingCartItem
+from users.models import Subscription, User
+
+def get_ingredient_file(request: Request, ingredients: QuerySet,
+                        export_format: str) -> StreamingHttpResponse:
+    """Method for streaming a file with the shopping list in the requested format."""
+    filename: str = ShoppingListEnum.FILENAME.value.format(
+        username=request.user.username, extension=export_format,
+    )
+    rows = ingredients.order_by(*ShoppingListEnum.ORDERING.value).iterator(
+        chunk_size=ShoppingListEnum.CHUNK_SIZE.value
+    )
+    response = StreamingHttpResponse(
+        iter_shopping_list(rows, export_format, request.user.first_name),
+        content_type=ShoppingListEnum.CONTENT_TYPES.value[export_format],
+    )
     response['Content-Disposition'] = f'attachment; filename={filename}'
     return response
 
@@ -41,7 +51,7 @@ def is_subscribe_on_yourself(user: Request, id: str) -> Response:
 def add_subscribe(user: Request, subscriber: User,
                   serializer: UserSubscribeSerializer) -> Response:
     """Method to subscribe to a user."""
-    if user.subscribe.filter(username=subscriber.username).exists():
+    if Subscription.objects.filter(user_id=user.id, author_id=subscriber.id).exists():
         return Response(
             UserEnum.SUBSCRIBE_ERROR_YET_SUBSCRIBED.value,
             status=status.HTTP_400_BAD_REQUEST,
@@ -52,7 +62,7 @@ def add_subscribe(user: Request, subscriber: User,
 def del_subscriber(user: Request,
                    subscriber: User) -> Response:
     """Method to unsubscribe from a user."""
-    if not user.subscribe.filter(username=subscriber.username).exists():
+    if not Subscription.objects.filter(user_id=user.id, author_id=subscriber.id).exists():
         return Response(
             UserEnum.SUBSCRIBE_ERROR_DELETE_NOTHING.value,
             status=status.HTTP_400_BAD_REQUEST,
@@ -62,11 +72,11 @@ def del_subscriber(user: Request,
 
 def is_favorite(recipe: Recipe, user: User) -> bool:
     """Method to check if the user has favorited a recipe."""
-    return recipe.favorite.filter(username=user.username)
+    return Favorite.objects.filter(user_id=user.id, recipe_id=recipe.id).exists()
 
 def is_in_cart(recipe: Recipe, user: User) -> bool:
     """Method to check if the recipe is in the user's shopping cart."""
-    return recipe.in_cart.filter(username=user.username)
+    return ShoppingCartItem.objects.filter(user_id=user.id, recipe_id=recipe.id).exists()
 
 def add_favorite(recipe: Recipe, user: User):
     """Method to add a recipe to favorites."""
@@ -113,3 +123,101 @@ def add_delete_favorite_in_cart(user: User,
             )
         delete_favorite_or_cart(recipe, user)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def send_relation_changed(through, user: User, action: str, pk_set: set):
+    """Send m2m_changed for a bulk change of a user's recipe relation.
+
+    Its receivers keep counters, shopping lists and caches in sync as they do
+    for `add()` and `remove()`.
+    """
+    m2m_changed.send(
+        sender=through, instance=user, action=action, reverse=True,
+        model=Recipe, pk_set=pk_set, using=router.db_for_write(through),
+    )
+
+def get_relation_columns(through) -> tuple:
+    """Return the quoted table, user, recipe and created_at columns of a user-recipe relation."""
+    quote = connection.ops.quote_name
+    return (
+        quote(through._meta.db_table),
+        *(quote(through._meta.get_field(name).column) for name in ('user', 'recipe', 'created_at')),
+    )
+
+
+def insert_relations(through, user: User, recipe_ids: Set[int]) -> Set[int]:
+    """Relate recipes to a user, returning the ids of the rows actually inserted.
+
+    On PostgreSQL rows inserted meanwhile by a concurrent request are skipped by
+    ON CONFLICT and left out of RETURNING. SQLite lets one transaction write at a
+    time, so no row can appear between the caller's check and the insert.
+    """
+    if connection.vendor != 'postgresql':
+        through.objects.bulk_create(
+            [through(user_id=user.id, recipe_id=pk) for pk in recipe_ids],
+            ignore_conflicts=True,
+        )
+        return set(recipe_ids)
+    table, user_column, recipe_column, created_column = get_relation_columns(through)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ({user_column}, {recipe_column}, {created_column}) '
+            f'SELECT %s, recipe_id, %s FROM unnest(%s) AS recipe_id '
+            f'ON CONFLICT DO NOTHING RETURNING {recipe_column}',
+            [user.id, timezone.now(), list(recipe_ids)],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def delete_relations(through, user: User, recipe_ids: Set[int]) -> Set[int]:
+    """Unrelate recipes from a user, returning the ids of the rows actually deleted."""
+    if connection.vendor != 'postgresql':
+        through.objects.filter(user_id=user.id, recipe_id__in=recipe_ids).delete()
+        return set(recipe_ids)
+    table, user_column, recipe_column, _ = get_relation_columns(through)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {user_column} = %s AND {recipe_column} = ANY(%s) '
+            f'RETURNING {recipe_column}',
+            [user.id, list(recipe_ids)],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def bulk_favorite_or_cart(user: User, method: str, through, recipe_ids: List[int]) -> Response:
+    """Method to Add/Delete many recipes from favorites/shopping cart at once.
+
+    One query finds which recipes exist and which are already related, then the
+    missing rows are inserted with one INSERT or the present rows are removed with
+    one DELETE. Signals and the response only count the rows these statements
+    changed, not those a concurrent request changed first.
+    """
+    ids = list(dict.fromkeys(recipe_ids))
+    selected = dict(
+        Recipe.objects.filter(id__in=ids).annotate(
+            selected=Exists(through.objects.filter(user_id=user.id, recipe_id=OuterRef('pk')))
+        ).values_list('id', 'selected')
+    )
+    adding = method in BaseEnum.POST_METHOD.value
+    changed = {pk for pk, is_selected in selected.items() if is_selected != adding}
+    if changed and adding:
+        send_relation_changed(through, user, 'pre_add', changed)
+        changed = insert_relations(through, user, changed)
+        send_relation_changed(through, user, 'post_add', changed)
+    elif changed:
+        send_relation_changed(through, user, 'pre_remove', changed)
+        changed = delete_relations(through, user, changed)
+        send_relation_changed(through, user, 'post_remove', changed)
+    unchanged = RecipeEnum.BULK_ALREADY_ADDED.value if adding else RecipeEnum.BULK_NOT_ADDED.value
+    done = RecipeEnum.BULK_ADDED.value if adding else RecipeEnum.BULK_REMOVED.value
+    results = [
+        {
+            'id': pk,
+            'status': (
+                RecipeEnum.BULK_NOT_FOUND.value if pk not in selected
+                else done if pk in changed else unchanged
+            ),
+        }
+        for pk in ids
+    ]
+    return Response({RecipeEnum.BULK_RECIPES_FIELD.value: results}, status=status.HTTP_200_OK)
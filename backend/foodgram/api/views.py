@@ -1,26 +1,40 @@
-from django.db.models import Sum
+from django.core.cache import cache
+from django.http import FileResponse, Http404
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet as DjoserUserViewSet
-from rest_framework import viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 from api.filters import RecipeFilterSet
 from api.mixins import ListRetrieveViewSet
-from api.paginators import PageLimitPagination
+from api.negotiation import IgnoreFormatContentNegotiation
+from api.paginators import FeedKeysetPagination, PageLimitPagination, RecipeKeysetPagination
 from api.permissions import IsAuthorOrStaffOrReadOnly  # Fixed typo in the import statement
+from api.response_cache import get_list_cache_key, overlay_user_flags, strip_user_flags
 from api.serializers import (IngredientSerializer, RecipeSerializer,
                              TagSerializer, UserSubscribeSerializer,
-                             RecipeCreateSerializer)
+                             RecipeCreateSerializer, RecipeIdsSerializer,
+                             ShoppingListItemSerializer, SimilarRecipeSerializer,
+                             PantryQuerySerializer, PantryRecipeSerializer)
 from api.utils import (get_ingredient_file, is_in_cart, add_in_cart,
                        add_delete_favorite_in_cart, del_from_cart,
                        is_favorite, add_favorite, del_from_favorite, is_anonymous, is_subscribe_on_yourself,
-                       add_subscribe, del_subscriber)
+                       add_subscribe, del_subscriber, bulk_favorite_or_cart)
 from enums.base_enum import BaseEnum
+from enums.feed_enum import FeedEnum
+from enums.ingredient_recipe_enum import IngredientRecipeEnum
 from enums.recipe_enum import RecipeEnum
-from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag
+from enums.shopping_list_enum import ShoppingListEnum
+from enums.user_enum import UserEnum
+from recipes.ingredient_index import ingredient_index
+from recipes.models import Favorite, Ingredient, Recipe, ShoppingCartItem, ShoppingListItem, Tag
+from recipes.recipe_index import recipe_index
+from recipes.thumbnails import open_thumbnail
 from users.models import User
 
 
@@ -38,7 +52,7 @@ class IngredientViewSet(ListRetrieveViewSet):
     """
     A view set for handling ingredients.
     Retrieves and lists ingredients. Allows anonymous access.
-    Supports searching by ingredient name.
+    Supports searching by ingredient name, served from the in-memory prefix index.
     """
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
@@ -46,6 +60,16 @@ class IngredientViewSet(ListRetrieveViewSet):
     filter_backends = (SearchFilter,)
     search_fields = ('^name',)
 
+    def list(self, request, *args, **kwargs):
+        """
+        Lists ingredients, ranking search results by exact, prefix and word-prefix match.
+        """
+        query = request.query_params.get(api_settings.SEARCH_PARAM)
+        if not query:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer(ingredient_index.search(query), many=True)
+        return Response(serializer.data)
+
 
 class RecipeViewSet(viewsets.ModelViewSet):
     """
@@ -56,11 +80,37 @@ class RecipeViewSet(viewsets.ModelViewSet):
     """
     queryset = Recipe.objects.all()
     serializer_class = RecipeSerializer
-    pagination_class = PageLimitPagination
+    pagination_class = RecipeKeysetPagination
     permission_classes = (IsAuthorOrStaffOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilterSet
 
+    def get_queryset(self):
+        """
+        Returns recipes with the user flags annotated and all nested relations preloaded,
+        so a page of any size is rendered with a fixed number of queries.
+        """
+        return Recipe.objects.with_user_flags(
+            self.request.user
+        ).with_relations()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lists recipes from the shared page cache.
+        Pages are cached as an anonymous user sees them, and the flags of the
+        current user are overlaid from small id sets.
+        """
+        key = get_list_cache_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+        data = cache.get(key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(key, strip_user_flags(response.data),
+                      RecipeEnum.LIST_CACHE_TIMEOUT.value)
+            return response
+        return Response(overlay_user_flags(data, request.user))
+
     def get_serializer_class(self):
         """
         Returns the appropriate serializer class based on the request method.
@@ -109,19 +159,161 @@ class RecipeViewSet(viewsets.ModelViewSet):
             delete_favorite_or_cart=del_from_cart, add_error_message=RecipeEnum.ERROR_MESSAGE_IS_IN_CART_YET.value,
             del_error_message=RecipeEnum.ERROR_MESSAGE_IS_NOT_IN_CART.value, pk=pk)
 
+    @action(methods=BaseEnum.DEL_POST_METHODS.value,
+            detail=False,
+            url_path='favorite',
+            permission_classes=[IsAuthenticated, ])
+    def bulk_favorite(self, request):
+        """
+        Adds or removes a list of recipes from the user's favorites in one request.
+        """
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return bulk_favorite_or_cart(
+            user=request.user, method=request.method, through=Favorite,
+            recipe_ids=serializer.validated_data[RecipeEnum.BULK_RECIPES_FIELD.value])
+
+    @action(methods=BaseEnum.DEL_POST_METHODS.value,
+            detail=False,
+            url_path='shopping_cart',
+            permission_classes=[IsAuthenticated, ])
+    def bulk_shopping_cart(self, request):
+        """
+        Adds or removes a list of recipes from the user's shopping cart in one request.
+        """
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return bulk_favorite_or_cart(
+            user=request.user, method=request.method, through=ShoppingCartItem,
+            recipe_ids=serializer.validated_data[RecipeEnum.BULK_RECIPES_FIELD.value])
+
+    @action(methods=[BaseEnum.GET_METHOD.value, ],
+            detail=True,
+            url_path=r'thumbnail/(?P<size>\w+)',
+            permission_classes=[AllowAny, ],)
+    def thumbnail(self, request, pk, size):
+        """
+        Returns a downscaled variant of the recipe image, generated on first request.
+        """
+        if size not in RecipeEnum.THUMBNAIL_SIZES.value:
+            raise Http404
+        recipe = get_object_or_404(Recipe.objects.only('image'), id=pk)
+        if not recipe.image:
+            raise Http404
+        return FileResponse(open_thumbnail(recipe.image.name, size))
+
+    @action(methods=[BaseEnum.GET_METHOD.value, ],
+            detail=True,
+            permission_classes=[AllowAny, ],)
+    def similar(self, request, pk):
+        """
+        Returns the recipes sharing the most ingredients with this one (`?limit=`),
+        ranked by the Jaccard similarity of their ingredient sets.
+        """
+        recipe = get_object_or_404(Recipe.objects.only('id'), id=pk)
+        try:
+            limit = int(request.query_params.get(
+                RecipeEnum.SIMILAR_LIMIT_PARAM.value, RecipeEnum.SIMILAR_DEFAULT_LIMIT.value
+            ))
+        except ValueError:
+            limit = RecipeEnum.SIMILAR_DEFAULT_LIMIT.value
+        limit = min(max(limit, 1), RecipeEnum.SIMILAR_MAX_LIMIT.value)
+        ranked = recipe_index.similar(recipe.id, limit)
+        recipes = Recipe.objects.in_bulk([recipe_id for recipe_id, _ in ranked])
+        similar = []
+        for recipe_id, similarity in ranked:
+            if recipe_id in recipes:
+                recipes[recipe_id].similarity = round(similarity, 4)
+                similar.append(recipes[recipe_id])
+        return Response(SimilarRecipeSerializer(
+            similar, many=True, context=self.get_serializer_context()
+        ).data)
+
     @action(methods=[BaseEnum.GET_METHOD.value, ],
             detail=False,
-            permission_classes=[IsAuthenticated, ],)
+            permission_classes=[AllowAny, ],)
+    def pantry(self, request):
+        """
+        Returns the recipes that can be cooked from the given ingredients
+        (`?ingredients=1&ingredients=2`), optionally limited by `tags` and
+        `max_cooking_time`, ranked by the share of their ingredients at hand.
+        """
+        serializer = PantryQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        tags = query.get('tags')
+        ranked = recipe_index.pantry(
+            query['ingredients'],
+            tag_ids=[tag.id for tag in tags] if tags else None,
+            max_cooking_time=query.get('max_cooking_time'),
+            limit=query['limit'],
+        )
+        recipes = Recipe.objects.in_bulk([recipe_id for recipe_id, _, _ in ranked])
+        matched = []
+        for recipe_id, coverage, missing_count in ranked:
+            if recipe_id in recipes:
+                recipes[recipe_id].coverage = round(coverage, 4)
+                recipes[recipe_id].missing_count = missing_count
+                matched.append(recipes[recipe_id])
+        return Response(PantryRecipeSerializer(
+            matched, many=True, context=self.get_serializer_context()
+        ).data)
+
+    @action(methods=[BaseEnum.GET_METHOD.value, ],
+            detail=False,
+            permission_classes=[IsAuthenticated, ],
+            pagination_class=FeedKeysetPagination,)
+    def feed(self, request, **kwargs):
+        """
+        Lists the recipes of the followed authors, newest first, paged by cursor.
+        Heavy followers read their materialized timeline, everyone else
+        gets the recipes selected through the subscriptions at read time.
+        """
+        queryset = self.get_queryset()
+        if request.user.feed_materialized:
+            queryset = queryset.from_timeline(request.user)
+            self.keyset_fields = FeedEnum.TIMELINE_KEYSET_FIELDS.value
+        else:
+            queryset = queryset.followed_by(request.user)
+        page = self.paginate_queryset(self.filter_queryset(queryset))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=[BaseEnum.GET_METHOD.value, ],
+            detail=False,
+            permission_classes=[IsAuthenticated, ],
+            content_negotiation_class=IgnoreFormatContentNegotiation,)
     def download_shopping_cart(self, request, **kwargs):
         """
-        Downloads the user's shopping cart as a text file.
+        Streams the user's shopping cart as a txt, csv or json file (`?format=`),
+        with the ingredients grouped by measurement unit.
         """
-        ingredients = (
-            IngredientRecipe.objects.filter(recipe__in_cart=request.user.id)
-            .values('ingredient__name', 'ingredient__measurement_unit')
-            .annotate(amount=Sum('amount'))
+        export_format = request.query_params.get(
+            ShoppingListEnum.FORMAT_QUERY_PARAM.value, ShoppingListEnum.DEFAULT_FORMAT.value
         )
-        return get_ingredient_file(request=request, ingredients=ingredients)
+        formats = ShoppingListEnum.CONTENT_TYPES.value
+        if export_format not in formats:
+            return Response(
+                ShoppingListEnum.UNKNOWN_FORMAT_MESSAGE.value.format(formats=', '.join(formats)),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ingredients = ShoppingListItem.objects.filter(user=request.user).values(
+            'ingredient__name', 'ingredient__measurement_unit', 'amount'
+        )
+        return get_ingredient_file(request=request, ingredients=ingredients,
+                                   export_format=export_format)
+
+    @action(methods=[BaseEnum.GET_METHOD.value, ],
+            detail=False,
+            permission_classes=[IsAuthenticated, ],)
+    def shopping_cart_summary(self, request, **kwargs):
+        """
+        Returns the total amount of every ingredient in the user's shopping cart.
+        """
+        items = ShoppingListItem.objects.filter(user=request.user).select_related(
+            IngredientRecipeEnum.INGREDIENT_FIELD.value
+        ).order_by(*ShoppingListEnum.ORDERING.value)
+        return Response(ShoppingListItemSerializer(items, many=True).data)
 
 
 class UserViewSet(DjoserUserViewSet):
@@ -146,7 +338,9 @@ class UserViewSet(DjoserUserViewSet):
         if is_subscribe_on_yourself(user, id):
             return is_subscribe_on_yourself(user, id)
         subscriber = get_object_or_404(User, id=id)
-        serializer = UserSubscribeSerializer(subscriber, many=False)
+        serializer = UserSubscribeSerializer(
+            subscriber, many=False, context={'request': request}
+        )
         if request.method in BaseEnum.ADD_METHODS.value:
             return add_subscribe(user=user, subscriber=subscriber,
                                  serializer=serializer)
@@ -161,7 +355,9 @@ class UserViewSet(DjoserUserViewSet):
         user = self.request.user
         if is_anonymous(user):
             return is_anonymous(user)
-        authors = user.subscribe.all()
+        authors = User.objects.filter(
+            **{f'{UserEnum.SUBSCRIBER_ENTRIES_RELATED_NAME.value}__user_id': user.id}
+        ).order_by(UserEnum.SUBSCRIPTIONS_ORDERING.value)
         pages = self.paginate_queryset(authors)
         serializer = UserSubscribeSerializer(
             pages,
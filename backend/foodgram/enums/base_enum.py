@@ -8,3 +8,20 @@ class BaseEnum(enum.Enum):
     DEL_METHODS = ('DELETE',)
     DEL_POST_METHODS = ('DELETE', 'POST')
     POST_METHOD = ('POST', )
+
+    PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+    PROCESS_LOCAL_CACHE_MESSAGE = 'The {alias!r} cache is local to each process.'
+    PROCESS_LOCAL_CACHE_HINT = (
+        'Cache invalidations, index versions and count versions do not reach the '
+        'other web workers, the job worker or management commands. Point '
+        'CACHE_BACKEND and CACHE_LOCATION at a shared cache such as memcached.'
+    )
+    PROCESS_LOCAL_CACHE_ID = 'api.W001'
+    CACHE_PROBE_KEY = 'cache_check_probe'
+    UNREACHABLE_CACHE_MESSAGE = 'The {alias!r} cache at {location!r} does not store values.'
+    UNREACHABLE_CACHE_HINT = (
+        'Cache errors are silent: index and count versions stay at their first value '
+        'and the in-memory indexes are never refreshed. Check that the cache server '
+        'is running and that CACHE_LOCATION points at it.'
+    )
+    UNREACHABLE_CACHE_ID = 'api.W002'
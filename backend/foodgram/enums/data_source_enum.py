@@ -0,0 +1,25 @@
+import enum
+
+
+class DataSourceEnum(enum.Enum):
+    SOURCE_VERBOSE_NAME = 'Loaded data source'
+    SOURCE_VERBOSE_NAME_PLURAL = 'Loaded data sources'
+
+    NAME_MAX_LENGTH = 255
+    NAME_VERBOSE_NAME = 'Path'
+    CHECKSUM_LENGTH = 64
+    CHECKSUM_VERBOSE_NAME = 'SHA-256 checksum'
+    ROWS_VERBOSE_NAME = 'Loaded rows'
+    LOADED_AT_VERBOSE_NAME = 'Loaded at'
+
+    READ_CHUNK_SIZE = 64 * 1024
+    BATCH_SIZE = 1000
+    CSV_EXTENSION = '.csv'
+    FIXTURE_KEYS = {'model', 'fields'}
+    INGREDIENT_FIELDS = ('name', 'measurement_unit')
+    SKIPPED_MODELS = {
+        'contenttypes.contenttype', 'auth.permission', 'admin.logentry', 'sessions.session',
+    }
+
+    NOT_AN_ARRAY_MESSAGE = '{name}: expected a JSON array of objects.'
+    MISSING_FIELD_MESSAGE = '{name}: row {row} has no "{field}".'
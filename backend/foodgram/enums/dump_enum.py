@@ -0,0 +1,15 @@
+import enum
+
+
+class DumpEnum(enum.Enum):
+    # Models of one level only reference models of the levels before it.
+    MODEL_LEVELS = (
+        ('users.user', 'recipes.tag', 'recipes.ingredient'),
+        ('recipes.recipe', 'users.subscription'),
+        ('recipes.ingredientrecipe', 'recipes.recipe_tags', 'recipes.recipe_ingredients',
+         'recipes.favorite', 'recipes.shoppingcartitem'),
+    )
+    EXCLUDED_FIELDS = {'search_vector'}
+    FILE_EXTENSION = '.ndjson'
+    CHUNK_SIZE = 2000
+    DEFAULT_WORKERS = 4
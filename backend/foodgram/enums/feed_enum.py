@@ -0,0 +1,20 @@
+import enum
+
+
+class FeedEnum(enum.Enum):
+    ENTRY_VERBOSE_NAME = 'Feed entry'
+    ENTRY_VERBOSE_NAME_PLURAL = 'Feed entries'
+    USER_VERBOSE_NAME = 'Reader'
+    RELATED_NAME = 'feed_entries'
+    PUB_DATE_VERBOSE_NAME = 'Recipe publication date'
+    CONSTRAINS_ENTRY_FIELDS = ['user', 'recipe']
+    CONSTRAINS_ENTRY_NAME = 'unique_feed_entry'
+    TIMELINE_INDEX_FIELDS = ['user', '-pub_date', '-recipe']
+    TIMELINE_INDEX_NAME = 'feed_user_pub_date_idx'
+
+    PUB_DATE_ANNOTATION = 'feed_pub_date'
+    RECIPE_ID_ANNOTATION = 'feed_recipe_id'
+    TIMELINE_KEYSET_FIELDS = ('feed_pub_date', 'feed_recipe_id')
+
+    MATERIALIZE_TASK = 'recipes.materialize_feeds'
+    BATCH_SIZE = 1000
@@ -10,3 +10,6 @@ class IngredientEnum(enum.Enum):
     COUNT_VERBOSE_NAME = 'Number of Ingredients'
     MEASUREMENT_UNIT_MAX_LENGTH = 50
     MEASUREMENT_UNIT_VERBOSE_NAME = 'Measurement Unit'
+
+    SEARCH_RESULTS_LIMIT = 50
+    SEARCH_INDEX_VERSION_KEY = 'ingredient_index_version'
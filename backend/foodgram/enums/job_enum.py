@@ -0,0 +1,45 @@
+import enum
+
+
+class JobEnum(enum.Enum):
+    JOB_VERBOSE_NAME = 'Job'
+    JOB_VERBOSE_NAME_PLURAL = 'Jobs'
+
+    NAME_MAX_LENGTH = 255
+    NAME_VERBOSE_NAME = 'Task name'
+    PAYLOAD_VERBOSE_NAME = 'Keyword arguments'
+    DEDUP_KEY_MAX_LENGTH = 255
+    DEDUP_KEY_VERBOSE_NAME = 'Deduplication key'
+    STATUS_MAX_LENGTH = 16
+    STATUS_VERBOSE_NAME = 'Status'
+    ATTEMPTS_VERBOSE_NAME = 'Attempts'
+    MAX_ATTEMPTS_VERBOSE_NAME = 'Max attempts'
+    RUN_AFTER_VERBOSE_NAME = 'Run after'
+    LOCKED_AT_VERBOSE_NAME = 'Locked at'
+    LAST_ERROR_VERBOSE_NAME = 'Last error'
+    CREATED_AT_VERBOSE_NAME = 'Created at'
+    FINISHED_AT_VERBOSE_NAME = 'Finished at'
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    QUEUE_INDEX_FIELDS = ['status', 'run_after']
+    QUEUE_INDEX_NAME = 'job_status_run_after_idx'
+    DEDUP_CONSTRAINT_NAME = 'job_pending_dedup_key'
+
+    TASKS_MODULE = 'tasks'
+    DEFAULT_MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 10
+    STALE_AFTER = 600
+    POLL_INTERVAL = 1.0
+    UNKNOWN_TASK_MESSAGE = 'Unknown task: {name}'
+    DONE_RETENTION = 24 * 60 * 60
+    POOL_CHOICES = ('thread', 'process')
@@ -0,0 +1,13 @@
+import enum
+
+
+class PaginationEnum(enum.Enum):
+    COUNT_CACHE_PREFIX = 'count'
+    COUNT_VERSION_PREFIX = 'count_version'
+    COUNT_CACHE_TIMEOUT = 300
+    COUNT_ESTIMATE_THRESHOLD = 100000
+    COUNT_IGNORED_PARAMS = ('page', 'limit', 'cursor')
+    COUNT_IS_EXACT_FIELD = 'count_is_exact'
+
+    RECIPES_NAMESPACE = 'recipes.recipe'
+    USERS_NAMESPACE = 'users.user'
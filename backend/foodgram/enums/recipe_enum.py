@@ -4,15 +4,73 @@ class RecipeEnum(enum.Enum):
     RECIPE_VERBOSE_NAME = 'Recipe'
     RECIPE_VERBOSE_NAME_PLURAL = 'Recipes'
 
-    RECIPE_ORDERING = ['-pub_date']
+    RECIPE_ORDERING = ['-pub_date', '-id']
+    RECIPE_KEYSET_ORDERING = ('-pub_date', '-id')
+    RECIPE_KEYSET_FIELDS = ('pub_date', 'id')
+    PUB_DATE_ID_INDEX_FIELDS = ['-pub_date', '-id']
+    PUB_DATE_ID_INDEX_NAME = 'recipe_pub_date_id_idx'
+    AUTHOR_PUB_DATE_INDEX_FIELDS = ['author', '-pub_date', '-id']
+    AUTHOR_PUB_DATE_INDEX_NAME = 'recipe_author_pub_date_idx'
+    POPULARITY_INDEX_FIELDS = ['-popularity', '-pub_date', '-id']
+    POPULARITY_INDEX_NAME = 'recipe_popularity_idx'
+    TRENDING_INDEX_FIELDS = ['-trending_score', '-pub_date', '-id']
+    TRENDING_INDEX_NAME = 'recipe_trending_idx'
+
+    ORDERING_PARAM = 'ordering'
+    ORDERING_CHOICES = (
+        ('popular', 'Most favorited and added to carts'),
+        ('trending', 'Popular lately'),
+    )
+    ORDERINGS = {
+        'popular': POPULARITY_INDEX_FIELDS,
+        'trending': TRENDING_INDEX_FIELDS,
+    }
+    ORDERING_CURSOR_MESSAGE = 'Cursor pagination is only available for the chronological ordering.'
+    SEARCH_CURSOR_MESSAGE = 'Search results are ranked by relevance and cannot use cursor pagination.'
+
+    SEARCH_CONFIG = 'russian'
+    SEARCH_VECTOR_VERBOSE_NAME = 'Search vector'
+    SEARCH_INDEX_NAME = 'recipe_search_vector_idx'
+
+    LIST_CACHE_PREFIX = 'recipe_list'
+    LIST_CACHE_VERSION_KEY = 'recipe_list_version'
+    SCORES_CACHE_VERSION_KEY = 'recipe_scores_version'
+    LIST_CACHE_TIMEOUT = 600
+    USER_SCOPED_FILTERS = ('is_favorited', 'is_in_shopping_cart')
+
+    CURSOR_QUERY_PARAM = 'cursor'
+    INVALID_CURSOR_MESSAGE = 'Invalid cursor'
 
     AUTHOR_RELATED_NAME = 'recipes'
     AUTHOR_VERBOSE_NAME = 'Author'
+    AUTHOR_FIELD = 'author'
 
     NAME_MAX_LENGTH = 100
     NAME_VERBOSE_NAME = 'Recipe Name'
 
     IMAGE_VERBOSE_NAME = 'Recipe Image'
+    IMAGE_MAX_SIZE = (1024, 1024)
+    IMAGE_FORMAT = 'WEBP'
+    IMAGE_FALLBACK_FORMAT = 'JPEG'
+    IMAGE_QUALITY = 75
+    IMAGE_INVALID_MESSAGE = 'Upload a valid image.'
+    IMAGE_UPLOAD_DIR = 'uploads'
+    OPTIMIZE_IMAGE_TASK = 'recipes.optimize_image'
+    REBUILD_COUNTERS_TASK = 'recipes.rebuild_counters'
+    THUMBNAIL_SIZES = {'small': 160, 'medium': 320, 'large': 640}
+
+    INDEX_VERSION_KEY = 'recipe_index_version'
+    INDEX_CHANGES_KEY = 'recipe_index_changes:{version}'
+    INDEX_CHANGES_TIMEOUT = 24 * 60 * 60
+    INDEX_MAX_PENDING_VERSIONS = 500
+    SIMILARITY_FIELD = 'similarity'
+    SIMILAR_LIMIT_PARAM = 'limit'
+    SIMILAR_DEFAULT_LIMIT = 10
+    SIMILAR_MAX_LIMIT = 50
+    PANTRY_MAX_INGREDIENTS = 200
+    PANTRY_COVERAGE_FIELD = 'coverage'
+    PANTRY_MISSING_FIELD = 'missing_count'
+    THUMBNAIL_URL_NAME = 'api:recipe-thumbnail'
 
     TEXT_VERBOSE_NAME = 'Recipe Text'
     TEXT_MAX_LENGTH = 1000
@@ -22,6 +80,8 @@ class RecipeEnum(enum.Enum):
 
     TAGS_RELATED_NAME = 'tags'
     TAGS_VERBOSE_NAME = 'Tags'
+    TAGS_MASK_VERBOSE_NAME = 'Tags bitmask'
+    TAGS_MASK_FIELD = 'tags_mask'
 
     COOKING_TIME = 'Cooking Time'
 
@@ -35,6 +95,49 @@ class RecipeEnum(enum.Enum):
     IN_CARD_RELATED_NAME = 'cart'
     IN_CARD_TO = 'self'
 
+    BULK_RECIPES_FIELD = 'recipes'
+    BULK_MAX_RECIPES = 100
+    BULK_ADDED = 'added'
+    BULK_REMOVED = 'removed'
+    BULK_ALREADY_ADDED = 'already_added'
+    BULK_NOT_ADDED = 'not_added'
+    BULK_NOT_FOUND = 'not_found'
+
+    FAVORITE_VERBOSE_NAME = 'Favorite recipe'
+    FAVORITE_VERBOSE_NAME_PLURAL = 'Favorite recipes'
+    FAVORITE_DB_TABLE = 'recipes_recipe_favorite'
+    FAVORITE_ENTRIES_RELATED_NAME = 'favorite_entries'
+    FAVORITE_UNIQUE_NAME = 'unique_favorite_user_recipe'
+    FAVORITE_RECIPE_INDEX_NAME = 'favorite_recipe_user_idx'
+    FAVORITE_CREATED_INDEX_NAME = 'favorite_user_created_idx'
+
+    CART_ITEM_VERBOSE_NAME = 'Recipe in shopping cart'
+    CART_ITEM_VERBOSE_NAME_PLURAL = 'Recipes in shopping carts'
+    CART_ITEM_DB_TABLE = 'recipes_recipe_in_cart'
+    CART_ENTRIES_RELATED_NAME = 'cart_entries'
+    CART_ITEM_UNIQUE_NAME = 'unique_cart_user_recipe'
+    CART_ITEM_RECIPE_INDEX_NAME = 'cart_recipe_user_idx'
+    CART_ITEM_CREATED_INDEX_NAME = 'cart_user_created_idx'
+
+    RELATION_USER_FIELDS = ['user', 'recipe']
+    RELATION_RECIPE_FIELDS = ['recipe', 'user']
+    RELATION_CREATED_FIELDS = ['user', '-created_at']
+    CREATED_AT_VERBOSE_NAME = 'Added at'
+
+    FAVORITES_COUNT_VERBOSE_NAME = 'Added to favorites'
+    FAVORITES_COUNT_FIELD = 'favorites_count'
+    CART_COUNT_VERBOSE_NAME = 'Added to shopping carts'
+    CART_COUNT_FIELD = 'cart_count'
+
+    POPULARITY_VERBOSE_NAME = 'Popularity'
+    POPULARITY_FIELD = 'popularity'
+    TRENDING_SCORE_VERBOSE_NAME = 'Trending score'
+    TRENDING_SCORE_FIELD = 'trending_score'
+    FAVORITE_SCORE_WEIGHT = 2
+    CART_SCORE_WEIGHT = 1
+    TRENDING_MIN_SCORE = 0.01
+    DECAY_TRENDING_TASK = 'recipes.decay_trending_scores'
+
     ERROR_MESSAGE_IS_FAVORITE_YET = {
         'message': 'Recipe already added to your favorites'
     }
@@ -0,0 +1,32 @@
+import enum
+
+
+class ShoppingListEnum(enum.Enum):
+    ITEM_VERBOSE_NAME = 'Shopping list item'
+    ITEM_VERBOSE_NAME_PLURAL = 'Shopping list items'
+    USER_VERBOSE_NAME = 'User'
+    USER_RELATED_NAME = 'shopping_list'
+    AMOUNT_VERBOSE_NAME = 'Total amount'
+    CONSTRAINS_ITEM_FIELDS = ['user', 'ingredient']
+    CONSTRAINS_ITEM_NAME = 'unique_shopping_list_item'
+
+    FORMAT_QUERY_PARAM = 'format'
+    DEFAULT_FORMAT = 'txt'
+    CONTENT_TYPES = {
+        'txt': 'text/plain; charset=utf-8',
+        'csv': 'text/csv; charset=utf-8',
+        'json': 'application/json; charset=utf-8',
+    }
+    FILENAME = '{username}_shopping_list.{extension}'
+    UNKNOWN_FORMAT_MESSAGE = 'Unknown format, use one of: {formats}.'
+
+    TITLE = 'Shopping list for: {first_name}'
+    FOOTER = 'Calculated in Foodgram'
+    CSV_HEADER = ('measurement_unit', 'name', 'amount')
+
+    NAME_FIELD = 'ingredient__name'
+    UNIT_FIELD = 'ingredient__measurement_unit'
+    AMOUNT_FIELD = 'amount'
+    ORDERING = ('ingredient__measurement_unit', 'ingredient__name')
+    CHUNK_SIZE = 2000
+    BUFFER_SIZE = 64 * 1024
@@ -13,3 +13,11 @@ class TagEnum(enum.Enum):
     COLOR_VERBOSE_NAME = 'HEX-code'
 
     SLUG_VERBOSE_NAME = 'tag Slug'
+
+    MISSING_TAGS_MESSAGE = 'Tags do not exist: {ids}.'
+
+    BITMASK_VERBOSE_NAME = 'Bit in the recipe tag mask'
+    BITMASK_FIELD = 'bitmask'
+    MAX_TAGS = 63
+    NO_FREE_BIT_MESSAGE = 'Recipe tag masks are limited to 63 tags.'
+    SERIALIZER_FIELDS = ('id', 'name', 'color', 'slug')
@@ -2,6 +2,9 @@ import enum
 
 class UserEnum(enum.Enum):
     SUBSCRIBE_M2M = 'subscribe'
+    SUBSCRIBED_IDS_CONTEXT_KEY = 'subscribed_ids'
+    AUTHOR_RECIPES_CONTEXT_KEY = 'author_recipes'
+    RECIPES_LIMIT_PARAM = 'recipes_limit'
 
     USER_VERBOSE_NAME = 'User'
     USER_VERBOSE_NAME_PLURAL = 'Users'
@@ -37,6 +40,30 @@ class UserEnum(enum.Enum):
     SUBSCRIBE_VERBOSE_NAME = 'Subscription'
     SUBSCRIBE_RELATED_NAME = 'subscribers'
     SUBSCRIBE_TO = 'self'
+    SUBSCRIBE_THROUGH = 'Subscription'
+    SUBSCRIBE_THROUGH_FIELDS = ('user', 'author')
+
+    SUBSCRIPTION_VERBOSE_NAME_PLURAL = 'Subscriptions'
+    SUBSCRIPTION_DB_TABLE = 'users_user_subscribe'
+    SUBSCRIPTION_USER_COLUMN = 'from_user_id'
+    SUBSCRIPTION_AUTHOR_COLUMN = 'to_user_id'
+    SUBSCRIPTION_USER_VERBOSE_NAME = 'Subscriber'
+    SUBSCRIPTION_AUTHOR_VERBOSE_NAME = 'Author'
+    SUBSCRIPTION_ENTRIES_RELATED_NAME = 'subscription_entries'
+    SUBSCRIBER_ENTRIES_RELATED_NAME = 'subscriber_entries'
+    SUBSCRIPTION_CREATED_AT_VERBOSE_NAME = 'Subscribed at'
+    SUBSCRIPTION_UNIQUE_FIELDS = ['user', 'author']
+    SUBSCRIPTION_UNIQUE_NAME = 'unique_subscription_user_author'
+    SUBSCRIPTION_AUTHOR_INDEX_FIELDS = ['author', 'user']
+    SUBSCRIPTION_AUTHOR_INDEX_NAME = 'subscription_author_user_idx'
+    SUBSCRIPTION_CREATED_INDEX_FIELDS = ['user', '-created_at']
+    SUBSCRIPTION_CREATED_INDEX_NAME = 'subscription_user_created_idx'
+    SUBSCRIPTIONS_ORDERING = '-subscriber_entries__created_at'
+
+    RECIPES_COUNT_VERBOSE_NAME = 'Number of recipes'
+    RECIPES_COUNT_FIELD = 'recipes_count'
+    FEED_MATERIALIZED_VERBOSE_NAME = 'Feed timeline is materialized'
+    FEED_MATERIALIZED_FIELD = 'feed_materialized'
 
     SUBSCRIBE_ERROR_ON_YOURSELF = {
         "errors": "Cannot delete or subscribe to oneself"
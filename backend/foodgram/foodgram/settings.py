@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     'recipes.apps.RecipesConfig',
     'users.apps.UsersConfig',
     'api.apps.ApiConfig',
+    'jobs.apps.JobsConfig',
     'django_extensions',
 ]
 
@@ -83,6 +84,17 @@ DATABASES = {
     }
 }
 
+# Without a configured cache host every process keeps a cache of its own, see api.W001.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', default=(
+            'django.core.cache.backends.memcached.MemcachedCache' if os.getenv('CACHE_LOCATION')
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        )),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -139,3 +151,11 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+THUMBNAIL_ROOT = os.path.join(BASE_DIR, 'thumbnails')
+THUMBNAIL_CACHE_MAX_BYTES = int(os.getenv('THUMBNAIL_CACHE_MAX_BYTES', default=256 * 1024 * 1024))
+
+FEED_MATERIALIZE_MIN_SUBSCRIPTIONS = int(os.getenv('FEED_MATERIALIZE_MIN_SUBSCRIPTIONS', default=1000))
+
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', default=48))
+TRENDING_DECAY_INTERVAL_HOURS = float(os.getenv('TRENDING_DECAY_INTERVAL_HOURS', default=1))
@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'finished_at',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    search_fields = (
+        'name',
+        'dedup_key',
+    )
+    readonly_fields = ('created_at', 'locked_at', 'finished_at', 'last_error')
+    empty_value_display = '--empty--'
+
+
+admin.site.register(Job, JobAdmin)
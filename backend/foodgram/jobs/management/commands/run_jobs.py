@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from enums.job_enum import JobEnum
+from jobs.queue import claim_jobs, execute_job, prune_jobs, schedule_periodic_jobs
+
+
+class Command(BaseCommand):
+    """
+    Run queued background jobs with a pool of threads or processes.
+    """
+    help = 'Run background jobs from the database queue until stopped, or once with --once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of jobs run concurrently.',
+        )
+        parser.add_argument(
+            '--pool',
+            choices=JobEnum.POOL_CHOICES.value,
+            default='thread',
+            help='Run jobs in threads, or in processes for CPU-heavy tasks.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=JobEnum.POLL_INTERVAL.value,
+            help='Seconds to wait for new jobs when the queue is empty.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit as soon as no job is due instead of polling.',
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        use_processes = options['pool'] == 'process'
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        running = set()
+        processed = 0
+        with executor_class(max_workers=workers) as executor:
+            while True:
+                jobs = claim_jobs(workers - len(running)) if len(running) < workers else []
+                if use_processes and jobs:
+                    # Forked workers must not share the connection of this process.
+                    connections.close_all()
+                running.update(executor.submit(execute_job, job.id) for job in jobs)
+                if running:
+                    done, running = wait(
+                        running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED,
+                    )
+                    processed += len(done)
+                    continue
+                if options['once']:
+                    break
+                schedule_periodic_jobs()
+                prune_jobs(JobEnum.DONE_RETENTION.value)
+                time.sleep(options['poll_interval'])
+        self.stdout.write(self.style.SUCCESS(f'{processed} jobs processed.'))
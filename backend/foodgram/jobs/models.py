@@ -0,0 +1,81 @@
+from django.db import models
+from django.utils import timezone
+
+from enums.job_enum import JobEnum
+
+
+class Job(models.Model):
+    """
+    A unit of background work stored in the database and run by `run_jobs`.
+    """
+    name = models.CharField(
+        max_length=JobEnum.NAME_MAX_LENGTH.value,
+        verbose_name=JobEnum.NAME_VERBOSE_NAME.value,
+    )
+    payload = models.TextField(
+        default='{}',
+        verbose_name=JobEnum.PAYLOAD_VERBOSE_NAME.value,
+    )
+    dedup_key = models.CharField(
+        max_length=JobEnum.DEDUP_KEY_MAX_LENGTH.value,
+        null=True,
+        blank=True,
+        verbose_name=JobEnum.DEDUP_KEY_VERBOSE_NAME.value,
+    )
+    status = models.CharField(
+        max_length=JobEnum.STATUS_MAX_LENGTH.value,
+        choices=JobEnum.STATUS_CHOICES.value,
+        default=JobEnum.PENDING.value,
+        verbose_name=JobEnum.STATUS_VERBOSE_NAME.value,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=JobEnum.ATTEMPTS_VERBOSE_NAME.value,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=JobEnum.DEFAULT_MAX_ATTEMPTS.value,
+        verbose_name=JobEnum.MAX_ATTEMPTS_VERBOSE_NAME.value,
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=JobEnum.RUN_AFTER_VERBOSE_NAME.value,
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=JobEnum.LOCKED_AT_VERBOSE_NAME.value,
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=JobEnum.LAST_ERROR_VERBOSE_NAME.value,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=JobEnum.CREATED_AT_VERBOSE_NAME.value,
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=JobEnum.FINISHED_AT_VERBOSE_NAME.value,
+    )
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
+
+    class Meta:
+        verbose_name = JobEnum.JOB_VERBOSE_NAME.value
+        verbose_name_plural = JobEnum.JOB_VERBOSE_NAME_PLURAL.value
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(
+                fields=JobEnum.QUEUE_INDEX_FIELDS.value,
+                name=JobEnum.QUEUE_INDEX_NAME.value,
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(status=JobEnum.PENDING.value),
+                name=JobEnum.DEDUP_CONSTRAINT_NAME.value,
+            ),
+        ]
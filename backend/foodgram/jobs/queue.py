@@ -0,0 +1,171 @@
+import json
+import logging
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from enums.job_enum import JobEnum
+from jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS: Dict[str, Callable] = {}
+PERIODIC_TASKS: Dict[str, float] = {}
+
+
+def task(name: str, max_attempts: int = JobEnum.DEFAULT_MAX_ATTEMPTS.value, every: float = None):
+    """Register a function as a background task under `name`.
+
+    Tasks receive the keyword arguments given to `enqueue`, which must be
+    JSON serializable, and run inside a transaction of their own. Tasks given
+    `every` seconds are also queued by `run_jobs` that often, without arguments.
+    """
+    def decorator(func: Callable) -> Callable:
+        func.task_name = name
+        func.max_attempts = max_attempts
+        TASKS[name] = func
+        if every is not None:
+            PERIODIC_TASKS[name] = every
+        return func
+    return decorator
+
+
+def create_job(task_name: str, dedup_key: str = None, run_after: datetime = None, **kwargs) -> Optional[Job]:
+    """Insert a job right away, due at `run_after` or now.
+
+    Returns None if a pending job with the same `dedup_key` already exists.
+    """
+    func = TASKS.get(task_name)
+    max_attempts = getattr(func, 'max_attempts', JobEnum.DEFAULT_MAX_ATTEMPTS.value)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=task_name,
+                payload=json.dumps(kwargs),
+                dedup_key=dedup_key,
+                max_attempts=max_attempts,
+                run_after=run_after or timezone.now(),
+            )
+    except IntegrityError:
+        return None
+
+
+def schedule_periodic_jobs() -> int:
+    """Queue the next run of every periodic task that has no pending job.
+
+    The task name is the dedup key, so workers scheduling at the same time
+    queue a single job, due `every` seconds after it was queued.
+
+    Returns:
+        int: The number of queued jobs.
+    """
+    if not PERIODIC_TASKS:
+        return 0
+    pending = set(
+        Job.objects.filter(status=JobEnum.PENDING.value, dedup_key__in=PERIODIC_TASKS)
+        .values_list('dedup_key', flat=True)
+    )
+    now = timezone.now()
+    return sum(
+        create_job(name, dedup_key=name, run_after=now + timedelta(seconds=every)) is not None
+        for name, every in PERIODIC_TASKS.items() if name not in pending
+    )
+
+
+def enqueue(task_name: str, dedup_key: str = None, **kwargs):
+    """Schedule a task once the current transaction commits.
+
+    Nothing is queued if the transaction rolls back, and the worker never
+    sees a job before the rows it refers to are visible.
+    """
+    transaction.on_commit(lambda: create_job(task_name, dedup_key, **kwargs))
+
+
+def claim_jobs(limit: int) -> List[Job]:
+    """Mark up to `limit` due jobs as running and return them.
+
+    Each job is claimed with a conditional UPDATE on its current state, so
+    concurrent workers never claim the same job. Jobs left running by a
+    crashed worker are claimed again after STALE_AFTER seconds.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=JobEnum.STALE_AFTER.value)
+    candidates = Job.objects.filter(
+        Q(status=JobEnum.PENDING.value, run_after__lte=now) |
+        Q(status=JobEnum.RUNNING.value, locked_at__lt=stale)
+    ).only('id', 'status', 'locked_at')[:limit]
+    claimed = []
+    for job in candidates:
+        updated = Job.objects.filter(
+            id=job.id, status=job.status, locked_at=job.locked_at,
+        ).update(status=JobEnum.RUNNING.value, locked_at=now)
+        if updated:
+            claimed.append(job.id)
+    return list(Job.objects.filter(id__in=claimed))
+
+
+def finish_job(job: Job, error: str = None):
+    """Store the outcome of a run, scheduling a retry with backoff on errors."""
+    now = timezone.now()
+    attempts = job.attempts + 1
+    if error is None:
+        Job.objects.filter(id=job.id).update(
+            status=JobEnum.DONE.value, attempts=attempts,
+            locked_at=None, finished_at=now, last_error='',
+        )
+        return
+    if attempts >= job.max_attempts:
+        status = JobEnum.FAILED.value
+    else:
+        status = JobEnum.PENDING.value
+    delay = JobEnum.RETRY_BASE_DELAY.value * 2 ** (attempts - 1)
+    try:
+        with transaction.atomic():
+            Job.objects.filter(id=job.id).update(
+                status=status, attempts=attempts, locked_at=None,
+                run_after=now + timedelta(seconds=delay), last_error=error,
+                finished_at=now if status == JobEnum.FAILED.value else None,
+            )
+    except IntegrityError:
+        # A job with the same dedup key was queued meanwhile and does the retry.
+        Job.objects.filter(id=job.id).update(
+            status=JobEnum.FAILED.value, attempts=attempts, locked_at=None,
+            finished_at=now, last_error=error,
+        )
+
+
+def run_job(job: Job) -> bool:
+    """Run a claimed job and record the result. Returns True on success."""
+    func = TASKS.get(job.name)
+    try:
+        if func is None:
+            raise LookupError(JobEnum.UNKNOWN_TASK_MESSAGE.value.format(name=job.name))
+        with transaction.atomic():
+            func(**json.loads(job.payload))
+    except Exception:
+        logger.exception('Job %s (%s) failed', job.id, job.name)
+        finish_job(job, traceback.format_exc())
+        return False
+    finish_job(job)
+    return True
+
+
+def execute_job(job_id: int) -> bool:
+    """Pool entry point: run one claimed job in the current thread or process."""
+    try:
+        return run_job(Job.objects.get(id=job_id))
+    finally:
+        connection.close()
+
+
+def prune_jobs(older_than: int) -> int:
+    """Delete jobs finished successfully more than `older_than` seconds ago."""
+    deleted, _ = Job.objects.filter(
+        status=JobEnum.DONE.value,
+        finished_at__lt=timezone.now() - timedelta(seconds=older_than),
+    ).delete()
+    return deleted
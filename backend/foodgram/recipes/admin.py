@@ -1,6 +1,8 @@
 from django.contrib import admin
 
 from recipes.models import Ingredient, Recipe, Tag
+from recipes.recipe_index import recipe_index
+from recipes.shopping_lists import get_cart_user_ids, rebuild_shopping_lists
 
 
 class RecipeIngredientInline(admin.TabularInline):
@@ -17,7 +19,7 @@ class RecipeAdmin(admin.ModelAdmin):
         'cooking_time',
     )
     fields = ('name', 'text', 'cooking_time', 'tags',
-              'image', 'author', 'favorites_count')
+              'image', 'author', 'favorites_count', 'popularity', 'trending_score')
     list_editable = (
         'name',
         'text',
@@ -27,16 +29,14 @@ class RecipeAdmin(admin.ModelAdmin):
         'name',
     )
     list_filter = ('name', 'author', 'tags')
-    readonly_fields = ('favorites_count',)
+    readonly_fields = ('favorites_count', 'popularity', 'trending_score')
 
-    def favorites_count(self, obj):
-        result = 0
-        recipes = Recipe.objects.all()
-        for i in range(len(recipes)):
-            result += recipes[i].favorite.count()
-        return result
-
-    favorites_count.short_description = 'Total products in card'
+    def save_related(self, request, form, formsets, change):
+        """Rebuild the shopping lists and index row of a recipe after inline ingredient edits."""
+        super().save_related(request, form, formsets, change)
+        if change:
+            rebuild_shopping_lists(get_cart_user_ids(form.instance))
+            recipe_index.mark_changed([form.instance.id])
 
 
 class TagAdmin(admin.ModelAdmin):
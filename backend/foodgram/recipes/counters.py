@@ -0,0 +1,105 @@
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+
+from enums.recipe_enum import RecipeEnum
+from enums.tag_enum import TagEnum
+from enums.user_enum import UserEnum
+from recipes.models import Favorite, Recipe, ShoppingCartItem, Tag
+from recipes.scores import get_popularity_expression
+from users.models import User
+
+
+def change_counter(model, field: str, ids: Iterable[int], delta: int):
+    """Atomically add `delta` to the counter column of the given rows.
+
+    The update runs as a single `UPDATE ... SET field = field + delta`, so
+    concurrent requests never overwrite each other's changes.
+    """
+    ids = list(ids)
+    if not ids or not delta:
+        return
+    model.objects.filter(id__in=ids).update(
+        **{field: Greatest(F(field) + delta, 0)}
+    )
+
+
+def _count_subquery(queryset, field: str):
+    """Build a correlated COUNT subquery grouped by `field`."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(total=Count('pk'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def _sum_subquery(queryset, field: str, value: str):
+    """Build a correlated SUM subquery of `value` grouped by `field`."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(total=Sum(value))
+            .values('total'),
+            output_field=BigIntegerField(),
+        ),
+        0,
+    )
+
+
+def get_counter_expressions() -> Dict[type, Dict[str, Subquery]]:
+    """Return the expressions computing every denormalized counter, score and mask from scratch."""
+    favorites_count = _count_subquery(Favorite.objects.all(), 'recipe_id')
+    cart_count = _count_subquery(ShoppingCartItem.objects.all(), 'recipe_id')
+    return {
+        Recipe: {
+            RecipeEnum.FAVORITES_COUNT_FIELD.value: favorites_count,
+            RecipeEnum.CART_COUNT_FIELD.value: cart_count,
+            RecipeEnum.POPULARITY_FIELD.value: get_popularity_expression(
+                favorites_count, cart_count),
+            # Every tag holds a distinct bit, so the sum of the bits is their OR.
+            RecipeEnum.TAGS_MASK_FIELD.value: _sum_subquery(
+                Recipe.tags.through.objects.all(), 'recipe_id', 'tag__bitmask'),
+        },
+        User: {
+            UserEnum.RECIPES_COUNT_FIELD.value: _count_subquery(
+                Recipe.objects.all(), 'author_id'),
+        },
+    }
+
+
+def find_counter_mismatches() -> Dict[str, int]:
+    """Count the rows whose stored counters differ from the real numbers."""
+    mismatches = {}
+    for model, expressions in get_counter_expressions().items():
+        for field, expression in expressions.items():
+            actual = f'actual_{field}'
+            mismatches[f'{model._meta.label}.{field}'] = (
+                model.objects.annotate(**{actual: expression})
+                .exclude(**{field: F(actual)})
+                .count()
+            )
+    return mismatches
+
+
+@transaction.atomic
+def rebuild_counters() -> Dict[str, int]:
+    """Recompute every denormalized counter with one bulk UPDATE per model.
+
+    Tags created before the tag masks existed get their bit first.
+    """
+    for tag in Tag.objects.filter(bitmask=None):
+        tag.save(update_fields=[TagEnum.BITMASK_FIELD.value])
+    updated = {}
+    for model, expressions in get_counter_expressions().items():
+        updated[model._meta.label] = model.objects.update(**expressions)
+    return updated
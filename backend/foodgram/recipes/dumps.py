@@ -0,0 +1,155 @@
+import datetime
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from django.apps import apps
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from enums.dump_enum import DumpEnum
+from recipes.loaders import chunked, get_batch_size, refresh_derived_data, reset_sequences, save_objects
+
+
+class NDJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping the microseconds DjangoJSONEncoder rounds off."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_path(directory: str, model) -> str:
+    """Return the NDJSON file of a model in a dump directory."""
+    return os.path.join(directory, f'{model._meta.label_lower}{DumpEnum.FILE_EXTENSION.value}')
+
+
+def get_levels() -> List[List]:
+    """Return the dumped models grouped by dependency level."""
+    return [[apps.get_model(label) for label in level] for level in DumpEnum.MODEL_LEVELS.value]
+
+
+def run_in_parallel(func: Callable, items: Sequence, workers: int) -> list:
+    """Call `func` for every item, in up to `workers` threads with database connections of their own.
+
+    SQLite has a single writer, so its work always runs in the calling thread.
+    """
+    if workers <= 1 or connection.vendor != 'postgresql':
+        return [func(item) for item in items]
+
+    def run(item):
+        try:
+            return func(item)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, items))
+
+
+def use_snapshot(snapshot: Optional[str]):
+    """Make the current transaction read the exported PostgreSQL snapshot."""
+    if snapshot is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        cursor.execute('SET TRANSACTION SNAPSHOT %s', [snapshot])
+
+
+def export_model(model, directory: str, chunk_size: int, snapshot: Optional[str] = None) -> int:
+    """Write every row of a model to its NDJSON file, one fixture object per line.
+
+    Rows are read through a server-side cursor in chunks of `chunk_size`, so the
+    memory used does not depend on the size of the table.
+    """
+    fields = [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and field.name not in DumpEnum.EXCLUDED_FIELDS.value
+    ]
+    exported = 0
+    with transaction.atomic(), open(get_path(directory, model), 'w', encoding='utf-8') as file:
+        use_snapshot(snapshot)
+        rows = model._base_manager.order_by('pk').iterator(chunk_size=chunk_size)
+        for chunk in chunked(rows, chunk_size):
+            for obj in serializers.serialize('python', chunk, fields=fields):
+                file.write(json.dumps(obj, cls=NDJSONEncoder, ensure_ascii=False))
+                file.write('\n')
+            exported += len(chunk)
+    return exported
+
+
+def export_data(directory: str, workers: int = DumpEnum.DEFAULT_WORKERS.value,
+                chunk_size: int = DumpEnum.CHUNK_SIZE.value) -> Dict[str, int]:
+    """Dump the dataset into one NDJSON file per model, all models at once.
+
+    On PostgreSQL every worker reads the same exported snapshot, so the files are
+    consistent with each other like those of a parallel pg_dump.
+
+    Returns:
+        dict: The number of exported rows per model label.
+    """
+    os.makedirs(directory, exist_ok=True)
+    models = [model for level in get_levels() for model in level]
+    with transaction.atomic():
+        snapshot = None
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+                if workers > 1:
+                    cursor.execute('SELECT pg_export_snapshot()')
+                    snapshot = cursor.fetchone()[0]
+        counts = run_in_parallel(
+            lambda model: export_model(model, directory, chunk_size, snapshot), models, workers,
+        )
+    return {model._meta.label: count for model, count in zip(models, counts)}
+
+
+def iter_lines(path: str):
+    """Stream the objects of an NDJSON file."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def import_model(model, directory: str, batch_size: int) -> Optional[int]:
+    """Upsert the rows of a model from its NDJSON file in batches, None if there is no file."""
+    path = get_path(directory, model)
+    if not os.path.exists(path):
+        return None
+    imported = 0
+    batch_size = get_batch_size(model, batch_size)
+    with transaction.atomic():
+        for batch in chunked(iter_lines(path), batch_size):
+            save_objects(
+                model,
+                list(serializers.deserialize('python', batch, ignorenonexistent=True)),
+                batch_size,
+            )
+            imported += len(batch)
+        reset_sequences([model])
+    return imported
+
+
+def import_data(directory: str, workers: int = DumpEnum.DEFAULT_WORKERS.value,
+                batch_size: int = DumpEnum.CHUNK_SIZE.value) -> Dict[str, Optional[int]]:
+    """Restore a dump made by `export_data`, the models of one dependency level at once.
+
+    Every model is committed on its own, and the next level starts once the
+    previous one is committed. Signals are not sent, so the counters, shopping
+    lists, search index and feeds are rebuilt at the end.
+
+    Returns:
+        dict: The number of imported rows per model label, None for missing files.
+    """
+    imported = {}
+    for level in get_levels():
+        counts = run_in_parallel(
+            lambda model: import_model(model, directory, batch_size), level, workers,
+        )
+        imported.update({model._meta.label: count for model, count in zip(level, counts)})
+    refresh_derived_data()
+    return imported
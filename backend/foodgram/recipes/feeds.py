@@ -0,0 +1,126 @@
+from typing import Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from enums.feed_enum import FeedEnum
+from enums.user_enum import UserEnum
+from recipes.models import FeedEntry, Recipe
+from users.models import Subscription, User
+
+
+def get_materialized_user_ids(user_ids: Iterable[int]) -> list:
+    """Return the ids of the given users whose feed is materialized."""
+    return list(
+        User.objects.filter(id__in=list(user_ids), feed_materialized=True)
+        .values_list('id', flat=True)
+    )
+
+
+def add_to_feeds(user_ids: Iterable[int], recipes: Iterable[Tuple[int, object]]):
+    """Insert `(recipe_id, pub_date)` pairs into the feeds of the given users."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(user_id=user_id, recipe_id=recipe_id, pub_date=pub_date)
+            for recipe_id, pub_date in recipes
+            for user_id in user_ids
+        ),
+        batch_size=FeedEnum.BATCH_SIZE.value,
+        ignore_conflicts=True,
+    )
+
+
+def fan_out_recipe(recipe: Recipe):
+    """Push a recipe into the materialized feeds of its author's subscribers."""
+    FeedEntry.objects.filter(recipe_id=recipe.id).delete()
+    add_to_feeds(
+        get_materialized_user_ids(
+            Subscription.objects.filter(author_id=recipe.author_id)
+            .values_list('user_id', flat=True)
+        ),
+        [(recipe.id, recipe.pub_date)],
+    )
+
+
+def change_feeds(user_ids: Iterable[int], author_ids: Iterable[int], add: bool):
+    """Add or remove the recipes of the given authors in the materialized feeds of the users."""
+    user_ids = get_materialized_user_ids(user_ids)
+    author_ids = list(author_ids)
+    if not user_ids or not author_ids:
+        return
+    if not add:
+        FeedEntry.objects.filter(
+            user_id__in=user_ids, recipe__author_id__in=author_ids,
+        ).delete()
+        return
+    add_to_feeds(
+        user_ids,
+        Recipe.objects.filter(author_id__in=author_ids)
+        .values_list('id', 'pub_date').order_by(),
+    )
+
+
+@transaction.atomic
+def materialize_feeds(user_ids: Iterable[int]) -> int:
+    """Build the feeds of the given users from their subscriptions and mark them materialized."""
+    user_ids = list(user_ids)
+    FeedEntry.objects.filter(user_id__in=user_ids).delete()
+    User.objects.filter(id__in=user_ids).update(
+        **{UserEnum.FEED_MATERIALIZED_FIELD.value: True}
+    )
+    rows = (
+        Recipe.objects.filter(author__subscriber_entries__user_id__in=user_ids)
+        .values_list('author__subscriber_entries__user_id', 'id', 'pub_date')
+        .order_by()
+        .iterator(chunk_size=FeedEnum.BATCH_SIZE.value)
+    )
+    created = 0
+    batch = []
+    for user_id, recipe_id, pub_date in rows:
+        batch.append(FeedEntry(user_id=user_id, recipe_id=recipe_id, pub_date=pub_date))
+        if len(batch) == FeedEnum.BATCH_SIZE.value:
+            created += len(FeedEntry.objects.bulk_create(batch))
+            batch = []
+    created += len(FeedEntry.objects.bulk_create(batch))
+    return created
+
+
+@transaction.atomic
+def drop_feeds(user_ids: Iterable[int]) -> int:
+    """Delete the materialized feeds of the given users, who go back to reading on the fly."""
+    user_ids = list(user_ids)
+    User.objects.filter(id__in=user_ids).update(
+        **{UserEnum.FEED_MATERIALIZED_FIELD.value: False}
+    )
+    deleted, _ = FeedEntry.objects.filter(user_id__in=user_ids).delete()
+    return deleted
+
+
+def sync_materialized_feeds(min_subscriptions: int = None) -> Tuple[int, int]:
+    """Materialize the feeds of heavy followers and drop the rest.
+
+    A user is a heavy follower with at least `min_subscriptions` subscriptions,
+    FEED_MATERIALIZE_MIN_SUBSCRIPTIONS by default, and 0 turns the timelines off.
+
+    Returns:
+        tuple: The number of materialized and dropped feeds.
+    """
+    if min_subscriptions is None:
+        min_subscriptions = settings.FEED_MATERIALIZE_MIN_SUBSCRIPTIONS
+    heavy = set()
+    if min_subscriptions > 0:
+        heavy = set(
+            Subscription.objects.values('user_id').order_by()
+            .annotate(total=Count('id')).filter(total__gte=min_subscriptions)
+            .values_list('user_id', flat=True)
+        )
+    materialized = set(
+        User.objects.filter(feed_materialized=True).values_list('id', flat=True)
+    )
+    materialize_feeds(heavy - materialized)
+    drop_feeds(materialized - heavy)
+    return len(heavy - materialized), len(materialized - heavy)
@@ -0,0 +1,98 @@
+import hashlib
+import io
+import os
+from typing import Tuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+from enums.recipe_enum import RecipeEnum
+from jobs.queue import enqueue
+from recipes.models import Recipe
+
+IMAGE_FORMAT = (
+    RecipeEnum.IMAGE_FORMAT.value if features.check('webp')
+    else RecipeEnum.IMAGE_FALLBACK_FORMAT.value
+)
+IMAGE_EXTENSION = IMAGE_FORMAT.lower().replace('jpeg', 'jpg')
+
+
+def get_image_name(content: bytes) -> str:
+    """Name an image after the SHA-256 of the uploaded bytes."""
+    return f'{hashlib.sha256(content).hexdigest()}.{IMAGE_EXTENSION}'
+
+
+def get_optimized_name(upload_name: str) -> str:
+    """Return the name the optimized copy of a staged upload is stored under."""
+    digest = os.path.splitext(os.path.basename(upload_name))[0]
+    return f'{digest}.{IMAGE_EXTENSION}'
+
+
+def optimize_image(content: bytes) -> bytes:
+    """Downscale an image to IMAGE_MAX_SIZE and re-encode it.
+
+    JPEG sources are decoded at a reduced scale when possible, EXIF rotation is
+    applied and the result is encoded as WebP (JPEG if Pillow lacks WebP).
+
+    Raises:
+        ValueError: If the bytes are not a readable image.
+    """
+    max_size = RecipeEnum.IMAGE_MAX_SIZE.value
+    try:
+        image = Image.open(io.BytesIO(content))
+        image.draft('RGB', max_size)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(max_size, Image.LANCZOS)
+    except (OSError, Image.DecompressionBombError) as error:
+        raise ValueError(RecipeEnum.IMAGE_INVALID_MESSAGE.value) from error
+    has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+    if IMAGE_FORMAT == 'WEBP' and has_alpha:
+        image = image.convert('RGBA')
+    else:
+        image = image.convert('RGB')
+    output = io.BytesIO()
+    image.save(output, IMAGE_FORMAT, quality=RecipeEnum.IMAGE_QUALITY.value, method=4)
+    return output.getvalue()
+
+
+def store_image(content: bytes) -> str:
+    """Optimize and store an uploaded image, returning its storage name.
+
+    Identical uploads map to the same name, so they are processed and stored
+    only once and share one file.
+    """
+    name = get_image_name(content)
+    if default_storage.exists(name):
+        return name
+    return default_storage.save(name, ContentFile(optimize_image(content)))
+
+
+def stage_image(content: bytes, extension: str) -> Tuple[str, bool]:
+    """Store an upload as is and schedule its optimization once the transaction commits.
+
+    The request does not wait for the re-encoding: the recipe points at the
+    original upload until the worker replaces it with the optimized copy.
+    Content that was optimized or staged before is reused at once.
+
+    Returns:
+        tuple: The storage name of the image and whether this call stored the file.
+    """
+    name = get_image_name(content)
+    if default_storage.exists(name):
+        return name, False
+    digest = os.path.splitext(name)[0]
+    upload_name = f'{RecipeEnum.IMAGE_UPLOAD_DIR.value}/{digest}.{extension}'
+    stored = not default_storage.exists(upload_name)
+    if stored:
+        upload_name = default_storage.save(upload_name, ContentFile(content))
+    enqueue(RecipeEnum.OPTIMIZE_IMAGE_TASK.value, dedup_key=upload_name, name=upload_name)
+    return upload_name, stored
+
+
+def delete_unreferenced_upload(name: str) -> bool:
+    """Delete a staged upload unless a recipe still points at it. Returns True if it was deleted."""
+    if Recipe.objects.filter(image=name).exists():
+        return False
+    default_storage.delete(name)
+    return True
@@ -0,0 +1,112 @@
+import bisect
+import threading
+from typing import List, Tuple
+
+from django.core.cache import cache
+
+from enums.ingredient_enum import IngredientEnum
+from recipes.models import Ingredient
+
+PREFIX_END = chr(0x10FFFF)
+
+
+def normalize(value: str) -> str:
+    """Case-fold a name and treat 'ё' as 'е', as users type it both ways."""
+    return value.casefold().replace('ё', 'е').strip()
+
+
+class IngredientPrefixIndex:
+    """
+    Per-process prefix index over ingredient names for autocomplete.
+
+    Names are case-folded and kept in sorted arrays, so a lookup is a couple
+    of binary searches instead of an `ILIKE 'x%'` scan. Matches are ranked as
+    exact name, then name prefix, then prefix of any later word in the name.
+    The index rebuilds itself lazily when the shared version in the cache
+    changes, which happens whenever an Ingredient row is saved or deleted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        # Sorted names and their ids, sorted later words and their ids, ingredients by id.
+        # Published as one tuple so readers never pair arrays of different builds.
+        self._data: Tuple[List[str], List[int], List[str], List[int], dict] = ([], [], [], [], {})
+
+    @staticmethod
+    def get_version() -> int:
+        """Return the shared version of the ingredient catalogue."""
+        key = IngredientEnum.SEARCH_INDEX_VERSION_KEY.value
+        cache.add(key, 1, timeout=None)
+        return cache.get(key, 1)
+
+    @staticmethod
+    def invalidate():
+        """Mark every process' index as stale."""
+        key = IngredientEnum.SEARCH_INDEX_VERSION_KEY.value
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 2, timeout=None)
+
+    def build(self, version: int):
+        """Load the catalogue and swap in freshly built sorted arrays."""
+        ingredients = {
+            ingredient.id: ingredient for ingredient in Ingredient.objects.all()
+        }
+        names: List[Tuple[str, int]] = []
+        words: List[Tuple[str, int]] = []
+        for ingredient in ingredients.values():
+            name = normalize(ingredient.name)
+            names.append((name, ingredient.id))
+            words.extend((word, ingredient.id) for word in name.split()[1:])
+        names.sort()
+        words.sort()
+        self._data = (
+            [name for name, _ in names],
+            [pk for _, pk in names],
+            [word for word, _ in words],
+            [pk for _, pk in words],
+            ingredients,
+        )
+        self._version = version
+
+    def ensure_fresh(self):
+        """Rebuild the index if the catalogue changed since the last build."""
+        version = self.get_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self.build(version)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> range:
+        return range(
+            bisect.bisect_left(keys, prefix),
+            bisect.bisect_left(keys, prefix + PREFIX_END),
+        )
+
+    def search(self, query: str, limit: int = IngredientEnum.SEARCH_RESULTS_LIMIT.value) -> List[Ingredient]:
+        """
+        Return at most `limit` ingredients matching the query, best matches first.
+        """
+        self.ensure_fresh()
+        query = normalize(query)
+        if not query:
+            return []
+        names, name_ids, words, word_ids, ingredients = self._data
+        name_range = self._prefix_range(names, query)
+        exact = [name_ids[i] for i in name_range if names[i] == query]
+        prefix = [name_ids[i] for i in name_range if names[i] != query]
+        word_prefix = [word_ids[i] for i in self._prefix_range(words, query)]
+        found, seen = [], set()
+        for pk in (*exact, *prefix, *word_prefix):
+            if pk not in seen:
+                seen.add(pk)
+                found.append(ingredients[pk])
+                if len(found) >= limit:
+                    break
+        return found
+
+
+ingredient_index = IngredientPrefixIndex()
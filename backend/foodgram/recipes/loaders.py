@@ -0,0 +1,281 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializedObject
+from django.db import connection, transaction
+
+from enums.data_source_enum import DataSourceEnum
+from recipes.counters import rebuild_counters
+from recipes.feeds import materialize_feeds, sync_materialized_feeds
+from recipes.ingredient_index import ingredient_index
+from recipes.models import DataSource, Ingredient
+from recipes.recipe_index import recipe_index
+from recipes.search import rebuild_search_index
+from recipes.shopping_lists import rebuild_shopping_lists
+from users.models import User
+
+SEPARATORS = re.compile(r'[\s,]*')
+
+
+def get_checksum(path: str) -> str:
+    """Return the SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(DataSourceEnum.READ_CHUNK_SIZE.value), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_json_array(file: TextIO, name: str) -> Iterator:
+    """Yield the items of a top-level JSON array without reading the whole file.
+
+    Raises:
+        ValueError: If the file is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    chunk_size = DataSourceEnum.READ_CHUNK_SIZE.value
+    buffer = ''
+    for chunk in iter(lambda: file.read(chunk_size), ''):
+        buffer = (buffer + chunk).lstrip()
+        if buffer:
+            break
+    if not buffer.startswith('['):
+        raise ValueError(DataSourceEnum.NOT_AN_ARRAY_MESSAGE.value.format(name=name))
+    position, eof = 1, False
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        if buffer.startswith(']', position):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # An item may continue in the next chunk, so only a complete one is yielded.
+        if end is None or (end == len(buffer) and not eof):
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield item
+        position = end
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Stream the rows of a CSV file with a header, or the objects of a JSON array."""
+    with open(path, encoding='utf-8', newline='') as file:
+        if path.lower().endswith(DataSourceEnum.CSV_EXTENSION.value):
+            yield from csv.DictReader(file)
+        else:
+            yield from iter_json_array(file, path)
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_batch_size(model, batch_size: int) -> int:
+    """Cap a batch size to the rows of `model` the database accepts in one query.
+
+    SQLite limits the number of query parameters and of compound SELECT terms,
+    which Django's explicit batch sizes do not account for.
+    """
+    fields = model._meta.concrete_fields
+    return max(1, min(batch_size, connection.ops.bulk_batch_size(fields, [None] * batch_size)))
+
+
+def load_ingredients(records: Iterable[dict], source: str,
+                     batch_size: int = DataSourceEnum.BATCH_SIZE.value) -> int:
+    """Upsert ingredients by `(name, measurement_unit)`.
+
+    Missing pairs are inserted and the count of existing ones is updated. Each
+    batch costs one lookup of the names it holds, one bulk INSERT and one bulk UPDATE.
+
+    Returns:
+        int: The number of created or updated ingredients.
+
+    Raises:
+        ValueError: If a row lacks a name or a measurement unit.
+    """
+    batch_size = get_batch_size(Ingredient, batch_size)
+    changed = 0
+    for batch_number, batch in enumerate(chunked(records, batch_size)):
+        rows = {}
+        for offset, record in enumerate(batch):
+            for field in DataSourceEnum.INGREDIENT_FIELDS.value:
+                if not record.get(field):
+                    raise ValueError(DataSourceEnum.MISSING_FIELD_MESSAGE.value.format(
+                        name=source, row=batch_number * batch_size + offset + 1, field=field,
+                    ))
+            key = (record['name'].strip(), record['measurement_unit'].strip())
+            rows.setdefault(key, int(record.get('count') or 0))
+        existing = {
+            (ingredient.name, ingredient.measurement_unit): ingredient
+            for ingredient in Ingredient.objects.filter(name__in={name for name, _ in rows})
+            .only('id', 'name', 'measurement_unit', 'count')
+        }
+        updated = []
+        for key, ingredient in existing.items():
+            if key in rows and ingredient.count != rows[key]:
+                ingredient.count = rows[key]
+                updated.append(ingredient)
+        Ingredient.objects.bulk_update(updated, ['count'], batch_size=batch_size)
+        changed += len(updated) + len(Ingredient.objects.bulk_create(
+            [
+                Ingredient(name=name, measurement_unit=unit, count=count)
+                for (name, unit), count in rows.items() if (name, unit) not in existing
+            ],
+            batch_size=batch_size,
+        ))
+    return changed
+
+
+def save_objects(model, batch: List[DeserializedObject], batch_size: int):
+    """Insert or update deserialized objects of one model by primary key, with their m2m rows.
+
+    Objects without a primary key are saved one by one, like `loaddata` does.
+    """
+    manager = model._base_manager
+    objects = [item.object for item in batch if item.object.pk is not None]
+    for item in batch:
+        if item.object.pk is None:
+            item.save()
+    existing = set(
+        manager.filter(pk__in=[obj.pk for obj in objects]).values_list('pk', flat=True)
+    )
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    created = [obj for obj in objects if obj.pk not in existing]
+    updated = [obj for obj in objects if obj.pk in existing]
+    if created:
+        # bulk_create stamps auto_now(_add) fields, the fixture values are put back after it.
+        stamped = [field for field in fields
+                   if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+        values = [[getattr(obj, field.attname) for field in stamped] for obj in created]
+        manager.bulk_create(created, batch_size=batch_size)
+        if stamped:
+            for obj, row in zip(created, values):
+                for field, value in zip(stamped, row):
+                    if value is not None:
+                        setattr(obj, field.attname, value)
+            manager.bulk_update(created, [field.name for field in stamped], batch_size=batch_size)
+    if updated and fields:
+        manager.bulk_update(updated, [field.name for field in fields], batch_size=batch_size)
+    m2m = {}
+    for item in batch:
+        for field_name, values in (item.m2m_data or {}).items():
+            m2m.setdefault(field_name, []).append((item.object.pk, values))
+    for field_name, rows in m2m.items():
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        through._base_manager.filter(
+            **{f'{source}__in': [pk for pk, _ in rows]}
+        ).delete()
+        through._base_manager.bulk_create(
+            [
+                through(**{f'{source}_id': pk, f'{target}_id': value})
+                for pk, values in rows for value in values
+            ],
+            batch_size=get_batch_size(through, batch_size),
+            ignore_conflicts=True,
+        )
+
+
+def load_fixture(records: Iterable[dict], batch_size: int = DataSourceEnum.BATCH_SIZE.value) -> int:
+    """Upsert the objects of a Django fixture in batches of consecutive objects of one model.
+
+    Content types, permissions, admin log entries and sessions are skipped: migrate
+    creates the first two with ids of its own, and the others are not seed data.
+    Signals are not sent, so `refresh_derived_data` has to run once the load is done.
+
+    Returns:
+        int: The number of loaded objects.
+    """
+    loaded = 0
+    models = set()
+    for label, group in itertools.groupby(records, key=lambda record: record['model']):
+        if label.lower() in DataSourceEnum.SKIPPED_MODELS.value:
+            continue
+        model = apps.get_model(label)
+        models.add(model)
+        model_batch_size = get_batch_size(model, batch_size)
+        for batch in chunked(group, model_batch_size):
+            save_objects(
+                model,
+                list(serializers.deserialize('python', batch, ignorenonexistent=True)),
+                model_batch_size,
+            )
+            loaded += len(batch)
+    reset_sequences(models)
+    return loaded
+
+
+def reset_sequences(models: Iterable):
+    """Move the primary key sequences past the explicitly inserted ids."""
+    statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+@transaction.atomic
+def refresh_derived_data():
+    """Recompute everything the model signals keep up to date, after a load without them."""
+    rebuild_counters()
+    rebuild_shopping_lists()
+    rebuild_search_index()
+    materialize_feeds(User.objects.filter(feed_materialized=True).values_list('id', flat=True))
+    sync_materialized_feeds()
+    transaction.on_commit(recipe_index.invalidate)
+    transaction.on_commit(ingredient_index.invalidate)
+
+
+def get_source_name(path: str) -> str:
+    """Return the name a source file is recorded under."""
+    return os.path.abspath(path)
+
+
+@transaction.atomic
+def load_source(path: str, force: bool = False,
+                batch_size: int = DataSourceEnum.BATCH_SIZE.value) -> Optional[Dict[str, object]]:
+    """Load a fixture or an ingredient catalogue unless its checksum is already recorded.
+
+    JSON arrays of `{"model", "pk", "fields"}` objects are Django fixtures, other
+    JSON arrays and CSV files are ingredient rows. The checksum is recorded in the
+    caller's transaction: after a fixture, `refresh_derived_data` has to run in
+    that same transaction, so a failed refresh leaves the fixture to load again.
+
+    Returns:
+        dict or None: The kind of the source and the number of loaded rows,
+        None if the source was skipped.
+    """
+    name = get_source_name(path)
+    checksum = get_checksum(path)
+    if not force and DataSource.objects.filter(name=name, checksum=checksum).exists():
+        return None
+    records = iter_records(path)
+    first = next(records, None)
+    records = itertools.chain([first] if first is not None else [], records)
+    if isinstance(first, dict) and DataSourceEnum.FIXTURE_KEYS.value <= first.keys():
+        kind, rows = 'fixture', load_fixture(records, batch_size)
+    else:
+        kind, rows = 'ingredients', load_ingredients(records, path, batch_size)
+        transaction.on_commit(ingredient_index.invalidate)
+    DataSource.objects.update_or_create(name=name, defaults={'checksum': checksum, 'rows': rows})
+    return {'kind': kind, 'rows': rows}
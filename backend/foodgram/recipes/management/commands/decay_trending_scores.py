@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from enums.recipe_enum import RecipeEnum
+from jobs.queue import create_job
+from recipes.scores import decay_trending_scores
+
+
+class Command(BaseCommand):
+    """
+    Decay the trending scores of recipes.
+    """
+    help = ('Shrink every trending score by the time passed since the previous pass. '
+            'run_jobs already queues it every TRENDING_DECAY_INTERVAL_HOURS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=float,
+            default=settings.TRENDING_DECAY_INTERVAL_HOURS,
+            help='Hours passed since the previous decay pass.',
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue the decay for the job worker instead of running it here.',
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            create_job(RecipeEnum.DECAY_TRENDING_TASK.value,
+                       dedup_key=RecipeEnum.DECAY_TRENDING_TASK.value,
+                       hours=options['hours'])
+            self.stdout.write(self.style.SUCCESS('Trending decay queued.'))
+            return
+        decayed = decay_trending_scores(options['hours'])
+        self.stdout.write(self.style.SUCCESS(f'{decayed} trending scores decayed.'))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from enums.dump_enum import DumpEnum
+from recipes.dumps import export_data
+
+
+class Command(BaseCommand):
+    """
+    Dump users, tags, ingredients, recipes and their relations as NDJSON files.
+    """
+    help = ('Write one NDJSON file per model into the given directory, reading every '
+            'table in chunks through a server-side cursor. Restore it with import_data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'directory',
+            help='Directory the NDJSON files are written to.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DumpEnum.DEFAULT_WORKERS.value,
+            help='Tables exported at once on PostgreSQL, from one shared snapshot.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DumpEnum.CHUNK_SIZE.value,
+            help='Rows fetched from the cursor at once.',
+        )
+
+    def handle(self, *args, **options):
+        exported = export_data(options['directory'], options['workers'], options['chunk_size'])
+        for label, rows in exported.items():
+            self.stdout.write(f'{label}: {rows} rows exported')
+        self.stdout.write(self.style.SUCCESS(f'Dump written to {options["directory"]}.'))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+
+from enums.dump_enum import DumpEnum
+from recipes.dumps import import_data
+
+
+class Command(BaseCommand):
+    """
+    Restore a dump written by export_data.
+    """
+    help = ('Upsert the NDJSON files of a dump in batches, the models of one dependency '
+            'level at once, then rebuild counters, shopping lists, search and feeds.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'directory',
+            help='Directory holding the NDJSON files.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DumpEnum.DEFAULT_WORKERS.value,
+            help='Tables imported at once on PostgreSQL.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DumpEnum.CHUNK_SIZE.value,
+            help='Rows inserted or updated per query, capped to what the database accepts.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            imported = import_data(options['directory'], options['workers'], options['batch_size'])
+        except (OSError, ValueError, LookupError, DeserializationError) as error:
+            raise CommandError(error)
+        for label, rows in imported.items():
+            if rows is None:
+                self.stdout.write(f'{label}: no file, skipped')
+            else:
+                self.stdout.write(f'{label}: {rows} rows imported')
+        self.stdout.write(self.style.SUCCESS('Dump restored.'))
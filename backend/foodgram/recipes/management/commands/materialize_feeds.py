@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from enums.feed_enum import FeedEnum
+from jobs.queue import create_job
+from recipes.feeds import sync_materialized_feeds
+
+
+class Command(BaseCommand):
+    """
+    Materialize the recipe feeds of users following many authors.
+    """
+    help = ('Store the feed of every user with at least --min-subscriptions subscriptions '
+            'and drop the stored feeds of the others.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-subscriptions',
+            type=int,
+            default=settings.FEED_MATERIALIZE_MIN_SUBSCRIPTIONS,
+            help='Subscriptions from which a feed is materialized, 0 drops every feed.',
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue the sync for the job worker instead of running it here.',
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            create_job(FeedEnum.MATERIALIZE_TASK.value,
+                       dedup_key=FeedEnum.MATERIALIZE_TASK.value)
+            self.stdout.write(self.style.SUCCESS('Feed sync queued.'))
+            return
+        materialized, dropped = sync_materialized_feeds(options['min_subscriptions'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{materialized} feeds materialized, {dropped} feeds dropped.'
+        ))
@@ -0,0 +1,80 @@
+import os
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from recipes.images import optimize_image, store_image
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    """
+    Optimize stored recipe images and report the byte savings per image.
+    """
+    help = ('Downscale and re-encode recipe images under content-hash names. '
+            'With --dry-run or --directory only measure the savings.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Measure the savings without storing images or updating recipes.',
+        )
+        parser.add_argument(
+            '--directory',
+            help='Measure every image file of a directory instead of recipe images.',
+        )
+
+    def measure(self, label: str, content: bytes):
+        started = time.perf_counter()
+        optimized = optimize_image(content)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(
+            f'{label}: {len(content)} -> {len(optimized)} bytes '
+            f'({100 - len(optimized) * 100 // max(len(content), 1)}% saved) in {elapsed:.1f} ms'
+        )
+        return len(content), len(optimized), elapsed
+
+    def report(self, results: list):
+        if not results:
+            self.stdout.write('No images found.')
+            return
+        before = sum(result[0] for result in results)
+        after = sum(result[1] for result in results)
+        elapsed = sum(result[2] for result in results)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(results)} images: {before} -> {after} bytes, '
+            f'{elapsed / len(results):.1f} ms per image'
+        ))
+
+    def handle(self, *args, **options):
+        results = []
+        if options['directory']:
+            directory = options['directory']
+            for filename in sorted(os.listdir(directory)):
+                path = os.path.join(directory, filename)
+                if not os.path.isfile(path):
+                    continue
+                with open(path, 'rb') as file:
+                    try:
+                        results.append(self.measure(filename, file.read()))
+                    except ValueError:
+                        self.stderr.write(f'{filename}: not an image, skipped')
+            self.report(results)
+            return
+        for recipe in Recipe.objects.exclude(image='').only('id', 'image').iterator():
+            name = recipe.image.name
+            if not default_storage.exists(name):
+                self.stderr.write(f'{name}: file is missing, skipped')
+                continue
+            with default_storage.open(name, 'rb') as file:
+                content = file.read()
+            try:
+                results.append(self.measure(name, content))
+            except ValueError:
+                self.stderr.write(f'{name}: not an image, skipped')
+                continue
+            if not options['dry_run']:
+                Recipe.objects.filter(id=recipe.id).update(image=store_image(content))
+        self.report(results)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from enums.recipe_enum import RecipeEnum
+from jobs.queue import create_job
+from recipes.counters import find_counter_mismatches, rebuild_counters
+
+
+class Command(BaseCommand):
+    """
+    Rebuild or verify the denormalized favorites, cart and recipe counters.
+    """
+    help = 'Rebuild the denormalized counters, or only report mismatches with --verify.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report rows whose counters are out of date.',
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue the rebuild for the job worker instead of running it here.',
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            create_job(RecipeEnum.REBUILD_COUNTERS_TASK.value,
+                       dedup_key=RecipeEnum.REBUILD_COUNTERS_TASK.value)
+            self.stdout.write(self.style.SUCCESS('Counter rebuild queued.'))
+            return
+        if not options['verify']:
+            for label, rows in rebuild_counters().items():
+                self.stdout.write(f'{label}: {rows} rows rebuilt')
+        mismatches = find_counter_mismatches()
+        for counter, rows in mismatches.items():
+            self.stdout.write(f'{counter}: {rows} mismatched rows')
+        if any(mismatches.values()):
+            raise CommandError('Counters are out of date.')
+        self.stdout.write(self.style.SUCCESS('Counters are consistent.'))
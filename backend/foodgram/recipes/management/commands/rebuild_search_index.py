@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from recipes.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search documents of every recipe.
+    """
+    help = 'Rebuild the recipe full-text search index in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of recipes reindexed per query.',
+        )
+
+    def handle(self, *args, **options):
+        reindexed = rebuild_search_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{reindexed} recipes reindexed.'))
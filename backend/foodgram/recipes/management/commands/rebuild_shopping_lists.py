@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.shopping_lists import find_shopping_list_mismatches, rebuild_shopping_lists
+
+
+class Command(BaseCommand):
+    """
+    Rebuild or verify the per-user shopping list aggregates.
+    """
+    help = 'Rebuild the shopping list aggregates from the carts, or only report mismatches with --verify.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report shopping list rows that are out of date.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['verify']:
+            self.stdout.write(f'{rebuild_shopping_lists()} rows rebuilt')
+        mismatches = find_shopping_list_mismatches()
+        if mismatches:
+            self.stdout.write(f'{mismatches} mismatched rows')
+            raise CommandError('Shopping lists are out of date.')
+        self.stdout.write(self.style.SUCCESS('Shopping lists are consistent.'))
@@ -0,0 +1,68 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:37
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ingredient',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Ingredient Name')),
+                ('count', models.IntegerField(verbose_name='Number of Ingredients')),
+                ('measurement_unit', models.CharField(max_length=50, verbose_name='Measurement Unit')),
+            ],
+            options={
+                'verbose_name': 'Ingredient',
+                'verbose_name_plural': 'Ingredients',
+            },
+        ),
+        migrations.CreateModel(
+            name='IngredientRecipe',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.PositiveSmallIntegerField(verbose_name='Amount')),
+            ],
+            options={
+                'verbose_name': 'Ingredient - Recipe',
+                'verbose_name_plural': 'Ingredients - Recipes',
+            },
+        ),
+        migrations.CreateModel(
+            name='Recipe',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Recipe Name')),
+                ('image', models.ImageField(upload_to='', verbose_name='Recipe Image')),
+                ('text', models.TextField(max_length=1000, verbose_name='Recipe Text')),
+                ('cooking_time', models.IntegerField(validators=[django.core.validators.MinValueValidator(1, 'Your dish is ready!'), django.core.validators.MaxValueValidator(600, 'Too long to wait...')], verbose_name='Cooking Time')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation Date')),
+            ],
+            options={
+                'verbose_name': 'Recipe',
+                'verbose_name_plural': 'Recipes',
+                'ordering': ['-pub_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Tag name')),
+                ('color', models.CharField(max_length=50, verbose_name='HEX-code')),
+                ('slug', models.SlugField(verbose_name='tag Slug')),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:37
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Count the existing favorites and cart rows of every recipe."""
+    Recipe = apps.get_model('recipes', 'Recipe')
+    for counter, relation in (('favorites_count', 'favorite'), ('cart_count', 'in_cart')):
+        through = Recipe._meta.get_field(relation).remote_field.through
+        Recipe.objects.update(**{counter: Coalesce(Subquery(
+            through.objects.filter(recipe_id=OuterRef('pk'))
+            .order_by().values('recipe_id').annotate(total=Count('id')).values('total')
+        ), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_pub_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='cart_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Added to shopping carts'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Added to favorites'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:37
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def backfill_search_vector(apps, schema_editor):
+    """Build the weighted search document of existing recipes on PostgreSQL.
+
+    SQLite keeps its documents in the FTS5 table created after migrations.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "UPDATE recipes_recipe SET search_vector = "
+        "setweight(to_tsvector('russian', name), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(("
+        "SELECT string_agg(ingredient.name, ' ') FROM recipes_ingredientrecipe AS amount "
+        "JOIN recipes_ingredient AS ingredient ON ingredient.id = amount.ingredient_id "
+        "WHERE amount.recipe_id = recipes_recipe.id), '')), 'B') || "
+        "setweight(to_tsvector('russian', text), 'C')"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Search vector'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
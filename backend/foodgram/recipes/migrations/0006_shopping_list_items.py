@@ -0,0 +1,57 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_shopping_lists(apps, schema_editor):
+    """Sum the ingredients of the recipes already in every cart."""
+    Recipe = apps.get_model('recipes', 'Recipe')
+    IngredientRecipe = apps.get_model('recipes', 'IngredientRecipe')
+    ShoppingListItem = apps.get_model('recipes', 'ShoppingListItem')
+    cart = Recipe._meta.get_field('in_cart').remote_field.through
+    recipe_amounts = {}
+    for recipe_id, ingredient_id, amount in IngredientRecipe.objects.values_list(
+            'recipe_id', 'ingredient_id', 'amount').iterator():
+        recipe_amounts.setdefault(recipe_id, []).append((ingredient_id, amount))
+    totals = {}
+    for user_id, recipe_id in cart.objects.values_list('user_id', 'recipe_id').iterator():
+        for ingredient_id, amount in recipe_amounts.get(recipe_id, ()):
+            totals[user_id, ingredient_id] = totals.get((user_id, ingredient_id), 0) + amount
+    ShoppingListItem.objects.bulk_create(
+        [
+            ShoppingListItem(user_id=user_id, ingredient_id=ingredient_id, amount=amount)
+            for (user_id, ingredient_id), amount in totals.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0005_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShoppingListItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.PositiveIntegerField(verbose_name='Total amount')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='recipes.Ingredient', verbose_name='Ingredient')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shopping_list', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Shopping list item',
+                'verbose_name_plural': 'Shopping list items',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='shoppinglistitem',
+            constraint=models.UniqueConstraint(fields=('user', 'ingredient'), name='unique_shopping_list_item'),
+        ),
+        migrations.RunPython(backfill_shopping_lists, migrations.RunPython.noop),
+    ]
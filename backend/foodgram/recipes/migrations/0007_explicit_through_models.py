@@ -0,0 +1,101 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    """Move favorites and the shopping cart onto explicit through models.
+
+    The through models keep the tables and columns of the implicit m2m tables,
+    so only the model state is swapped; the database only gains the created_at
+    column, the indexes and the constraints.
+    """
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0006_shopping_list_items'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Favorite',
+                    fields=[
+                        ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorite_entries', to='recipes.Recipe', verbose_name='Recipe')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorite_entries', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                    ],
+                    options={
+                        'verbose_name': 'Favorite recipe',
+                        'verbose_name_plural': 'Favorite recipes',
+                        'db_table': 'recipes_recipe_favorite',
+                        'default_related_name': 'favorite_entries',
+                    },
+                ),
+                migrations.CreateModel(
+                    name='ShoppingCartItem',
+                    fields=[
+                        ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cart_entries', to='recipes.Recipe', verbose_name='Recipe')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cart_entries', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                    ],
+                    options={
+                        'verbose_name': 'Recipe in shopping cart',
+                        'verbose_name_plural': 'Recipes in shopping carts',
+                        'db_table': 'recipes_recipe_in_cart',
+                        'default_related_name': 'cart_entries',
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='recipe',
+                    name='favorite',
+                    field=models.ManyToManyField(related_name='favorite', through='recipes.Favorite', to=settings.AUTH_USER_MODEL, verbose_name='Favorites'),
+                ),
+                migrations.AlterField(
+                    model_name='recipe',
+                    name='in_cart',
+                    field=models.ManyToManyField(related_name='cart', through='recipes.ShoppingCartItem', to=settings.AUTH_USER_MODEL, verbose_name='In Shopping Cart'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='favorite',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Added at'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='shoppingcartitem',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Added at'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='shoppingcartitem',
+            index=models.Index(fields=['recipe', 'user'], name='cart_recipe_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shoppingcartitem',
+            index=models.Index(fields=['user', '-created_at'], name='cart_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='shoppingcartitem',
+            constraint=models.UniqueConstraint(fields=('user', 'recipe'), name='unique_cart_user_recipe'),
+        ),
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['recipe', 'user'], name='favorite_recipe_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['user', '-created_at'], name='favorite_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='favorite',
+            constraint=models.UniqueConstraint(fields=('user', 'recipe'), name='unique_favorite_user_recipe'),
+        ),
+    ]
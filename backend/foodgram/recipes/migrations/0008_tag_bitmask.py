@@ -0,0 +1,42 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:12
+
+from django.db import migrations, models
+
+
+def backfill_tag_masks(apps, schema_editor):
+    """Give every existing tag its bit and every existing recipe the OR of its tag bits."""
+    Tag = apps.get_model('recipes', 'Tag')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    bitmasks = {}
+    for bit, tag in enumerate(Tag.objects.order_by('id')):
+        if bit >= 63:
+            raise ValueError('Recipe tag masks are limited to 63 tags.')
+        tag.bitmask = 1 << bit
+        tag.save(update_fields=['bitmask'])
+        bitmasks[tag.id] = tag.bitmask
+    masks = {}
+    for recipe_id, tag_id in Recipe.tags.through.objects.values_list('recipe_id', 'tag_id'):
+        masks[recipe_id] = masks.get(recipe_id, 0) | bitmasks[tag_id]
+    for recipe_id, mask in masks.items():
+        Recipe.objects.filter(id=recipe_id).update(tags_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_explicit_through_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='tags_mask',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Tags bitmask'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='bitmask',
+            field=models.BigIntegerField(editable=False, null=True, unique=True, verbose_name='Bit in the recipe tag mask'),
+        ),
+        migrations.RunPython(backfill_tag_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_recipe_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataSource',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Path')),
+                ('checksum', models.CharField(max_length=64, verbose_name='SHA-256 checksum')),
+                ('rows', models.PositiveIntegerField(default=0, verbose_name='Loaded rows')),
+                ('loaded_at', models.DateTimeField(auto_now=True, verbose_name='Loaded at')),
+            ],
+            options={
+                'verbose_name': 'Loaded data source',
+                'verbose_name_plural': 'Loaded data sources',
+            },
+        ),
+    ]
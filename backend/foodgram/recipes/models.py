@@ -1,11 +1,17 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MaxValueValidator, MinValueValidator
 
+from enums.data_source_enum import DataSourceEnum
+from enums.feed_enum import FeedEnum
 from enums.ingredient_enum import IngredientEnum
 from enums.ingredient_recipe_enum import IngredientRecipeEnum
 from enums.recipe_enum import RecipeEnum
+from enums.shopping_list_enum import ShoppingListEnum
 from enums.tag_enum import TagEnum
-from users.models import User
+from enums.user_enum import UserEnum
+from recipes import lookups  # noqa: F401
+from users.models import Subscription, User
 
 
 class Tag(models.Model):
@@ -18,6 +24,12 @@ class Tag(models.Model):
         verbose_name=TagEnum.COLOR_VERBOSE_NAME.value,
     )
     slug = models.SlugField(verbose_name=TagEnum.SLUG_VERBOSE_NAME.value)
+    bitmask = models.BigIntegerField(
+        unique=True,
+        null=True,
+        editable=False,
+        verbose_name=TagEnum.BITMASK_VERBOSE_NAME.value,
+    )
 
     def __str__(self):
         return f"{self.name}"
@@ -46,6 +58,118 @@ class Ingredient(models.Model):
         verbose_name_plural = IngredientEnum.INGREDIENT_VERBOSE_NAME_PLURAL.value
 
 
+class RecipeQuerySet(models.QuerySet):
+    """
+    QuerySet for the Recipe model with helpers for the read API.
+    """
+
+    def with_user_flags(self, user: User) -> 'RecipeQuerySet':
+        """
+        Annotate `is_favorited` and `is_in_shopping_cart` for the given user.
+
+        Both flags are computed by the database as EXISTS subqueries, so the
+        serializers can read them from the instance instead of querying per row.
+        """
+        if user.is_anonymous:
+            return self.annotate(
+                is_favorited=models.Value(False, output_field=models.BooleanField()),
+                is_in_shopping_cart=models.Value(False, output_field=models.BooleanField()),
+            )
+        return self.annotate(
+            is_favorited=models.Exists(
+                Favorite.objects.filter(
+                    recipe_id=models.OuterRef('pk'), user_id=user.id,
+                )
+            ),
+            is_in_shopping_cart=models.Exists(
+                ShoppingCartItem.objects.filter(
+                    recipe_id=models.OuterRef('pk'), user_id=user.id,
+                )
+            ),
+        )
+
+    def latest_for_authors(self, author_ids: list, limit: int = None) -> dict:
+        """
+        Return the latest recipes of every given author, grouped by author id.
+
+        With a limit the recipes are ranked by ROW_NUMBER() partitioned by author
+        in a single query, so each author contributes at most `limit` rows.
+        """
+        recipes = {author_id: [] for author_id in author_ids}
+        if not author_ids:
+            return recipes
+        if limit is None:
+            queryset = self.filter(author_id__in=author_ids).order_by(
+                *RecipeEnum.RECIPE_KEYSET_ORDERING.value
+            )
+        else:
+            table = self.model._meta.db_table
+            placeholders = ', '.join(['%s'] * len(author_ids))
+            queryset = self.raw(
+                f'SELECT id, author_id, name, image, cooking_time FROM ('
+                f'SELECT id, author_id, name, image, cooking_time, pub_date, '
+                f'ROW_NUMBER() OVER (PARTITION BY author_id ORDER BY pub_date DESC, id DESC) AS recipe_rank '
+                f'FROM {table} WHERE author_id IN ({placeholders})'
+                f') ranked WHERE recipe_rank <= %s ORDER BY pub_date DESC, id DESC',
+                [*author_ids, limit],
+            )
+        for recipe in queryset:
+            recipes[recipe.author_id].append(recipe)
+        return recipes
+
+    def with_any_tag(self, tags) -> 'RecipeQuerySet':
+        """
+        Keep the recipes having at least one of the given tags.
+
+        The tags are matched by a bitwise AND on `tags_mask`, without joining
+        the tag tables, so no duplicate rows need a DISTINCT.
+        """
+        mask = 0
+        for tag in tags:
+            mask |= tag.bitmask or 0
+        return self.filter(**{f'{RecipeEnum.TAGS_MASK_FIELD.value}__hasanybit': mask})
+
+    def followed_by(self, user: User) -> 'RecipeQuerySet':
+        """
+        Keep the recipes of the authors the user is subscribed to (fan-out on read).
+
+        The subscriptions are a semi-join on `(user, author)`, so every recipe
+        appears once and the database can walk the `pub_date` or the
+        `(author, pub_date)` index, whichever the followed set favours.
+        """
+        return self.filter(author_id__in=models.Subquery(
+            Subscription.objects.filter(user_id=user.id).values('author_id')
+        ))
+
+    def from_timeline(self, user: User) -> 'RecipeQuerySet':
+        """
+        Keep the recipes of the materialized feed of the user.
+
+        The timeline position is annotated from the same join, so a keyset over
+        `TIMELINE_KEYSET_FIELDS` is served by the `(user, pub_date, recipe)` index.
+        """
+        return self.filter(**{f'{FeedEnum.RELATED_NAME.value}__user_id': user.id}).annotate(**{
+            FeedEnum.PUB_DATE_ANNOTATION.value: models.F(f'{FeedEnum.RELATED_NAME.value}__pub_date'),
+            FeedEnum.RECIPE_ID_ANNOTATION.value: models.F(f'{FeedEnum.RELATED_NAME.value}__recipe_id'),
+        })
+
+    def with_relations(self) -> 'RecipeQuerySet':
+        """
+        Preload every relation rendered by RecipeSerializer.
+        """
+        return self.select_related(
+            RecipeEnum.AUTHOR_FIELD.value,
+        ).prefetch_related(
+            RecipeEnum.TAGS_RELATED_NAME.value,
+            models.Prefetch(
+                IngredientRecipeEnum.INGREDIENTS_AMOUNT.value,
+                queryset=IngredientRecipe.objects.select_related(
+                    IngredientRecipeEnum.INGREDIENT_FIELD.value,
+                ),
+            ),
+        )
+
+
 class Recipe(models.Model):
     author = models.ForeignKey(
         to=User,
@@ -77,21 +201,53 @@ class Recipe(models.Model):
                                        ))
     favorite = models.ManyToManyField(
         to=User,
+        through='Favorite',
         verbose_name=RecipeEnum.FAVORITES_VERBOSE_NAME.value,
         related_name=RecipeEnum.FAVORITES_RELATED_NAME.value,
-        symmetrical=False,
     )
     in_cart = models.ManyToManyField(
         to=User,
+        through='ShoppingCartItem',
         verbose_name=RecipeEnum.IN_CARD_VERBOSE_NAME.value,
         related_name=RecipeEnum.IN_CARD_RELATED_NAME.value,
-        symmetrical=False,
+    )
+    tags_mask = models.BigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=RecipeEnum.TAGS_MASK_VERBOSE_NAME.value,
     )
     pub_date = models.DateTimeField(
         auto_now_add=True,
         db_index=True,
         verbose_name=RecipeEnum.RECIPE_PUB_DATE.value,
     )
+    favorites_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=RecipeEnum.FAVORITES_COUNT_VERBOSE_NAME.value,
+    )
+    cart_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=RecipeEnum.CART_COUNT_VERBOSE_NAME.value,
+    )
+    popularity = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=RecipeEnum.POPULARITY_VERBOSE_NAME.value,
+    )
+    trending_score = models.FloatField(
+        default=0,
+        editable=False,
+        verbose_name=RecipeEnum.TRENDING_SCORE_VERBOSE_NAME.value,
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name=RecipeEnum.SEARCH_VECTOR_VERBOSE_NAME.value,
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.name}"
@@ -100,6 +256,105 @@ class Recipe(models.Model):
         verbose_name = RecipeEnum.RECIPE_VERBOSE_NAME.value
         verbose_name_plural = RecipeEnum.RECIPE_VERBOSE_NAME_PLURAL.value
         ordering = RecipeEnum.RECIPE_ORDERING.value
+        indexes = [
+            models.Index(
+                fields=RecipeEnum.PUB_DATE_ID_INDEX_FIELDS.value,
+                name=RecipeEnum.PUB_DATE_ID_INDEX_NAME.value,
+            ),
+            models.Index(
+                fields=RecipeEnum.AUTHOR_PUB_DATE_INDEX_FIELDS.value,
+                name=RecipeEnum.AUTHOR_PUB_DATE_INDEX_NAME.value,
+            ),
+            models.Index(
+                fields=RecipeEnum.POPULARITY_INDEX_FIELDS.value,
+                name=RecipeEnum.POPULARITY_INDEX_NAME.value,
+            ),
+            models.Index(
+                fields=RecipeEnum.TRENDING_INDEX_FIELDS.value,
+                name=RecipeEnum.TRENDING_INDEX_NAME.value,
+            ),
+        ]
+
+
+class UserRecipeRelation(models.Model):
+    """
+    Base for a recipe marked by a user, stored with the time it was marked.
+
+    Subclasses keep the table and columns of the former implicit m2m tables,
+    so existing rows stay in place.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name=UserEnum.USER_VERBOSE_NAME.value,
+    )
+    recipe = models.ForeignKey(
+        'Recipe',
+        on_delete=models.CASCADE,
+        verbose_name=RecipeEnum.RECIPE_VERBOSE_NAME.value,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=RecipeEnum.CREATED_AT_VERBOSE_NAME.value,
+    )
+
+    def __str__(self):
+        return f"{self.user_id}: {self.recipe_id}"
+
+    class Meta:
+        abstract = True
+
+
+class Favorite(UserRecipeRelation):
+    """A recipe in a user's favorites."""
+
+    class Meta:
+        db_table = RecipeEnum.FAVORITE_DB_TABLE.value
+        default_related_name = RecipeEnum.FAVORITE_ENTRIES_RELATED_NAME.value
+        verbose_name = RecipeEnum.FAVORITE_VERBOSE_NAME.value
+        verbose_name_plural = RecipeEnum.FAVORITE_VERBOSE_NAME_PLURAL.value
+        constraints = [
+            models.UniqueConstraint(
+                fields=RecipeEnum.RELATION_USER_FIELDS.value,
+                name=RecipeEnum.FAVORITE_UNIQUE_NAME.value,
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=RecipeEnum.RELATION_RECIPE_FIELDS.value,
+                name=RecipeEnum.FAVORITE_RECIPE_INDEX_NAME.value,
+            ),
+            models.Index(
+                fields=RecipeEnum.RELATION_CREATED_FIELDS.value,
+                name=RecipeEnum.FAVORITE_CREATED_INDEX_NAME.value,
+            ),
+        ]
+
+
+class ShoppingCartItem(UserRecipeRelation):
+    """A recipe in a user's shopping cart."""
+
+    class Meta:
+        db_table = RecipeEnum.CART_ITEM_DB_TABLE.value
+        default_related_name = RecipeEnum.CART_ENTRIES_RELATED_NAME.value
+        verbose_name = RecipeEnum.CART_ITEM_VERBOSE_NAME.value
+        verbose_name_plural = RecipeEnum.CART_ITEM_VERBOSE_NAME_PLURAL.value
+        constraints = [
+            models.UniqueConstraint(
+                fields=RecipeEnum.RELATION_USER_FIELDS.value,
+                name=RecipeEnum.CART_ITEM_UNIQUE_NAME.value,
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=RecipeEnum.RELATION_RECIPE_FIELDS.value,
+                name=RecipeEnum.CART_ITEM_RECIPE_INDEX_NAME.value,
+            ),
+            models.Index(
+                fields=RecipeEnum.RELATION_CREATED_FIELDS.value,
+                name=RecipeEnum.CART_ITEM_CREATED_INDEX_NAME.value,
+            ),
+        ]
 
 
 class IngredientRecipe(models.Model):
@@ -127,3 +382,114 @@ class IngredientRecipe(models.Model):
                 name=IngredientRecipeEnum.CONSTRAINS_RECIPE_NAME.value,
             ),
         ]
+
+
+class ShoppingListItem(models.Model):
+    """
+    Total amount of an ingredient over all recipes in a user's shopping cart.
+
+    Rows are kept up to date by cart and recipe changes, so a shopping list is
+    read by user id instead of aggregating the cart recipes on every request.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name=ShoppingListEnum.USER_RELATED_NAME.value,
+        verbose_name=ShoppingListEnum.USER_VERBOSE_NAME.value,
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        verbose_name=IngredientEnum.INGREDIENT_VERBOSE_NAME.value,
+    )
+    amount = models.PositiveIntegerField(
+        verbose_name=ShoppingListEnum.AMOUNT_VERBOSE_NAME.value,
+    )
+
+    def __str__(self):
+        return f"{self.user_id}: {self.ingredient_id} x {self.amount}"
+
+    class Meta:
+        verbose_name = ShoppingListEnum.ITEM_VERBOSE_NAME.value
+        verbose_name_plural = ShoppingListEnum.ITEM_VERBOSE_NAME_PLURAL.value
+        constraints = [
+            models.UniqueConstraint(
+                fields=ShoppingListEnum.CONSTRAINS_ITEM_FIELDS.value,
+                name=ShoppingListEnum.CONSTRAINS_ITEM_NAME.value,
+            ),
+        ]
+
+
+class FeedEntry(models.Model):
+    """
+    A recipe in the materialized feed of a user following many authors.
+
+    The publication date is copied from the recipe, which never changes it,
+    so a page of the feed is one range scan of the `(user, pub_date)` index.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name=FeedEnum.RELATED_NAME.value,
+        verbose_name=FeedEnum.USER_VERBOSE_NAME.value,
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name=FeedEnum.RELATED_NAME.value,
+        verbose_name=RecipeEnum.RECIPE_VERBOSE_NAME.value,
+    )
+    pub_date = models.DateTimeField(
+        verbose_name=FeedEnum.PUB_DATE_VERBOSE_NAME.value,
+    )
+
+    def __str__(self):
+        return f"{self.user_id}: {self.recipe_id}"
+
+    class Meta:
+        verbose_name = FeedEnum.ENTRY_VERBOSE_NAME.value
+        verbose_name_plural = FeedEnum.ENTRY_VERBOSE_NAME_PLURAL.value
+        constraints = [
+            models.UniqueConstraint(
+                fields=FeedEnum.CONSTRAINS_ENTRY_FIELDS.value,
+                name=FeedEnum.CONSTRAINS_ENTRY_NAME.value,
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=FeedEnum.TIMELINE_INDEX_FIELDS.value,
+                name=FeedEnum.TIMELINE_INDEX_NAME.value,
+            ),
+        ]
+
+
+class DataSource(models.Model):
+    """
+    A fixture or catalogue file loaded by `load_data`, with the checksum of its content.
+
+    A source whose checksum did not change since the last load is skipped.
+    """
+    name = models.CharField(
+        max_length=DataSourceEnum.NAME_MAX_LENGTH.value,
+        unique=True,
+        verbose_name=DataSourceEnum.NAME_VERBOSE_NAME.value,
+    )
+    checksum = models.CharField(
+        max_length=DataSourceEnum.CHECKSUM_LENGTH.value,
+        verbose_name=DataSourceEnum.CHECKSUM_VERBOSE_NAME.value,
+    )
+    rows = models.PositiveIntegerField(
+        default=0,
+        verbose_name=DataSourceEnum.ROWS_VERBOSE_NAME.value,
+    )
+    loaded_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=DataSourceEnum.LOADED_AT_VERBOSE_NAME.value,
+    )
+
+    def __str__(self):
+        return f"{self.name} ({self.checksum[:12]})"
+
+    class Meta:
+        verbose_name = DataSourceEnum.SOURCE_VERBOSE_NAME.value
+        verbose_name_plural = DataSourceEnum.SOURCE_VERBOSE_NAME_PLURAL.value
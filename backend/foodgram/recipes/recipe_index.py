@@ -0,0 +1,352 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from enums.recipe_enum import RecipeEnum
+from recipes.models import IngredientRecipe, Recipe
+
+
+def to_bitset(ids: Iterable[int]) -> int:
+    """Pack ids into an int with the bit of every id set."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for pk in ids:
+        bits[pk >> 3] |= 1 << (pk & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def union(bitsets: Iterable[int]) -> int:
+    """OR the given bitsets together."""
+    result = 0
+    for bitset in bitsets:
+        result |= bitset
+    return result
+
+
+class RecipeBitsetIndex:
+    """
+    Per-process inverted index of recipes for "similar recipes" and pantry matching.
+
+    Every ingredient, tag and cooking time maps to a bitset over recipe ids
+    (a Python int), and recipes are also grouped into bitsets by their number
+    of ingredients. A query adds up the ingredient bitsets it needs with
+    bit-sliced addition, so the shared ingredient count of every recipe is
+    computed by a few dozen whole-bitset operations in C instead of a GROUP BY
+    or a loop over recipes. Both rankings only depend on that count and the
+    size of the recipe, so the best recipes are read from the highest bits of
+    the (count, size) groups in score order.
+
+    Every change bumps a shared version in the cache and stores the changed
+    recipe ids under that version. A stale process reloads just those recipes
+    and flips their bits; it rebuilds from scratch only when it is too far
+    behind or the change list has expired.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._rows: Dict[int, FrozenSet[int]] = {}
+        self._columns: Dict[int, int] = {}
+        self._sizes: Dict[int, int] = {}
+        self._recipes: Dict[int, Tuple[int, FrozenSet[int]]] = {}
+        self._tags: Dict[int, int] = {}
+        self._cooking_times: Dict[int, int] = {}
+
+    @staticmethod
+    def get_version() -> int:
+        """Return the shared version of the indexed recipe data."""
+        key = RecipeEnum.INDEX_VERSION_KEY.value
+        cache.add(key, 1, timeout=None)
+        return cache.get(key, 1)
+
+    def mark_changed(self, recipe_ids: Iterable[int]):
+        """Publish the recipes whose ingredients, tags or cooking time changed on commit."""
+        recipe_ids = sorted(set(recipe_ids))
+        if recipe_ids:
+            transaction.on_commit(lambda: self.publish_changes(recipe_ids))
+
+    @staticmethod
+    def publish_changes(recipe_ids: List[int]):
+        """Bump the shared version and store the changed recipe ids under it."""
+        key = RecipeEnum.INDEX_VERSION_KEY.value
+        cache.add(key, 1, timeout=None)
+        try:
+            version = cache.incr(key)
+        except ValueError:
+            version = 2
+            cache.set(key, version, timeout=None)
+        cache.set(
+            RecipeEnum.INDEX_CHANGES_KEY.value.format(version=version),
+            recipe_ids,
+            RecipeEnum.INDEX_CHANGES_TIMEOUT.value,
+        )
+
+    @staticmethod
+    def invalidate():
+        """Make every process rebuild its index, after changes made without signals."""
+        key = RecipeEnum.INDEX_VERSION_KEY.value
+        cache.add(key, 1, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 2, timeout=None)
+
+    def get_changes(self, version: int) -> Optional[Set[int]]:
+        """Collect the recipes changed since the loaded version, or None if unknown."""
+        pending_versions = version - (self._version or 0)
+        if self._version is None or not 0 < pending_versions <= RecipeEnum.INDEX_MAX_PENDING_VERSIONS.value:
+            return None
+        keys = [
+            RecipeEnum.INDEX_CHANGES_KEY.value.format(version=pending)
+            for pending in range(self._version + 1, version + 1)
+        ]
+        found = cache.get_many(keys)
+        if len(found) != len(keys):
+            return None
+        return {recipe_id for recipe_ids in found.values() for recipe_id in recipe_ids}
+
+    def load(self, ingredients: Iterable[Tuple[int, int]],
+             recipes: Iterable[Tuple[int, int]] = (), tags: Iterable[Tuple[int, int]] = ()):
+        """Replace the index with the given pairs.
+
+        The pairs are `(recipe_id, ingredient_id)`, `(recipe_id, cooking_time)`
+        and `(recipe_id, tag_id)`.
+        """
+        rows = defaultdict(set)
+        for recipe_id, ingredient_id in ingredients:
+            rows[recipe_id].add(ingredient_id)
+        recipe_tags = defaultdict(set)
+        for recipe_id, tag_id in tags:
+            recipe_tags[recipe_id].add(tag_id)
+        columns = defaultdict(list)
+        sizes = defaultdict(list)
+        for recipe_id, ingredient_ids in rows.items():
+            sizes[len(ingredient_ids)].append(recipe_id)
+            for ingredient_id in ingredient_ids:
+                columns[ingredient_id].append(recipe_id)
+        by_tag = defaultdict(list)
+        by_cooking_time = defaultdict(list)
+        self._recipes = {}
+        for recipe_id, cooking_time in recipes:
+            tag_ids = frozenset(recipe_tags.get(recipe_id, ()))
+            self._recipes[recipe_id] = (cooking_time, tag_ids)
+            by_cooking_time[cooking_time].append(recipe_id)
+            for tag_id in tag_ids:
+                by_tag[tag_id].append(recipe_id)
+        self._rows = {
+            recipe_id: frozenset(ingredient_ids) for recipe_id, ingredient_ids in rows.items()
+        }
+        self._columns = {
+            ingredient_id: to_bitset(recipe_ids) for ingredient_id, recipe_ids in columns.items()
+        }
+        self._sizes = {size: to_bitset(recipe_ids) for size, recipe_ids in sizes.items()}
+        self._tags = {tag_id: to_bitset(recipe_ids) for tag_id, recipe_ids in by_tag.items()}
+        self._cooking_times = {
+            cooking_time: to_bitset(recipe_ids)
+            for cooking_time, recipe_ids in by_cooking_time.items()
+        }
+
+    @staticmethod
+    def read(recipe_ids: Iterable[int] = None):
+        """Query the ingredient, cooking time and tag pairs of the given recipes, or of all."""
+        ingredients = IngredientRecipe.objects.all()
+        recipes = Recipe.objects.all()
+        tags = Recipe.tags.through.objects.all()
+        if recipe_ids is not None:
+            recipe_ids = list(recipe_ids)
+            ingredients = ingredients.filter(recipe_id__in=recipe_ids)
+            recipes = recipes.filter(id__in=recipe_ids)
+            tags = tags.filter(recipe_id__in=recipe_ids)
+        return (
+            ingredients.values_list('recipe_id', 'ingredient_id').order_by().iterator(),
+            recipes.values_list('id', 'cooking_time').order_by().iterator(),
+            tags.values_list('recipe_id', 'tag_id').order_by().iterator(),
+        )
+
+    def build(self, version: int):
+        """Load the whole index from the database."""
+        self.load(*self.read())
+        self._version = version
+
+    @staticmethod
+    def _set_bit(bitsets: Dict[int, int], key: int, bit: int, value: bool):
+        bitset = bitsets.get(key, 0)
+        bitset = bitset | bit if value else bitset & ~bit
+        if bitset:
+            bitsets[key] = bitset
+        else:
+            bitsets.pop(key, None)
+
+    def _move_bit(self, bitsets: Dict[int, int], bit: int, old: Iterable, new: Iterable):
+        old, new = set(old), set(new)
+        for key in old - new:
+            self._set_bit(bitsets, key, bit, False)
+        for key in new - old:
+            self._set_bit(bitsets, key, bit, True)
+
+    def update(self, recipe_ids: Set[int], version: int):
+        """Reload the given recipes and flip their bits in the bitsets."""
+        ingredients, recipes, tags = self.read(recipe_ids)
+        new_rows = defaultdict(set)
+        for recipe_id, ingredient_id in ingredients:
+            new_rows[recipe_id].add(ingredient_id)
+        new_tags = defaultdict(set)
+        for recipe_id, tag_id in tags:
+            new_tags[recipe_id].add(tag_id)
+        new_recipes = {
+            recipe_id: (cooking_time, frozenset(new_tags.get(recipe_id, ())))
+            for recipe_id, cooking_time in recipes
+        }
+        for recipe_id in recipe_ids:
+            bit = 1 << recipe_id
+            old = self._rows.get(recipe_id, frozenset())
+            new = frozenset(new_rows.get(recipe_id, ()))
+            self._move_bit(self._columns, bit, old, new)
+            self._move_bit(self._sizes, bit, [len(old)] if old else [], [len(new)] if new else [])
+            if new:
+                self._rows[recipe_id] = new
+            else:
+                self._rows.pop(recipe_id, None)
+            old_cooking_time, old_tags = self._recipes.get(recipe_id, (None, frozenset()))
+            new_cooking_time, new_tag_ids = new_recipes.get(recipe_id, (None, frozenset()))
+            self._move_bit(self._tags, bit, old_tags, new_tag_ids)
+            self._move_bit(
+                self._cooking_times, bit,
+                [old_cooking_time] if old_cooking_time is not None else [],
+                [new_cooking_time] if new_cooking_time is not None else [],
+            )
+            if recipe_id in new_recipes:
+                self._recipes[recipe_id] = new_recipes[recipe_id]
+            else:
+                self._recipes.pop(recipe_id, None)
+        self._version = version
+
+    def ensure_fresh(self):
+        """Apply the changes made since the last load, rebuilding if they are unknown."""
+        version = self.get_version()
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            changes = self.get_changes(version)
+            if changes is None:
+                self.build(version)
+            else:
+                self.update(changes, version)
+
+    def count_shared(self, ingredient_ids: Iterable[int]) -> List[int]:
+        """Return how many of the given ingredients every recipe uses, as bit planes.
+
+        Bit `j` of plane `i` is bit `i` of the count of recipe `j`.
+        The ingredient bitsets are summed like a ripple-carry adder.
+        """
+        planes = []
+        for ingredient_id in ingredient_ids:
+            carry = self._columns.get(ingredient_id, 0)
+            for index, plane in enumerate(planes):
+                if not carry:
+                    break
+                planes[index], carry = plane ^ carry, plane & carry
+            if carry:
+                planes.append(carry)
+        return planes
+
+    @staticmethod
+    def select_count(planes: List[int], count: int) -> int:
+        """Return the bitset of recipes with exactly `count` (at least 1) shared ingredients."""
+        if count >> len(planes):
+            return 0
+        selected = -1
+        for index, plane in enumerate(planes):
+            selected &= plane if count >> index & 1 else ~plane
+        return selected
+
+    def rank(self, planes: List[int], max_shared: int, key: Callable[[int, int], tuple],
+             limit: int, allowed: int = -1) -> List[Tuple[int, tuple]]:
+        """Return the best `limit` recipes as `(recipe_id, key)` pairs.
+
+        Recipes are ordered by `key(shared, size)`, then newest first, and
+        only recipes in the `allowed` bitset are kept.
+        """
+        groups = defaultdict(list)
+        for size in self._sizes:
+            for shared in range(1, min(max_shared, size) + 1):
+                groups[key(shared, size)].append((shared, size))
+        counts = {}
+        found = []
+        for group in sorted(groups, reverse=True):
+            matches = 0
+            for shared, size in groups[group]:
+                if shared not in counts:
+                    counts[shared] = self.select_count(planes, shared) & allowed
+                matches |= counts[shared] & self._sizes[size]
+            while matches and len(found) < limit:
+                recipe_id = matches.bit_length() - 1
+                found.append((recipe_id, group))
+                matches ^= 1 << recipe_id
+            if len(found) >= limit:
+                break
+        return found
+
+    def similar(self, recipe_id: int,
+                limit: int = RecipeEnum.SIMILAR_DEFAULT_LIMIT.value) -> List[Tuple[int, float]]:
+        """
+        Return the `limit` recipes with the highest Jaccard similarity of ingredient sets.
+
+        The result is a list of `(recipe_id, similarity)` pairs, best first.
+        Ties are broken in favour of newer recipes.
+        """
+        self.ensure_fresh()
+        with self._lock:
+            row = self._rows.get(recipe_id)
+            if not row:
+                return []
+            size = len(row)
+            ranked = self.rank(
+                self.count_shared(row), size,
+                lambda shared, other_size: (shared / (size + other_size - shared),),
+                limit, ~(1 << recipe_id),
+            )
+        return [(other, key[0]) for other, key in ranked]
+
+    def pantry(self, ingredient_ids: Iterable[int], tag_ids: Iterable[int] = None,
+               max_cooking_time: int = None,
+               limit: int = RecipeEnum.SIMILAR_DEFAULT_LIMIT.value) -> List[Tuple[int, float, int]]:
+        """
+        Rank recipes by the share of their ingredients found in the pantry.
+
+        Recipes may be limited to any of the given tags and to a maximum cooking
+        time. Recipes with the same coverage are ordered by the number of used
+        pantry ingredients, then newest first.
+
+        Returns:
+            list: `(recipe_id, coverage, missing)` triples, best first.
+        """
+        ingredient_ids = set(ingredient_ids)
+        self.ensure_fresh()
+        with self._lock:
+            allowed = -1
+            if tag_ids is not None:
+                allowed &= union(self._tags.get(tag_id, 0) for tag_id in tag_ids)
+            if max_cooking_time is not None:
+                allowed &= union(
+                    bitset for cooking_time, bitset in self._cooking_times.items()
+                    if cooking_time <= max_cooking_time
+                )
+            ranked = self.rank(
+                self.count_shared(ingredient_ids), len(ingredient_ids),
+                lambda shared, size: (shared / size, shared), limit, allowed,
+            )
+            return [
+                (recipe_id, coverage, len(self._rows[recipe_id]) - shared)
+                for recipe_id, (coverage, shared) in ranked
+            ]
+
+
+recipe_index = RecipeBitsetIndex()
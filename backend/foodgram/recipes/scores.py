@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from enums.recipe_enum import RecipeEnum
+from recipes.models import Recipe
+
+
+def get_popularity_expression(favorites_count, cart_count):
+    """Combine favorites and cart counts, or expressions computing them, into a popularity."""
+    return (favorites_count * RecipeEnum.FAVORITE_SCORE_WEIGHT.value +
+            cart_count * RecipeEnum.CART_SCORE_WEIGHT.value)
+
+
+def get_withdrawn_boosts(rows: Iterable[Tuple[int, datetime]], weight: float) -> Dict[int, float]:
+    """Return what removed additions, as `(recipe_id, created_at)` pairs, still add to trending scores.
+
+    An addition boosted its recipe by `weight`, which has halved every
+    TRENDING_HALF_LIFE_HOURS since, the way `decay_trending_scores` shrank it.
+    """
+    now = timezone.now()
+    withdrawn = {}
+    for recipe_id, created_at in rows:
+        hours = (now - created_at).total_seconds() / 3600
+        withdrawn[recipe_id] = (
+            withdrawn.get(recipe_id, 0) + weight * 0.5 ** (hours / settings.TRENDING_HALF_LIFE_HOURS)
+        )
+    return withdrawn
+
+
+def change_scores(recipe_ids: Iterable[int], boost: float = 0, withdrawn: Dict[int, float] = None):
+    """Recompute the popularity of the given recipes from their counters with one UPDATE.
+
+    A positive `boost` is added to their trending score in the same statement, and
+    the `withdrawn` amount of each recipe is subtracted from it, down to zero.
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    field = RecipeEnum.TRENDING_SCORE_FIELD.value
+    values = {
+        RecipeEnum.POPULARITY_FIELD.value: get_popularity_expression(
+            F(RecipeEnum.FAVORITES_COUNT_FIELD.value), F(RecipeEnum.CART_COUNT_FIELD.value),
+        ),
+    }
+    if boost > 0:
+        values[field] = F(field) + boost
+    elif withdrawn:
+        values[field] = Greatest(
+            F(field) - Case(
+                *(When(id=pk, then=Value(amount)) for pk, amount in withdrawn.items()),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+            Value(0.0),
+        )
+    Recipe.objects.filter(id__in=recipe_ids).update(**values)
+
+
+def decay_trending_scores(hours: float = None) -> int:
+    """Decay every trending score by the time passed since the previous pass.
+
+    Scores halve every TRENDING_HALF_LIFE_HOURS and drop to zero below
+    TRENDING_MIN_SCORE, so recipes nobody touches leave the update. All scores
+    shrink by the same factor, which keeps their order and the cached pages valid;
+    the pass only stops old additions from outweighing new ones.
+
+    Returns:
+        int: The number of decayed recipes.
+    """
+    if hours is None:
+        hours = settings.TRENDING_DECAY_INTERVAL_HOURS
+    factor = 0.5 ** (hours / settings.TRENDING_HALF_LIFE_HOURS)
+    field = RecipeEnum.TRENDING_SCORE_FIELD.value
+    minimum = RecipeEnum.TRENDING_MIN_SCORE.value
+    return Recipe.objects.filter(**{f'{field}__gt': 0}).update(**{
+        field: Case(
+            When(**{f'{field}__lt': minimum / factor}, then=Value(0.0)),
+            default=F(field) * factor,
+            output_field=FloatField(),
+        ),
+    })
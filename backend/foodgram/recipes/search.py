@@ -0,0 +1,134 @@
+from typing import Iterable
+
+from django.db import connection
+from django.db.models import OuterRef, QuerySet, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from enums.recipe_enum import RecipeEnum
+from recipes.models import IngredientRecipe, Recipe
+
+if connection.vendor == 'postgresql':
+    from django.contrib.postgres.aggregates import StringAgg
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+FTS_TABLE = f'{Recipe._meta.db_table}_fts'
+
+
+def is_postgresql() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def create_fts_table(**kwargs):
+    """Create the SQLite FTS5 table mirroring recipe name, ingredients and text."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            f'USING fts5(name, ingredients, text, tokenize="unicode61")'
+        )
+
+
+def create_search_index(**kwargs):
+    """Create the vendor specific search index after migrations.
+
+    The GIN index over `search_vector` only exists on PostgreSQL, so it is kept
+    out of the model state and created here like the SQLite FTS5 table.
+    """
+    if is_postgresql():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {RecipeEnum.SEARCH_INDEX_NAME.value} '
+                f'ON {Recipe._meta.db_table} USING gin (search_vector)'
+            )
+    else:
+        create_fts_table()
+
+
+def update_search_index(recipe_ids: Iterable[int]):
+    """Recompute the search document of the given recipes.
+
+    On PostgreSQL the weighted `search_vector` column is rebuilt with one UPDATE,
+    on SQLite the matching FTS5 rows are replaced.
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    if is_postgresql():
+        ingredient_names = Subquery(
+            IngredientRecipe.objects.filter(recipe_id=OuterRef('pk'))
+            .order_by()
+            .values('recipe_id')
+            .annotate(names=StringAgg('ingredient__name', ' '))
+            .values('names')
+        )
+        config = RecipeEnum.SEARCH_CONFIG.value
+        Recipe.objects.filter(id__in=recipe_ids).update(
+            search_vector=(
+                SearchVector('name', weight='A', config=config) +
+                SearchVector(Coalesce(ingredient_names, Value('')), weight='B', config=config) +
+                SearchVector('text', weight='C', config=config)
+            )
+        )
+    elif connection.vendor == 'sqlite':
+        names = {}
+        for recipe_id, name in IngredientRecipe.objects.filter(
+                recipe_id__in=recipe_ids).values_list('recipe_id', 'ingredient__name'):
+            names.setdefault(recipe_id, []).append(name)
+        rows = [
+            (recipe_id, name, ' '.join(names.get(recipe_id, [])), text)
+            for recipe_id, name, text in Recipe.objects.filter(
+                id__in=recipe_ids).values_list('id', 'name', 'text')
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, name, ingredients, text) '
+                f'VALUES (%s, %s, %s, %s)',
+                rows,
+            )
+
+
+def rebuild_search_index(batch_size: int = 1000) -> int:
+    """Recompute the search documents of every recipe in batches, return their number."""
+    create_fts_table()
+    recipe_ids = list(Recipe.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(recipe_ids), batch_size):
+        update_search_index(recipe_ids[start:start + batch_size])
+    return len(recipe_ids)
+
+
+def delete_from_search_index(recipe_id: int):
+    """Drop a deleted recipe from the SQLite FTS5 table."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [recipe_id])
+
+
+def to_fts_query(value: str) -> str:
+    """Turn user input into an FTS5 query of quoted prefix terms."""
+    terms = value.split()
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def search_recipes(queryset: QuerySet, value: str) -> QuerySet:
+    """Filter recipes by the search query and order them by relevance."""
+    if not value.split():
+        return queryset
+    if is_postgresql():
+        query = SearchQuery(value, config=RecipeEnum.SEARCH_CONFIG.value)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank('search_vector', query),
+        ).order_by('-search_rank', *RecipeEnum.RECIPE_ORDERING.value)
+    query = to_fts_query(value)
+    table = Recipe._meta.db_table
+    return queryset.extra(
+        where=[f'{table}.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)'],
+        params=[query],
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 10.0, 5.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            [query],
+        ),
+    ).order_by('-search_rank', *RecipeEnum.RECIPE_ORDERING.value)
@@ -0,0 +1,102 @@
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Greatest
+
+from recipes.models import IngredientRecipe, Recipe, ShoppingCartItem, ShoppingListItem
+
+
+def get_recipe_amounts(recipe_ids: Iterable[int], sign: int = 1) -> Dict[int, int]:
+    """Sum the ingredient amounts of the given recipes, multiplied by `sign`."""
+    return {
+        row['ingredient_id']: row['total'] * sign
+        for row in IngredientRecipe.objects.filter(recipe_id__in=list(recipe_ids))
+        .values('ingredient_id')
+        .annotate(total=Sum('amount'))
+    }
+
+
+def get_cart_user_ids(recipe: Recipe) -> list:
+    """Return the ids of the users who have the recipe in their cart."""
+    return list(
+        ShoppingCartItem.objects.filter(recipe_id=recipe.id)
+        .values_list('user_id', flat=True)
+    )
+
+
+def change_shopping_lists(user_ids: Iterable[int], delta: Dict[int, int]):
+    """Add per-ingredient amount changes to the shopping lists of the given users.
+
+    Missing rows are inserted with `ignore_conflicts`, every amount is moved by
+    one `UPDATE ... SET amount = amount + CASE ...` and rows that drop to zero
+    are deleted, so the cost does not depend on the number of users or rows.
+    """
+    user_ids = list(user_ids)
+    delta = {ingredient_id: change for ingredient_id, change in delta.items() if change}
+    if not user_ids or not delta:
+        return
+    ShoppingListItem.objects.bulk_create(
+        [
+            ShoppingListItem(user_id=user_id, ingredient_id=ingredient_id, amount=0)
+            for user_id in user_ids
+            for ingredient_id, change in delta.items()
+            if change > 0
+        ],
+        ignore_conflicts=True,
+    )
+    rows = ShoppingListItem.objects.filter(user_id__in=user_ids, ingredient_id__in=list(delta))
+    rows.update(amount=Greatest(
+        F('amount') + Case(
+            *(When(ingredient_id=ingredient_id, then=Value(change))
+              for ingredient_id, change in delta.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        0,
+    ))
+    if any(change < 0 for change in delta.values()):
+        rows.filter(amount=0).delete()
+
+
+def compute_shopping_lists(user_ids: Iterable[int] = None) -> Dict[tuple, int]:
+    """Aggregate the shopping lists from the carts, keyed by `(user_id, ingredient_id)`."""
+    queryset = IngredientRecipe.objects.filter(recipe__in_cart__isnull=False)
+    if user_ids is not None:
+        queryset = queryset.filter(recipe__in_cart__in=list(user_ids))
+    return {
+        (row['recipe__in_cart'], row['ingredient_id']): row['total']
+        for row in queryset.values('recipe__in_cart', 'ingredient_id')
+        .annotate(total=Sum('amount'))
+        .filter(total__gt=0)
+        .order_by()
+    }
+
+
+def find_shopping_list_mismatches() -> int:
+    """Count the stored shopping list rows that differ from the carts."""
+    expected = compute_shopping_lists()
+    stored = {
+        (row['user_id'], row['ingredient_id']): row['amount']
+        for row in ShoppingListItem.objects.values('user_id', 'ingredient_id', 'amount')
+    }
+    return sum(
+        1 for key in expected.keys() | stored.keys()
+        if expected.get(key) != stored.get(key)
+    )
+
+
+@transaction.atomic
+def rebuild_shopping_lists(user_ids: Iterable[int] = None) -> int:
+    """Recompute the shopping lists of the given users, or of everyone, from their carts."""
+    items = ShoppingListItem.objects.all()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        items = items.filter(user_id__in=user_ids)
+    items.delete()
+    rows = [
+        ShoppingListItem(user_id=user_id, ingredient_id=ingredient_id, amount=amount)
+        for (user_id, ingredient_id), amount in compute_shopping_lists(user_ids).items()
+    ]
+    ShoppingListItem.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
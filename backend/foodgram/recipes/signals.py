@@ -0,0 +1,321 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from enums.recipe_enum import RecipeEnum
+from enums.user_enum import UserEnum
+from recipes.counters import change_counter
+from recipes.feeds import change_feeds, fan_out_recipe
+from recipes.ingredient_index import ingredient_index
+from recipes.models import Favorite, Ingredient, IngredientRecipe, Recipe, ShoppingCartItem, Tag
+from recipes.recipe_index import recipe_index
+from recipes.scores import change_scores, get_withdrawn_boosts
+from recipes.search import delete_from_search_index, update_search_index
+from recipes.shopping_lists import change_shopping_lists, get_cart_user_ids, get_recipe_amounts
+from recipes.tag_masks import change_tags_mask, get_free_bitmask, get_tags_bitmask
+from users.models import Subscription, User
+
+
+def update_relation_counter(field: str, related_name: str, instance,
+                            action: str, reverse: bool, pk_set: set):
+    """Keep a recipe counter in sync with a recipe-user m2m relation.
+
+    Forward changes (`recipe.favorite.add(user)`) touch the counter of one recipe,
+    reverse changes (`user.favorite.add(recipe)`) touch one counter per recipe.
+    """
+    if action == 'pre_clear' and reverse:
+        instance._cleared_recipe_ids = list(
+            getattr(instance, related_name).values_list('id', flat=True)
+        )
+    elif action == 'post_clear' and reverse:
+        change_counter(Recipe, field, instance._cleared_recipe_ids, -1)
+    elif action == 'post_clear':
+        Recipe.objects.filter(id=instance.id).update(**{field: 0})
+    elif action in ('post_add', 'post_remove'):
+        delta = 1 if action == 'post_add' else -1
+        if reverse:
+            change_counter(Recipe, field, pk_set, delta)
+        else:
+            change_counter(Recipe, field, [instance.id], delta * len(pk_set))
+
+
+@receiver(m2m_changed, sender=Favorite)
+def update_favorites_count(sender, instance, action, reverse, pk_set, **kwargs):
+    update_relation_counter(
+        RecipeEnum.FAVORITES_COUNT_FIELD.value, RecipeEnum.FAVORITES_RELATED_NAME.value,
+        instance, action, reverse, pk_set,
+    )
+
+
+@receiver(m2m_changed, sender=ShoppingCartItem)
+def update_cart_count(sender, instance, action, reverse, pk_set, **kwargs):
+    update_relation_counter(
+        RecipeEnum.CART_COUNT_FIELD.value, RecipeEnum.IN_CARD_RELATED_NAME.value,
+        instance, action, reverse, pk_set,
+    )
+
+
+@receiver(m2m_changed, sender=Favorite)
+@receiver(m2m_changed, sender=ShoppingCartItem)
+def update_recipe_scores(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh the popularity of recipes after their counters move, and their trending score.
+
+    Additions boost the trending score, removals take back what their addition
+    still adds to it. Runs after the counter receivers above, so reverse clears
+    reuse the recipe ids they remembered and the counters already hold the new numbers.
+    """
+    other = 'recipe_id' if reverse else 'user_id'
+    if action in ('pre_remove', 'pre_clear'):
+        rows = sender.objects.filter(**{'user_id' if reverse else 'recipe_id': instance.id})
+        if action == 'pre_remove':
+            rows = rows.filter(**{f'{other}__in': pk_set})
+        instance._removed_score_rows = list(rows.values_list(other, 'recipe_id', 'created_at'))
+        return
+    if action == 'post_clear':
+        recipe_ids = instance._cleared_recipe_ids if reverse else [instance.id]
+    elif action in ('post_add', 'post_remove'):
+        recipe_ids = pk_set if reverse else [instance.id]
+    else:
+        return
+    weight = (RecipeEnum.FAVORITE_SCORE_WEIGHT.value if sender is Favorite
+              else RecipeEnum.CART_SCORE_WEIGHT.value)
+    if action == 'post_add':
+        change_scores(recipe_ids, weight if reverse else weight * len(pk_set))
+        return
+    # The bulk endpoint may delete fewer rows than it announced in pre_remove.
+    removed = [
+        (recipe_id, created_at) for pk, recipe_id, created_at in instance._removed_score_rows
+        if action == 'post_clear' or pk in pk_set
+    ]
+    change_scores(recipe_ids, withdrawn=get_withdrawn_boosts(removed, weight))
+
+
+@receiver(m2m_changed, sender=ShoppingCartItem)
+def update_shopping_lists(sender, instance, action, reverse, pk_set, **kwargs):
+    """Add or subtract the ingredients of recipes entering or leaving a cart.
+
+    Forward changes (`recipe.in_cart.add(user)`) move one recipe for many users,
+    reverse changes (`user.cart.add(recipe)`) move many recipes for one user.
+    """
+    through = ShoppingCartItem.objects
+    if action == 'pre_remove':
+        side = 'recipe_id' if not reverse else 'user_id'
+        other = 'user_id' if not reverse else 'recipe_id'
+        instance._removed_cart_ids = set(
+            through.filter(**{side: instance.id, f'{other}__in': pk_set})
+            .values_list(other, flat=True)
+        )
+        return
+    if action == 'pre_clear':
+        instance._removed_cart_ids = set(
+            through.filter(user_id=instance.id).values_list('recipe_id', flat=True)
+            if reverse else get_cart_user_ids(instance)
+        )
+        return
+    if action == 'post_add':
+        ids, sign = pk_set, 1
+    elif action == 'post_remove':
+        # The bulk endpoint reports fewer removed rows than it announced in pre_remove
+        # when a concurrent request removed some of them first.
+        ids, sign = instance._removed_cart_ids & set(pk_set), -1
+    elif action == 'post_clear':
+        ids, sign = instance._removed_cart_ids, -1
+    else:
+        return
+    if reverse:
+        change_shopping_lists([instance.id], get_recipe_amounts(ids, sign))
+    else:
+        change_shopping_lists(ids, get_recipe_amounts([instance.id], sign))
+
+
+@receiver(pre_delete, sender=Recipe)
+def remove_deleted_recipe_from_shopping_lists(sender, instance, **kwargs):
+    """Subtract a deleted recipe from the carts, whose rows are removed without m2m signals."""
+    change_shopping_lists(get_cart_user_ids(instance), get_recipe_amounts([instance.id], -1))
+
+
+@receiver(pre_delete, sender=User)
+def remove_deleted_user_from_recipe_scores(sender, instance, **kwargs):
+    """Take a deleted user's favorites and cart entries out of the recipe counters and scores.
+
+    Their rows are removed by the cascade, which sends no m2m signals.
+    """
+    for through, field, weight in (
+        (Favorite, RecipeEnum.FAVORITES_COUNT_FIELD.value, RecipeEnum.FAVORITE_SCORE_WEIGHT.value),
+        (ShoppingCartItem, RecipeEnum.CART_COUNT_FIELD.value, RecipeEnum.CART_SCORE_WEIGHT.value),
+    ):
+        rows = list(through.objects.filter(user_id=instance.id).values_list('recipe_id', 'created_at'))
+        recipe_ids = [recipe_id for recipe_id, _ in rows]
+        change_counter(Recipe, field, recipe_ids, -1)
+        change_scores(recipe_ids, withdrawn=get_withdrawn_boosts(rows, weight))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def update_tags_mask(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep `Recipe.tags_mask` and the recipe index in sync with the recipe tags.
+
+    Forward changes (`recipe.tags.add(tag)`) touch one recipe,
+    reverse changes (`tag.recipes.add(recipe)`) touch one bit of many recipes.
+    """
+    if action == 'pre_clear' and reverse:
+        instance._cleared_recipe_ids = list(
+            Recipe.tags.through.objects.filter(tag_id=instance.id)
+            .values_list('recipe_id', flat=True)
+        )
+    elif action == 'post_clear' and reverse:
+        change_tags_mask(instance._cleared_recipe_ids, instance.bitmask, add=False)
+        recipe_index.mark_changed(instance._cleared_recipe_ids)
+    elif action == 'post_clear':
+        Recipe.objects.filter(id=instance.id).update(
+            **{RecipeEnum.TAGS_MASK_FIELD.value: 0}
+        )
+        recipe_index.mark_changed([instance.id])
+    elif action in ('post_add', 'post_remove'):
+        add = action == 'post_add'
+        if reverse:
+            change_tags_mask(pk_set, instance.bitmask, add)
+            recipe_index.mark_changed(pk_set)
+        else:
+            change_tags_mask([instance.id], get_tags_bitmask(pk_set), add)
+            recipe_index.mark_changed([instance.id])
+
+
+@receiver(pre_save, sender=Tag)
+def assign_tag_bitmask(sender, instance, **kwargs):
+    """Give a new tag the lowest bit no other tag holds."""
+    if instance.bitmask is None:
+        instance.bitmask = get_free_bitmask()
+
+
+@receiver(pre_delete, sender=Tag)
+def clear_deleted_tag_bit(sender, instance, **kwargs):
+    """Drop the bit of a deleted tag, whose m2m rows go without signals, before it is reused."""
+    recipe_ids = list(
+        Recipe.tags.through.objects.filter(tag_id=instance.id).values_list('recipe_id', flat=True)
+    )
+    change_tags_mask(recipe_ids, instance.bitmask, add=False)
+    recipe_index.mark_changed(recipe_ids)
+
+
+@receiver(pre_save, sender=Recipe)
+def remember_recipe_author(sender, instance, **kwargs):
+    """Store the author a recipe had before saving, to move its recipe count."""
+    instance._previous_author_id = None
+    if instance.id is not None:
+        instance._previous_author_id = (
+            Recipe.objects.filter(id=instance.id)
+            .values_list('author_id', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipes_count_on_save(sender, instance, created, **kwargs):
+    previous_author_id = getattr(instance, '_previous_author_id', None)
+    if not created and previous_author_id == instance.author_id:
+        return
+    field = UserEnum.RECIPES_COUNT_FIELD.value
+    if previous_author_id is not None:
+        change_counter(User, field, [previous_author_id], -1)
+    change_counter(User, field, [instance.author_id], 1)
+
+
+@receiver(post_save, sender=Recipe)
+def update_materialized_feeds_on_save(sender, instance, created, **kwargs):
+    """Push a new recipe, or one moved to another author, into the materialized feeds."""
+    if created or getattr(instance, '_previous_author_id', None) != instance.author_id:
+        fan_out_recipe(instance)
+
+
+@receiver(m2m_changed, sender=Subscription)
+def update_materialized_feeds(sender, instance, action, reverse, pk_set, **kwargs):
+    """Add or remove the recipes of followed or unfollowed authors in materialized feeds.
+
+    Forward changes (`user.subscribe.add(author)`) touch the feed of one user,
+    reverse changes (`author.subscribers.add(user)`) touch one author in many feeds.
+    """
+    if action == 'pre_clear':
+        side, other = ('author_id', 'user_id') if reverse else ('user_id', 'author_id')
+        instance._cleared_subscription_ids = list(
+            Subscription.objects.filter(**{side: instance.id}).values_list(other, flat=True)
+        )
+        return
+    if action in ('post_add', 'post_remove'):
+        ids = pk_set
+    elif action == 'post_clear':
+        ids = instance._cleared_subscription_ids
+    else:
+        return
+    if reverse:
+        change_feeds(ids, [instance.id], action == 'post_add')
+    else:
+        change_feeds([instance.id], ids, action == 'post_add')
+
+
+@receiver(post_delete, sender=Recipe)
+def update_recipes_count_on_delete(sender, instance, **kwargs):
+    change_counter(User, UserEnum.RECIPES_COUNT_FIELD.value, [instance.author_id], -1)
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_ingredient_index(sender, **kwargs):
+    transaction.on_commit(ingredient_index.invalidate)
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipe_search_index(sender, instance, **kwargs):
+    update_search_index([instance.id])
+
+
+@receiver(post_delete, sender=Recipe)
+def delete_recipe_search_index(sender, instance, **kwargs):
+    delete_from_search_index(instance.id)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def update_recipe_index(sender, instance, **kwargs):
+    """Refresh the cooking time of a saved recipe, or drop a deleted one, in the recipe index."""
+    recipe_index.mark_changed([instance.id])
+
+
+@receiver(post_save, sender=IngredientRecipe)
+def update_recipe_index_ingredients(sender, instance, created, **kwargs):
+    """Refresh the recipe index after a single ingredient row is added outside of bulk syncs."""
+    if created:
+        recipe_index.mark_changed([instance.recipe_id])
+
+
+@receiver(post_save, sender=IngredientRecipe)
+def update_ingredient_recipe_search_index(sender, instance, **kwargs):
+    """Reindex a recipe after a single ingredient row is saved outside of bulk syncs.
+
+    Deletions are reindexed by sync_recipe_ingredients, so the DELETE of dropped
+    rows stays a single query without per-row signals.
+    """
+    update_search_index([instance.recipe_id])
+
+
+@receiver(post_save, sender=Ingredient)
+def update_ingredient_search_index(sender, instance, created, **kwargs):
+    """Reindex the recipes using an ingredient after it is renamed."""
+    if not created:
+        update_search_index(
+            IngredientRecipe.objects.filter(ingredient=instance)
+            .values_list('recipe_id', flat=True)
+        )
+
+
+@receiver(pre_delete, sender=Ingredient)
+def remember_ingredient_recipes(sender, instance, **kwargs):
+    instance._recipe_ids = list(
+        IngredientRecipe.objects.filter(ingredient=instance)
+        .values_list('recipe_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Ingredient)
+def update_deleted_ingredient_search_index(sender, instance, **kwargs):
+    update_search_index(getattr(instance, '_recipe_ids', []))
+    recipe_index.mark_changed(getattr(instance, '_recipe_ids', []))
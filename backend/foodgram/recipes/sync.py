@@ -0,0 +1,69 @@
+from typing import Dict, Iterable, List
+
+from recipes.models import IngredientRecipe, Recipe, Tag
+from recipes.recipe_index import recipe_index
+from recipes.search import update_search_index
+from recipes.shopping_lists import change_shopping_lists, get_cart_user_ids
+
+
+def sync_recipe_tags(recipe: Recipe, tags: Iterable[Tag]):
+    """Bring the recipe tags to the given set, touching only the changed rows."""
+    new_ids = {tag.id for tag in tags}
+    current_ids = set(recipe.tags.values_list('id', flat=True))
+    if current_ids - new_ids:
+        recipe.tags.remove(*(current_ids - new_ids))
+    if new_ids - current_ids:
+        recipe.tags.add(*(new_ids - current_ids))
+
+
+def sync_recipe_ingredients(recipe: Recipe, ingredients_data: List[dict],
+                            created: bool = False) -> Dict[int, int]:
+    """Bring the recipe ingredients to the submitted list with bulk queries.
+
+    Existing rows are compared with the submission: new ingredients are added
+    with one `bulk_create`, changed amounts are saved with one `bulk_update`
+    and dropped ingredients are removed with one DELETE. Unchanged rows are not
+    touched at all. The shopping lists of users with the recipe in their cart
+    are moved by the same amounts.
+
+    Returns:
+        dict: The amount change of every affected ingredient id.
+    """
+    amounts = {
+        data['ingredient'].id: data['amount'] for data in ingredients_data
+    }
+    existing = {} if created else {
+        row.ingredient_id: row
+        for row in IngredientRecipe.objects.filter(recipe=recipe)
+    }
+    to_create = [
+        IngredientRecipe(recipe=recipe, ingredient_id=ingredient_id, amount=amount)
+        for ingredient_id, amount in amounts.items()
+        if ingredient_id not in existing
+    ]
+    to_update = []
+    to_delete = []
+    delta = {row.ingredient_id: row.amount for row in to_create}
+    for ingredient_id, row in existing.items():
+        if ingredient_id not in amounts:
+            to_delete.append(ingredient_id)
+            delta[ingredient_id] = -row.amount
+        elif amounts[ingredient_id] != row.amount:
+            delta[ingredient_id] = amounts[ingredient_id] - row.amount
+            row.amount = amounts[ingredient_id]
+            to_update.append(row)
+    if to_create:
+        IngredientRecipe.objects.bulk_create(to_create)
+    if to_update:
+        IngredientRecipe.objects.bulk_update(to_update, ['amount'])
+    if to_delete:
+        IngredientRecipe.objects.filter(
+            recipe=recipe, ingredient_id__in=to_delete
+        ).delete()
+    if delta:
+        update_search_index([recipe.id])
+    if to_create or to_delete:
+        recipe_index.mark_changed([recipe.id])
+    if delta and not created:
+        change_shopping_lists(get_cart_user_ids(recipe), delta)
+    return delta
@@ -0,0 +1,40 @@
+from typing import Iterable
+
+from django.db.models import F
+
+from enums.recipe_enum import RecipeEnum
+from enums.tag_enum import TagEnum
+from recipes.models import Recipe, Tag
+
+
+def get_free_bitmask() -> int:
+    """Return the lowest single-bit mask no tag uses yet.
+
+    Raises:
+        ValueError: If every bit of the mask is taken.
+    """
+    used = set(Tag.objects.exclude(bitmask=None).values_list('bitmask', flat=True))
+    for bit in range(TagEnum.MAX_TAGS.value):
+        if 1 << bit not in used:
+            return 1 << bit
+    raise ValueError(TagEnum.NO_FREE_BIT_MESSAGE.value)
+
+
+def get_tags_bitmask(tag_ids: Iterable[int]) -> int:
+    """Combine the bits of the given tags into one mask."""
+    mask = 0
+    for bitmask in Tag.objects.filter(id__in=list(tag_ids)).values_list('bitmask', flat=True):
+        mask |= bitmask or 0
+    return mask
+
+
+def change_tags_mask(recipe_ids: Iterable[int], mask: int, add: bool):
+    """Set or clear the bits of `mask` in the tag masks of the given recipes with one UPDATE."""
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids or not mask:
+        return
+    field = F(RecipeEnum.TAGS_MASK_FIELD.value)
+    value = field.bitor(mask) if add else field - field.bitand(mask)
+    Recipe.objects.filter(id__in=recipe_ids).update(
+        **{RecipeEnum.TAGS_MASK_FIELD.value: value}
+    )
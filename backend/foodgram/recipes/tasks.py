@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from enums.feed_enum import FeedEnum
+from enums.recipe_enum import RecipeEnum
+from jobs.queue import task
+from recipes.counters import rebuild_counters
+from recipes.feeds import sync_materialized_feeds
+from recipes.images import delete_unreferenced_upload, get_optimized_name, store_image
+from recipes.models import Recipe
+from recipes.scores import decay_trending_scores
+
+
+@task(RecipeEnum.OPTIMIZE_IMAGE_TASK.value)
+def optimize_uploaded_image(name: str):
+    """Replace a staged upload with its optimized copy in every recipe using it.
+
+    The upload is deleted once the replacement commits, and only if no recipe
+    saved meanwhile points at it; that recipe's own job replaces it later.
+    """
+    optimized_name = get_optimized_name(name)
+    if not default_storage.exists(optimized_name):
+        if not default_storage.exists(name):
+            return
+        with default_storage.open(name, 'rb') as file:
+            optimized_name = store_image(file.read())
+    for recipe in Recipe.objects.filter(image=name):
+        recipe.image = optimized_name
+        recipe.save(update_fields=['image'])
+    transaction.on_commit(lambda: delete_unreferenced_upload(name))
+
+
+@task(RecipeEnum.REBUILD_COUNTERS_TASK.value)
+def rebuild_counters_task():
+    """Recompute the denormalized counters off the request path."""
+    rebuild_counters()
+
+
+@task(FeedEnum.MATERIALIZE_TASK.value)
+def materialize_feeds_task():
+    """Materialize the feeds of heavy followers and drop the feeds of the rest."""
+    sync_materialized_feeds()
+
+
+@task(RecipeEnum.DECAY_TRENDING_TASK.value, every=settings.TRENDING_DECAY_INTERVAL_HOURS * 3600)
+def decay_trending_scores_task(hours: float = None):
+    """Decay the trending scores of recipes off the request path, every TRENDING_DECAY_INTERVAL_HOURS."""
+    decay_trending_scores(hours)
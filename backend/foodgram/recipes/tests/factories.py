@@ -0,0 +1,65 @@
+from rest_framework.test import APIClient
+
+from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag
+from users.models import User
+
+TAG_SLUGS = ('breakfast', 'lunch', 'dinner')
+INGREDIENTS = (
+    ('абрикос', 'г'),
+    ('абрикосовое варенье', 'г'),
+    ('молоко', 'мл'),
+    ('Milk chocolate', 'g'),
+    ('соль', 'г'),
+    ('сахар', 'г'),
+)
+
+
+class DatasetMixin:
+    """Create four users, three tags, six ingredients and twelve recipes.
+
+    Recipe `i` is written by user `i % 3`, has tag `i % 3` and three
+    ingredients starting at ingredient `i % 6`; the fourth user has no recipes.
+    """
+
+    recipes_number = 12
+
+    @classmethod
+    def create_dataset(cls):
+        cls.users = [
+            User.objects.create_user(
+                username=f'user{number}', email=f'user{number}@foodgram.io',
+                first_name='First', last_name='Last', password='Pa55word!',
+            )
+            for number in range(4)
+        ]
+        cls.reader = cls.users[3]
+        cls.tags = [Tag.objects.create(name=slug, color='#ffffff', slug=slug) for slug in TAG_SLUGS]
+        cls.ingredients = [
+            Ingredient.objects.create(name=name, measurement_unit=unit, count=0)
+            for name, unit in INGREDIENTS
+        ]
+        cls.recipes = []
+        for number in range(cls.recipes_number):
+            recipe = Recipe.objects.create(
+                author=cls.users[number % 3], name=f'recipe {number}', image='recipes/image.jpg',
+                text=f'text {number}', cooking_time=10 + number,
+            )
+            recipe.tags.add(cls.tags[number % 3])
+            for offset in range(3):
+                IngredientRecipe.objects.create(
+                    recipe=recipe,
+                    ingredient=cls.ingredients[(number + offset) % len(cls.ingredients)],
+                    amount=offset + 1,
+                )
+            cls.recipes.append(recipe)
+
+    @staticmethod
+    def get_client(user=None) -> APIClient:
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client
+
+    @staticmethod
+    def newest_first(recipes):
+        return sorted(recipes, key=lambda recipe: (recipe.pub_date, recipe.id), reverse=True)
@@ -0,0 +1,75 @@
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from recipes.counters import find_counter_mismatches
+from recipes.models import Recipe
+from recipes.tests.factories import DatasetMixin
+from users.models import User
+
+
+class CounterTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def assert_consistent(self):
+        self.assertFalse(any(find_counter_mismatches().values()), find_counter_mismatches())
+
+    def get_recipe(self, number) -> Recipe:
+        return Recipe.objects.get(id=self.recipes[number].id)
+
+    def test_favorites_and_cart_from_both_sides(self):
+        first, second = self.users[:2]
+        self.recipes[0].favorite.add(first, second)
+        second.favorite.add(self.recipes[1])
+        first.cart.add(self.recipes[0], self.recipes[1])
+        recipe = self.get_recipe(0)
+        self.assertEqual((recipe.favorites_count, recipe.cart_count, recipe.popularity), (2, 1, 5))
+        self.assert_consistent()
+        self.recipes[0].favorite.remove(first)
+        first.cart.clear()
+        recipe = self.get_recipe(0)
+        self.assertEqual((recipe.favorites_count, recipe.cart_count, recipe.popularity), (1, 0, 2))
+        self.assert_consistent()
+
+    def test_deleting_a_user_releases_their_relations(self):
+        self.reader.favorite.add(self.recipes[0], self.recipes[1])
+        self.reader.cart.add(self.recipes[0])
+        self.users[0].favorite.add(self.recipes[0])
+        User.objects.get(id=self.reader.id).delete()
+        recipe = self.get_recipe(0)
+        self.assertEqual((recipe.favorites_count, recipe.cart_count, recipe.popularity), (1, 0, 2))
+        self.assertAlmostEqual(recipe.trending_score, 2, places=3)
+        self.assertAlmostEqual(self.get_recipe(1).trending_score, 0, places=3)
+        self.assert_consistent()
+
+    def test_favorite_endpoint(self):
+        client = self.get_client(self.reader)
+        url = f'/api/recipes/{self.recipes[0].id}/favorite/'
+        self.assertEqual(client.post(url).status_code, 201)
+        self.assertEqual(client.post(url).status_code, 400)
+        self.assertEqual(self.get_recipe(0).favorites_count, 1)
+        self.assertEqual(client.delete(url).status_code, 204)
+        self.assertEqual(self.get_recipe(0).favorites_count, 0)
+
+    def test_recipes_count(self):
+        author = self.users[0]
+        self.assertEqual(User.objects.get(id=author.id).recipes_count, 4)
+        self.recipes[0].delete()
+        self.assertEqual(User.objects.get(id=author.id).recipes_count, 3)
+        self.assert_consistent()
+
+    def test_rebuild_counters(self):
+        self.recipes[0].favorite.add(self.reader)
+        call_command('rebuild_counters', '--verify', stdout=io.StringIO())
+        User.objects.update(recipes_count=0)
+        Recipe.objects.update(favorites_count=0, popularity=0)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_counters', '--verify', stdout=io.StringIO())
+        call_command('rebuild_counters', stdout=io.StringIO())
+        self.assert_consistent()
+        self.assertEqual(self.get_recipe(0).popularity, 2)
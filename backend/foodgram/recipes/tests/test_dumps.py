@@ -0,0 +1,70 @@
+import io
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from recipes.counters import find_counter_mismatches
+from recipes.dumps import get_levels
+from recipes.models import Ingredient, Recipe, ShoppingListItem
+from recipes.shopping_lists import find_shopping_list_mismatches
+from recipes.tests.factories import DatasetMixin
+
+
+class DumpTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+        first, second, third = cls.users[:3]
+        cls.recipes[0].favorite.add(first, second)
+        third.cart.add(cls.recipes[3], cls.recipes[4])
+        first.subscribe.add(second, third)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.models = [model for level in get_levels() for model in level]
+
+    def snapshot(self) -> dict:
+        return {
+            model._meta.label: sorted(
+                tuple(getattr(obj, field.attname) for field in model._meta.concrete_fields
+                      if field.name != 'search_vector')
+                for obj in model._base_manager.all()
+            )
+            for model in self.models
+        }
+
+    def test_round_trip(self):
+        before = self.snapshot()
+        call_command('export_data', self.directory, '--chunk-size', '5', stdout=io.StringIO())
+        for model in reversed(self.models):
+            model._base_manager.all().delete()
+        call_command('import_data', self.directory, '--batch-size', '7', stdout=io.StringIO())
+        self.assertEqual(self.snapshot(), before)
+        self.assertFalse(any(find_counter_mismatches().values()))
+        self.assertEqual(find_shopping_list_mismatches(), 0)
+        self.assertTrue(ShoppingListItem.objects.filter(user=self.users[2]).exists())
+        new = Recipe.objects.create(
+            author=self.users[0], name='new', image='recipes/image.jpg', text='text', cooking_time=1,
+        )
+        self.assertGreater(new.id, max(recipe.id for recipe in self.recipes))
+
+    def test_import_over_existing_rows(self):
+        before = self.snapshot()
+        call_command('export_data', self.directory, stdout=io.StringIO())
+        call_command('import_data', self.directory, '--batch-size', '7', stdout=io.StringIO())
+        self.assertEqual(self.snapshot(), before)
+
+    def test_default_batch_size(self):
+        Ingredient.objects.bulk_create(
+            [Ingredient(name=f'ingredient {number}', measurement_unit='g', count=0) for number in range(2500)],
+            batch_size=400,
+        )
+        before = self.snapshot()
+        call_command('export_data', self.directory, stdout=io.StringIO())
+        Ingredient.objects.filter(name__startswith='ingredient ').delete()
+        call_command('import_data', self.directory, stdout=io.StringIO())
+        self.assertEqual(self.snapshot(), before)
@@ -0,0 +1,42 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from recipes.ingredient_index import IngredientPrefixIndex
+from recipes.models import Ingredient
+from recipes.tests.factories import DatasetMixin
+
+
+class IngredientIndexTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def setUp(self):
+        cache.clear()
+        self.index = IngredientPrefixIndex()
+
+    def test_ranking(self):
+        names = [ingredient.name for ingredient in self.index.search('абрикос')]
+        self.assertEqual(names, ['абрикос', 'абрикосовое варенье'])
+        self.assertEqual([ingredient.name for ingredient in self.index.search('CHOC')], ['Milk chocolate'])
+
+    def test_rebuild_during_search(self):
+        self.index.ensure_fresh()
+        prefix_range = IngredientPrefixIndex._prefix_range
+
+        def rebuild_once(keys, prefix):
+            if Ingredient.objects.filter(name='абрикос').exists():
+                Ingredient.objects.filter(name='абрикос').delete()
+                self.index.build(self.index.get_version() + 1)
+            return prefix_range(keys, prefix)
+
+        with mock.patch.object(IngredientPrefixIndex, '_prefix_range', side_effect=rebuild_once):
+            with mock.patch.object(IngredientPrefixIndex, 'ensure_fresh'):
+                names = [ingredient.name for ingredient in self.index.search('абрикос')]
+        self.assertEqual(names, ['абрикос', 'абрикосовое варенье'])
+        self.assertEqual(
+            [ingredient.name for ingredient in self.index.search('абрикос')], ['абрикосовое варенье'],
+        )
@@ -0,0 +1,137 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from recipes.counters import find_counter_mismatches
+from recipes.loaders import iter_json_array
+from recipes.models import DataSource, Ingredient, IngredientRecipe, Recipe, Tag
+from recipes.shopping_lists import find_shopping_list_mismatches
+from recipes.tests.factories import DatasetMixin
+from users.models import User
+
+
+class JSONArrayTests(TestCase):
+
+    def test_items_across_read_chunks(self):
+        items = [{'id': number, 'text': 'a, ] [ "b"' * (number % 7), 'nested': [1, {'c': None}]}
+                 for number in range(3000)]
+        text = ' [\n' + ',\n '.join(json.dumps(item) for item in items) + '\n] '
+        self.assertEqual(list(iter_json_array(io.StringIO(text), 'items.json')), items)
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(io.StringIO('  []'), 'empty.json')), [])
+
+    def test_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"model": "recipes.tag"}'), 'object.json'))
+
+
+class LoadDataTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+        cls.recipes[0].favorite.add(cls.reader)
+        cls.recipes[1].in_cart.add(cls.reader)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def dump_fixture(self) -> str:
+        objects = [
+            *User.objects.all(), *Tag.objects.all(), *Ingredient.objects.all(),
+            *Recipe.objects.all(), *IngredientRecipe.objects.all(),
+        ]
+        self.fixture_rows = len(objects)
+        return self.write('fixture.json', serializers.serialize('json', objects))
+
+    def load(self, *paths) -> str:
+        output = io.StringIO()
+        call_command('load_data', *paths, stdout=output)
+        return output.getvalue()
+
+    def test_fixture_round_trip(self):
+        fixture = self.dump_fixture()
+        # The JSON serializer keeps milliseconds only.
+        recipes = {
+            recipe.id: (recipe.name, recipe.pub_date.replace(microsecond=recipe.pub_date.microsecond // 1000 * 1000),
+                        recipe.author_id)
+            for recipe in self.recipes
+        }
+        for model in (Recipe, Ingredient, Tag, User):
+            model.objects.all().delete()
+        self.load(fixture)
+        self.assertEqual(
+            {recipe.id: (recipe.name, recipe.pub_date, recipe.author_id) for recipe in Recipe.objects.all()},
+            recipes,
+        )
+        self.assertEqual(IngredientRecipe.objects.count(), len(self.recipes) * 3)
+        self.assertTrue(all(tag.bitmask for tag in Tag.objects.all()))
+        self.assertFalse(any(find_counter_mismatches().values()))
+        self.assertEqual(find_shopping_list_mismatches(), 0)
+        new = Recipe.objects.create(
+            author=User.objects.first(), name='new', image='recipes/image.jpg', text='text', cooking_time=1,
+        )
+        self.assertGreater(new.id, max(recipes))
+
+    def test_unchanged_sources_are_skipped(self):
+        fixture = self.dump_fixture()
+        self.load(fixture)
+        self.assertEqual(DataSource.objects.get().rows, self.fixture_rows)
+        self.assertIn('skipped', self.load(fixture))
+        output = io.StringIO()
+        call_command('load_data', fixture, '--force', stdout=output)
+        self.assertNotIn('skipped', output.getvalue())
+
+    def test_ingredient_catalogue(self):
+        existing = self.ingredients[0]
+        catalogue = self.write(
+            'ingredients.csv',
+            f'name,measurement_unit\nзвёздочка,шт\n{existing.name},{existing.measurement_unit}\n',
+        )
+        count = Ingredient.objects.count()
+        self.load(catalogue)
+        self.assertEqual(Ingredient.objects.count(), count + 1)
+        self.assertTrue(Ingredient.objects.filter(name='звёздочка', measurement_unit='шт').exists())
+
+    def test_catalogue_updates_existing_ingredients(self):
+        existing = self.ingredients[0]
+        catalogue = self.write(
+            'ingredients.json',
+            json.dumps([{'name': existing.name, 'measurement_unit': existing.measurement_unit, 'count': 7}]),
+        )
+        self.load(catalogue)
+        self.assertEqual(Ingredient.objects.get(id=existing.id).count, 7)
+
+    def test_large_batches(self):
+        rows = ''.join(f'ingredient {number},g\n' for number in range(2500))
+        catalogue = self.write('ingredients.csv', 'name,measurement_unit\n' + rows)
+        self.load(catalogue)
+        self.assertEqual(Ingredient.objects.filter(name__startswith='ingredient ').count(), 2500)
+
+    def test_failed_source_records_no_checksum(self):
+        fixture = self.dump_fixture()
+        invalid = self.write('ingredients.csv', 'name\nsalt\n')
+        with self.assertRaises(CommandError):
+            self.load(fixture, invalid)
+        self.assertFalse(DataSource.objects.exists())
+        self.assertNotIn('skipped', self.load(fixture))
+
+    def test_invalid_catalogue(self):
+        catalogue = self.write('ingredients.csv', 'name\nsalt\n')
+        with self.assertRaises(CommandError):
+            self.load(catalogue)
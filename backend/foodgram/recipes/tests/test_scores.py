@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+
+from enums.job_enum import JobEnum
+from enums.recipe_enum import RecipeEnum
+from jobs.models import Job
+from jobs.queue import schedule_periodic_jobs
+from recipes.models import Favorite, Recipe
+from recipes.scores import decay_trending_scores
+from recipes.tests.factories import DatasetMixin
+
+
+class TrendingScoreTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def get_trending(self, number) -> float:
+        return Recipe.objects.get(id=self.recipes[number].id).trending_score
+
+    def test_removal_takes_back_the_boost(self):
+        first, second = self.users[:2]
+        first.favorite.add(self.recipes[0])
+        self.recipes[0].in_cart.add(first, second)
+        self.assertEqual(self.get_trending(0), 4)
+        first.favorite.remove(self.recipes[0])
+        self.recipes[0].in_cart.remove(second)
+        self.assertAlmostEqual(self.get_trending(0), 1, places=3)
+        first.cart.clear()
+        self.assertAlmostEqual(self.get_trending(0), 0, places=3)
+
+    def test_repeated_toggles_do_not_accumulate(self):
+        for _ in range(5):
+            self.reader.favorite.add(self.recipes[1])
+            self.reader.favorite.remove(self.recipes[1])
+        self.assertAlmostEqual(self.get_trending(1), 0, places=3)
+
+    def test_old_additions_withdraw_their_decayed_boost(self):
+        self.reader.favorite.add(self.recipes[2])
+        Favorite.objects.filter(user=self.reader).update(
+            created_at=timezone.now() - timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS),
+        )
+        decay_trending_scores(settings.TRENDING_HALF_LIFE_HOURS)
+        self.assertAlmostEqual(self.get_trending(2), 1, places=3)
+        self.reader.favorite.remove(self.recipes[2])
+        self.assertAlmostEqual(self.get_trending(2), 0, places=3)
+
+    def test_score_never_goes_negative(self):
+        self.reader.favorite.add(self.recipes[3])
+        Recipe.objects.filter(id=self.recipes[3].id).update(trending_score=0)
+        self.reader.favorite.clear()
+        self.assertEqual(self.get_trending(3), 0)
+
+
+class DecayScheduleTests(TestCase):
+
+    def test_decay_is_queued_once(self):
+        self.assertGreaterEqual(schedule_periodic_jobs(), 1)
+        self.assertEqual(schedule_periodic_jobs(), 0)
+        job = Job.objects.get(name=RecipeEnum.DECAY_TRENDING_TASK.value)
+        self.assertEqual(job.status, JobEnum.PENDING.value)
+        interval = timedelta(hours=settings.TRENDING_DECAY_INTERVAL_HOURS)
+        self.assertGreater(job.run_after, timezone.now() + interval - timedelta(minutes=1))
@@ -0,0 +1,81 @@
+import io
+import json
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from recipes.models import ShoppingListItem
+from recipes.shopping_lists import find_shopping_list_mismatches
+from recipes.tests.factories import DatasetMixin
+
+
+class ShoppingListTests(DatasetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_dataset()
+
+    def setUp(self):
+        self.client = self.get_client(self.reader)
+
+    def assert_consistent(self):
+        self.assertEqual(find_shopping_list_mismatches(), 0)
+
+    def get_amounts(self, user):
+        return dict(ShoppingListItem.objects.filter(user=user).values_list('ingredient_id', 'amount'))
+
+    def test_cart_changes_from_both_sides(self):
+        other = self.users[2]
+        for recipe in self.recipes[:3]:
+            self.assertEqual(self.client.post(f'/api/recipes/{recipe.id}/shopping_cart/').status_code, 201)
+        self.assert_consistent()
+        # Recipes 0-2 hold ingredients 0-2, 1-3 and 2-4 with amounts 1, 2 and 3.
+        ingredients = self.ingredients
+        self.assertEqual(self.get_amounts(self.reader), {
+            ingredients[0].id: 1, ingredients[1].id: 3, ingredients[2].id: 6,
+            ingredients[3].id: 5, ingredients[4].id: 3,
+        })
+        self.recipes[0].in_cart.add(other)
+        other.cart.add(self.recipes[4], self.recipes[5])
+        other.cart.remove(self.recipes[4], self.recipes[7])
+        self.assert_consistent()
+        self.recipes[1].in_cart.remove(self.reader, other)
+        self.recipes[0].in_cart.clear()
+        self.assert_consistent()
+        other.cart.clear()
+        self.assertFalse(ShoppingListItem.objects.filter(user=other).exists())
+        self.assert_consistent()
+
+    def test_recipe_edit_and_delete(self):
+        recipe = self.recipes[2]
+        self.client.post(f'/api/recipes/{recipe.id}/shopping_cart/')
+        response = self.get_client(recipe.author).patch(
+            f'/api/recipes/{recipe.id}/',
+            {
+                'ingredients': [{'id': self.ingredients[0].id, 'amount': 7}],
+                'tags': [self.tags[0].id], 'name': 'edited', 'text': 'edited', 'cooking_time': 3,
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.get_amounts(self.reader), {self.ingredients[0].id: 7})
+        recipe.delete()
+        self.assertFalse(ShoppingListItem.objects.filter(user=self.reader).exists())
+
+    def test_rebuild(self):
+        self.recipes[3].in_cart.add(self.reader)
+        ShoppingListItem.objects.filter(user=self.reader).update(amount=99)
+        self.assertGreater(find_shopping_list_mismatches(), 0)
+        call_command('rebuild_shopping_lists', stdout=io.StringIO())
+        self.assert_consistent()
+
+    def test_download(self):
+        self.client.post(f'/api/recipes/{self.recipes[0].id}/shopping_cart/')
+        response = self.client.get('/api/recipes/download_shopping_cart/?format=json')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(sum(len(unit['ingredients']) for unit in data['units']), 3)
+        response = self.client.get('/api/recipes/download_shopping_cart/')
+        self.assertIn(self.ingredients[0].name, b''.join(response.streaming_content).decode())
+        self.assertEqual(self.client.get('/api/recipes/download_shopping_cart/?format=xml').status_code, 400)
+        self.assertEqual(self.get_client().get('/api/recipes/download_shopping_cart/').status_code, 401)
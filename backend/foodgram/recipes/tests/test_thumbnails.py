@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from recipes.thumbnails import evict_thumbnails, open_thumbnail
+
+
+class ThumbnailCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings_override = override_settings(THUMBNAIL_ROOT=self.root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write(self, name: str, age: int) -> str:
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as file:
+            file.write(b'x' * 100)
+        os.utime(path, (1000 - age, 1000 - age))
+        return path
+
+    def test_oldest_variants_go_first(self):
+        oldest, old, new = self.write('a.webp', 3), self.write('b.webp', 2), self.write('c.webp', 1)
+        evict_thumbnails(max_bytes=150)
+        self.assertEqual([os.path.exists(path) for path in (oldest, old, new)], [False, False, True])
+
+    def test_renders_in_progress_and_the_current_variant_are_kept(self):
+        current = self.write('a.webp', 3)
+        temporary = self.write('render.tmp', 2)
+        lock = self.write('a.webp.lock', 2)
+        other = self.write('b.webp', 1)
+        evict_thumbnails(max_bytes=0, keep=current)
+        self.assertEqual(
+            [os.path.exists(path) for path in (current, temporary, lock, other)], [True, True, True, False],
+        )
+
+    def test_open_variant_survives_eviction(self):
+        with mock.patch('recipes.thumbnails.render_thumbnail', return_value=b'thumbnail'):
+            file = open_thumbnail('recipes/image.jpg', 'small')
+        with file:
+            evict_thumbnails(max_bytes=0)
+            self.assertEqual(os.listdir(self.root), [])
+            self.assertEqual(file.read(), b'thumbnail')
+        with mock.patch('recipes.thumbnails.render_thumbnail', return_value=b'again') as render:
+            with open_thumbnail('recipes/image.jpg', 'small') as file:
+                self.assertEqual(file.read(), b'again')
+            with open_thumbnail('recipes/image.jpg', 'small') as file:
+                self.assertEqual(file.read(), b'again')
+        self.assertEqual(render.call_count, 1)
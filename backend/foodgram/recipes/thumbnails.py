@@ -0,0 +1,102 @@
+import fcntl
+import hashlib
+import io
+import os
+import tempfile
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from enums.recipe_enum import RecipeEnum
+from recipes.images import IMAGE_EXTENSION, IMAGE_FORMAT
+
+
+def get_thumbnail_path(image_name: str, size: str) -> str:
+    """Return the cache path of a size variant of a stored image."""
+    digest = hashlib.sha1(image_name.encode()).hexdigest()
+    return os.path.join(settings.THUMBNAIL_ROOT, f'{size}-{digest}.{IMAGE_EXTENSION}')
+
+
+def render_thumbnail(image_name: str, width: int) -> bytes:
+    """Downscale a stored image to the given width and encode it."""
+    with default_storage.open(image_name, 'rb') as file:
+        image = Image.open(io.BytesIO(file.read()))
+        image.draft('RGB', (width, width))
+        image = image.convert('RGB')
+    image.thumbnail((width, width * 4), Image.LANCZOS)
+    output = io.BytesIO()
+    image.save(output, IMAGE_FORMAT, quality=RecipeEnum.IMAGE_QUALITY.value)
+    return output.getvalue()
+
+
+def evict_thumbnails(max_bytes: int = None, keep: str = None):
+    """Delete the least recently used variants until the cache fits `max_bytes`.
+
+    Lock files, the temporary files of renders in progress and the `keep` path,
+    the variant just rendered for the current request, are never deleted.
+    """
+    if max_bytes is None:
+        max_bytes = settings.THUMBNAIL_CACHE_MAX_BYTES
+    entries = []
+    total = 0
+    with os.scandir(settings.THUMBNAIL_ROOT) as scan:
+        for entry in scan:
+            if entry.is_file() and not entry.name.endswith(('.lock', '.tmp')):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        try:
+            os.remove(f'{path}.lock')
+        except FileNotFoundError:
+            pass
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def open_thumbnail(image_name: str, size: str) -> BinaryIO:
+    """Open a size variant for reading, generating it on first request.
+
+    Hits refresh the file mtime, which the eviction uses as the LRU order.
+    Generation holds an exclusive file lock per variant, so concurrent requests
+    of every worker wait for one render instead of repeating it. The file is
+    opened before it can be evicted, and stays readable if an eviction in
+    another worker deletes it while it is being served.
+    """
+    path = get_thumbnail_path(image_name, size)
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        pass
+    else:
+        os.utime(file.fileno())
+        return file
+    os.makedirs(settings.THUMBNAIL_ROOT, exist_ok=True)
+    with open(f'{path}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            try:
+                return open(path, 'rb')
+            except FileNotFoundError:
+                pass
+            content = render_thumbnail(image_name, RecipeEnum.THUMBNAIL_SIZES.value[size])
+            handle, temporary = tempfile.mkstemp(dir=settings.THUMBNAIL_ROOT, suffix='.tmp')
+            with os.fdopen(handle, 'wb') as file:
+                file.write(content)
+            file = open(temporary, 'rb')
+            os.replace(temporary, path)
+            evict_thumbnails(keep=path)
+            return file
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:37
+
+from django.conf import settings
+import django.contrib.auth.models
+import django.contrib.auth.password_validation
+import django.contrib.auth.validators
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('username', models.CharField(error_messages={'unique': 'A user with this username already exists.'}, help_text='No more than 150 characters, letters, digits, and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='Username')),
+                ('password', models.CharField(max_length=100, validators=[django.contrib.auth.password_validation.validate_password], verbose_name='Password')),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('bio', models.TextField(blank=True, verbose_name='Biography')),
+                ('role', models.TextField(choices=[('auth_user', 'Authenticated User'), ('admin', 'Administrator')], default='auth_user', verbose_name='User Role')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='First Name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='Last Name')),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.Group', verbose_name='groups')),
+                ('subscribe', models.ManyToManyField(related_name='subscribers', to=settings.AUTH_USER_MODEL, verbose_name='Subscription')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.Permission', verbose_name='user permissions')),
+            ],
+            options={
+                'verbose_name': 'User',
+                'verbose_name_plural': 'Users',
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:37
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_recipes_count(apps, schema_editor):
+    """Count the existing recipes of every user."""
+    User = apps.get_model('users', 'User')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    User.objects.update(recipes_count=Coalesce(Subquery(
+        Recipe.objects.filter(author_id=OuterRef('pk'))
+        .order_by().values('author_id').annotate(total=Count('id')).values('total')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('recipes', '0002_recipe_relations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of recipes'),
+        ),
+        migrations.RunPython(backfill_recipes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    """Move subscriptions onto an explicit through model.
+
+    Subscription keeps the table of the implicit m2m table and maps user and
+    author onto its from_user_id and to_user_id columns, so only the model
+    state is swapped; the database only gains the created_at column, the
+    indexes and the constraint.
+    """
+
+    dependencies = [
+        ('users', '0002_counters'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Subscription',
+                    fields=[
+                        ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('author', models.ForeignKey(db_column='to_user_id', on_delete=django.db.models.deletion.CASCADE, related_name='subscriber_entries', to=settings.AUTH_USER_MODEL, verbose_name='Author')),
+                        ('user', models.ForeignKey(db_column='from_user_id', on_delete=django.db.models.deletion.CASCADE, related_name='subscription_entries', to=settings.AUTH_USER_MODEL, verbose_name='Subscriber')),
+                    ],
+                    options={
+                        'verbose_name': 'Subscription',
+                        'verbose_name_plural': 'Subscriptions',
+                        'db_table': 'users_user_subscribe',
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='user',
+                    name='subscribe',
+                    field=models.ManyToManyField(related_name='subscribers', through='users.Subscription', to=settings.AUTH_USER_MODEL, verbose_name='Subscription'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Subscribed at'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['author', 'user'], name='subscription_author_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['user', '-created_at'], name='subscription_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='subscription',
+            constraint=models.UniqueConstraint(fields=('user', 'author'), name='unique_subscription_user_author'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_explicit_through_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='feed_materialized',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Feed timeline is materialized'),
+        ),
+    ]
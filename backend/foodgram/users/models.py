@@ -53,8 +53,20 @@ class User(AbstractUser):
         verbose_name=UserEnum.SUBSCRIBE_VERBOSE_NAME.value,
         related_name=UserEnum.SUBSCRIBE_RELATED_NAME.value,
         to=UserEnum.SUBSCRIBE_TO.value,
+        through=UserEnum.SUBSCRIBE_THROUGH.value,
+        through_fields=UserEnum.SUBSCRIBE_THROUGH_FIELDS.value,
         symmetrical=False,
     )
+    recipes_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=UserEnum.RECIPES_COUNT_VERBOSE_NAME.value,
+    )
+    feed_materialized = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name=UserEnum.FEED_MATERIALIZED_VERBOSE_NAME.value,
+    )
 
     def __str__(self):
         return f"{self.username}"
@@ -62,3 +74,54 @@ class User(AbstractUser):
     class Meta:
         verbose_name = UserEnum.USER_VERBOSE_NAME.value
         verbose_name_plural = UserEnum.USER_VERBOSE_NAME_PLURAL.value
+
+
+class Subscription(models.Model):
+    """
+    A user following an author.
+
+    The table and columns of the former implicit m2m table are kept, so
+    existing subscriptions stay in place.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_column=UserEnum.SUBSCRIPTION_USER_COLUMN.value,
+        related_name=UserEnum.SUBSCRIPTION_ENTRIES_RELATED_NAME.value,
+        verbose_name=UserEnum.SUBSCRIPTION_USER_VERBOSE_NAME.value,
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_column=UserEnum.SUBSCRIPTION_AUTHOR_COLUMN.value,
+        related_name=UserEnum.SUBSCRIBER_ENTRIES_RELATED_NAME.value,
+        verbose_name=UserEnum.SUBSCRIPTION_AUTHOR_VERBOSE_NAME.value,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=UserEnum.SUBSCRIPTION_CREATED_AT_VERBOSE_NAME.value,
+    )
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.author_id}"
+
+    class Meta:
+        db_table = UserEnum.SUBSCRIPTION_DB_TABLE.value
+        verbose_name = UserEnum.SUBSCRIBE_VERBOSE_NAME.value
+        verbose_name_plural = UserEnum.SUBSCRIPTION_VERBOSE_NAME_PLURAL.value
+        constraints = [
+            models.UniqueConstraint(
+                fields=UserEnum.SUBSCRIPTION_UNIQUE_FIELDS.value,
+                name=UserEnum.SUBSCRIPTION_UNIQUE_NAME.value,
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=UserEnum.SUBSCRIPTION_AUTHOR_INDEX_FIELDS.value,
+                name=UserEnum.SUBSCRIPTION_AUTHOR_INDEX_NAME.value,
+            ),
+            models.Index(
+                fields=UserEnum.SUBSCRIPTION_CREATED_INDEX_FIELDS.value,
+                name=UserEnum.SUBSCRIPTION_CREATED_INDEX_NAME.value,
+            ),
+        ]
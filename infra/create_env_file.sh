@@ -6,3 +6,5 @@ echo 'POSTGRES_USER=postgres' >> .env
 echo 'POSTGRES_PASSWORD=postgres' >> .env
 echo 'DB_HOST=db' >> .env
 echo 'DB_PORT=5432' >> .env
+echo 'CACHE_BACKEND=django.core.cache.backends.memcached.MemcachedCache' >> .env
+echo 'CACHE_LOCATION=cache:11211' >> .env